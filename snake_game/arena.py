@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Snake Arena - Hundreds of snakes and many food items sharing one board
+
+The battle mode's rules. Instead of every snake keeping its own occupancy
+(and every head being checked against every other snake), the arena keeps
+one owner grid with the id of the snake on each cell, or NO_OWNER, or
+OBSTACLE. One tick is O(S) for S snakes:
+- Every snake that isn't growing first vacates its tail, so heads may
+  follow tails on the same tick
+- A head moving off the board or onto any owned cell (obstacle, a body,
+  its own body) dies, with one grid lookup
+- Heads moving onto the same cell are matched in a dict keyed by cell:
+  the longest snake survives, equal lengths all die
+- Dead snakes give their cells back, and eaten food respawns on a random
+  free cell in O(1) through a FreeCells index
+
+Like the single-player rules, a snake eats the food under its head (and
+grows) on the move after reaching it.
+
+Pygame-free; server.py runs its rooms on it:
+    arena = Arena(Board(100, 100), seed=1)
+    bot = arena.spawn_snake('bot')
+    arena.turn(bot.id, (0, -1))
+    moves, deaths, food_moves = arena.step()
+
+Usage:
+    python arena.py 200 200 500 1000   # 500 bots on 200x200, 1000 ticks
+"""
+
+import random
+import sys
+import time
+from array import array
+from collections import deque
+
+from engine import DIRECTIONS, LEFT, RIGHT
+from game_logic import Board, FreeCells, create_level_obstacles, is_reverse_direction
+
+ARENA_FOODS = 50  # Food items on the board at once
+NO_OWNER = -1  # Owner grid value of an empty cell
+OBSTACLE = -2  # Owner grid value of an obstacle cell
+
+
+class ArenaSnake:
+    """One snake in an arena: its cells, head first, and its steering."""
+
+    __slots__ = ('id', 'player', 'cells', 'head', 'direction',
+                 'next_direction', 'score')
+
+    def __init__(self, snake_id, player, cell, position, direction):
+        """Initialize a one-cell snake.
+
+        Args:
+            snake_id (int): Id of the snake in its arena
+            player (str): Name of the player or bot steering it
+            cell (int): Cell index of the head
+            position (tuple): (x, y) coordinates of the head
+            direction (tuple): Starting (dx, dy) direction
+        """
+        self.id = snake_id
+        self.player = player
+        self.cells = deque((cell,))
+        self.head = position
+        self.direction = direction
+        self.next_direction = None  # Latest turn since the last tick
+        self.score = 0
+
+    def __len__(self):
+        return len(self.cells)
+
+
+class Arena:
+    """A board shared by many snakes, with a grid of which snake owns each cell."""
+
+    def __init__(self, board=None, seed=None, num_foods=ARENA_FOODS,
+                 obstacles=None):
+        """Initialize an arena with no snakes.
+
+        Args:
+            board (Board): Board to play on, defaults to the window size
+            seed (int): Seed for spawn and food positions
+            num_foods (int): Food items kept on the board
+            obstacles (ObstacleLayout): Obstacles, defaults to level 1's
+        """
+        self.board = board if board is not None else Board()
+        self.rng = random.Random(seed)
+        self.free_cells = FreeCells(self.board, self.rng)
+        if obstacles is None:
+            obstacles = create_level_obstacles(1, self.rng, self.board)
+        self.obstacles = obstacles
+
+        # Snake ids count every snake ever spawned, so they get a full int
+        self._owner = array('i', [NO_OWNER]) * self.board.num_cells
+        blocked = [obstacle.position for obstacle in obstacles
+                   if self.board.contains(obstacle.position)]
+        for position in blocked:
+            self._owner[self.board.cell_index(position)] = OBSTACLE
+        self.free_cells.set_blocked(blocked)
+
+        self.snakes = {}  # Snake id -> ArenaSnake, in spawn order
+        self._next_snake_id = 0
+        self.foods = [None] * num_foods  # (x, y) of each food item, or None
+        self._food_at = {}  # Cell -> index of the food on it
+        self._waiting_foods = []  # Indices of food with no free cell to go to
+        for index in range(num_foods):
+            if self._respawn_food(index) is None:
+                self._waiting_foods.append(index)
+
+    def _respawn_food(self, index):
+        """Move a food item to a random free cell, taking it out of the free cells.
+
+        Args:
+            index (int): Index of the food item
+
+        Returns:
+            tuple: New (x, y) position, or None if the board is full
+        """
+        try:
+            position = self.free_cells.choice()
+        except IndexError:
+            position = None
+        else:
+            self.free_cells.remove(position)
+            self._food_at[self.board.cell_index(position)] = index
+        self.foods[index] = position
+        return position
+
+    def owner_of(self, position):
+        """Get the id of the snake on a cell.
+
+        Args:
+            position (tuple): (x, y) coordinates
+
+        Returns:
+            int: Snake id, NO_OWNER or OBSTACLE (off the board counts as
+                an obstacle)
+        """
+        if not self.board.contains(position):
+            return OBSTACLE
+        return self._owner[self.board.cell_index(position)]
+
+    def spawn_snake(self, player):
+        """Put a new one-cell snake on a random free cell.
+
+        Args:
+            player (str): Name of the player or bot
+
+        Returns:
+            ArenaSnake: The new snake, or None if the board is full
+        """
+        try:
+            position = self.free_cells.choice()
+        except IndexError:
+            return None
+        self.free_cells.remove(position)
+        cell = self.board.cell_index(position)
+        # Start heading towards the middle, away from the nearer side wall
+        direction = RIGHT if position[0] < self.board.width // 2 else LEFT
+        arena_snake = ArenaSnake(self._next_snake_id, player, cell, position,
+                                 direction)
+        self._next_snake_id += 1
+        self._owner[cell] = arena_snake.id
+        self.snakes[arena_snake.id] = arena_snake
+        return arena_snake
+
+    def turn(self, snake_id, direction):
+        """Steer a snake on the next tick.
+
+        Args:
+            snake_id (int): Id of the snake
+            direction (tuple): New (dx, dy) direction; 180° turns are
+                ignored when the tick applies it
+        """
+        arena_snake = self.snakes.get(snake_id)
+        if arena_snake is not None:
+            arena_snake.next_direction = direction
+
+    def remove_snake(self, snake_id):
+        """Take a snake off the board, giving its cells back.
+
+        Args:
+            snake_id (int): Id of the snake
+        """
+        arena_snake = self.snakes.pop(snake_id, None)
+        if arena_snake is None:
+            return
+        owner = self._owner
+        position_of = self.board.position_of
+        for cell in arena_snake.cells:
+            if owner[cell] == snake_id:
+                owner[cell] = NO_OWNER
+                # Food the head reached stays there, so its cell isn't free
+                if cell not in self._food_at:
+                    self.free_cells.add(position_of(cell))
+
+    def body(self, snake_id):
+        """Get a snake's segment positions.
+
+        Args:
+            snake_id (int): Id of the snake
+
+        Returns:
+            list: (x, y) coordinates, head first
+        """
+        position_of = self.board.position_of
+        return [position_of(cell) for cell in self.snakes[snake_id].cells]
+
+    def safe_directions(self, snake_id):
+        """Get the directions a snake can move in without hitting anything now.
+
+        Tails that will move away on the next tick still count as taken.
+
+        Args:
+            snake_id (int): Id of the snake
+
+        Returns:
+            list: (dx, dy) directions, in DIRECTIONS order
+        """
+        arena_snake = self.snakes[snake_id]
+        head_x, head_y = arena_snake.head
+        return [direction for direction in DIRECTIONS
+                if not is_reverse_direction(arena_snake.direction, direction)
+                and self.owner_of((head_x + direction[0],
+                                   head_y + direction[1])) == NO_OWNER]
+
+    def step(self):
+        """Move every snake one cell and resolve eating and collisions.
+
+        Returns:
+            tuple: (moves, deaths, food_moves) where moves are
+                [id, x, y, grew] for every snake (the new head, and whether
+                the tail stayed), deaths are the ids of snakes that died and
+                food_moves are [index, x, y] for food that respawned, or
+                [index, None] for food eaten with no free cell left (it
+                respawns on a later tick, once a cell is free)
+        """
+        board = self.board
+        width = board.width
+        height = board.height
+        owner = self._owner
+        free_cells = self.free_cells
+        position_of = board.position_of
+        snakes = list(self.snakes.values())
+
+        # Turn, eat and vacate tails first, so heads can follow tails
+        moves = []
+        targets = []
+        eaten = []
+        for arena_snake in snakes:
+            next_direction = arena_snake.next_direction
+            if next_direction is not None and not is_reverse_direction(
+                    arena_snake.direction, next_direction):
+                arena_snake.direction = next_direction
+            arena_snake.next_direction = None
+
+            cells = arena_snake.cells
+            food_index = self._food_at.pop(cells[0], None)
+            grew = food_index is not None
+            if grew:
+                arena_snake.score += 1
+                eaten.append(food_index)
+            else:
+                tail = cells.pop()
+                owner[tail] = NO_OWNER
+                free_cells.add(position_of(tail))
+
+            x = arena_snake.head[0] + arena_snake.direction[0]
+            y = arena_snake.head[1] + arena_snake.direction[1]
+            inside = 0 <= x < width and 0 <= y < height
+            targets.append(x * height + y if inside else None)
+            moves.append([arena_snake.id, x, y, int(grew)])
+
+        # One grid lookup per head for walls, obstacles and bodies; heads on
+        # the same cell meet in a dict keyed by cell
+        dead = set()
+        claims = {}  # Cell -> [surviving snake or None, its length]
+        for arena_snake, target in zip(snakes, targets):
+            if target is None or owner[target] != NO_OWNER:
+                dead.add(arena_snake.id)
+                continue
+            length = len(arena_snake.cells) + 1
+            claim = claims.get(target)
+            if claim is None:
+                claims[target] = [arena_snake, length]
+            elif length > claim[1]:
+                if claim[0] is not None:
+                    dead.add(claim[0].id)
+                claims[target] = [arena_snake, length]
+            elif length == claim[1]:
+                if claim[0] is not None:
+                    dead.add(claim[0].id)
+                dead.add(arena_snake.id)
+                claim[0] = None
+            else:
+                dead.add(arena_snake.id)
+
+        for target, (arena_snake, length) in claims.items():
+            if arena_snake is not None:
+                owner[target] = arena_snake.id
+                arena_snake.cells.appendleft(target)
+                arena_snake.head = position_of(target)
+                free_cells.remove(arena_snake.head)
+
+        deaths = [arena_snake.id for arena_snake in snakes
+                  if arena_snake.id in dead]
+        for snake_id in deaths:
+            self.remove_snake(snake_id)
+
+        # Food eaten on a full board comes back once cells are free again
+        food_moves = []
+        waiting = self._waiting_foods
+        self._waiting_foods = []
+        for index in waiting + eaten:
+            position = self._respawn_food(index)
+            if position is not None:
+                food_moves.append([index, *position])
+            else:
+                self._waiting_foods.append(index)
+                if index not in waiting:
+                    food_moves.append([index, None])
+        return moves, deaths, food_moves
+
+
+def main():
+    """Run bots in an arena, respawning the dead, and report ticks per second."""
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else width
+    num_snakes = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    ticks = int(sys.argv[4]) if len(sys.argv) > 4 else 1000
+
+    arena = Arena(Board(width, height), seed=1,
+                  num_foods=max(ARENA_FOODS, num_snakes // 4))
+    rng = random.Random(1)
+    for index in range(num_snakes):
+        arena.spawn_snake(f"bot-{index}")
+
+    step_time = 0
+    deaths = 0
+    for _ in range(ticks):
+        for arena_snake in arena.snakes.values():
+            safe = arena.safe_directions(arena_snake.id)
+            if safe and (arena_snake.direction not in safe or
+                         rng.random() < 0.1):
+                arena.turn(arena_snake.id, rng.choice(safe))
+        start_time = time.perf_counter()
+        moves, died, food_moves = arena.step()
+        step_time += time.perf_counter() - start_time
+        deaths += len(died)
+        for snake_id in died:
+            arena.spawn_snake(f"bot-{snake_id}")
+
+    longest = max(map(len, arena.snakes.values()), default=0)
+    print(f"{num_snakes} snakes on {width}x{height}: "
+          f"{ticks / step_time:.0f} ticks/s "
+          f"({num_snakes * ticks / step_time:.0f} snake moves/s), "
+          f"{deaths} deaths, longest snake {longest}")
+
+
+if __name__ == "__main__":
+    main()
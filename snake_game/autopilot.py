@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Snake Autopilot - Pathfinding bot that steers the snake to the food
+
+Keeps a distance field to the food (BFS distance from every cell) and moves
+the head to the neighbor closest to the food. The field is only rebuilt when
+the food or the obstacles change; on ordinary moves it is patched where the
+head blocked a cell and the tail freed one:
+- A freed cell lowers distances outward from it (a BFS that stops as soon
+  as nothing improves)
+- A blocked cell invalidates only the cells whose shortest path ran through
+  it, which are then recomputed from their unaffected neighbors
+
+Before the snake steps onto the food it checks that its tail is still
+reachable afterwards, so eating cannot seal it in. With no way to the food
+it chases its tail, keeping the most room around its head.
+
+Chasing the tail can circle forever around food it never gets to, so the
+bot counts its moves since it last ate. Past stall_limit moves it wanders
+between random safe moves to reshape its body. Past twice that it steps
+onto the food even when eating might seal it in, ending a game that can
+no longer progress.
+
+Works as a policy for the headless engine and steers the pygame game when
+AUTOPILOT is enabled in main.py:
+    engine.play(Autopilot())
+"""
+
+import heapq
+import random
+import sys
+import time
+from array import array
+from collections import deque
+
+from engine import GameEngine, DIRECTIONS
+from game_logic import Board, is_reverse_direction
+
+UNREACHABLE = 0x7FFFFFFF  # Distance of cells with no path to the food
+
+
+class Autopilot:
+    """Chooses each move of a game from an incrementally updated distance field."""
+
+    def __init__(self, stall_limit=None, seed=0):
+        """Initialize with no game tracked yet; the first call builds the field.
+
+        Args:
+            stall_limit (int): Moves without eating before the bot starts
+                wandering, defaults to the number of cells on the board
+            seed (int): Seed for the wandering moves
+        """
+        self.stall_limit = stall_limit
+        self._rng = random.Random(seed)
+        self._stalled_moves = 0  # Moves since the snake last grew
+        self._snake = None
+        self._board = None
+        self._neighbors = None  # Neighbor cells of each cell of the board
+        self._food_position = None
+        self._obstacles = None
+        self._head = None
+        self._tail = None
+        self._length = 0
+        self._blocked = None
+        self._distance = None
+        self._head_cell = None
+        self.rebuilds = 0  # Full BFS runs, for benchmarking
+
+    def __call__(self, game_state):
+        """Policy interface for GameEngine.play() and rollouts.
+
+        Args:
+            game_state (GameState): Current game state
+
+        Returns:
+            tuple: (dx, dy) direction for the next move
+        """
+        return self.choose_direction(game_state)
+
+    # -------------------------------------------------------------------------
+    # Distance field
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _neighbor_table(board):
+        """List the on-board neighbors of every cell, once per board.
+
+        Args:
+            board (Board): Board to index
+
+        Returns:
+            list: Tuple of neighboring cell indices for each cell
+        """
+        width, height = board.width, board.height
+        table = []
+        for x in range(width):
+            for y in range(height):
+                cell = x * height + y
+                neighbors = []
+                if y > 0:
+                    neighbors.append(cell - 1)
+                if y < height - 1:
+                    neighbors.append(cell + 1)
+                if x > 0:
+                    neighbors.append(cell - height)
+                if x < width - 1:
+                    neighbors.append(cell + height)
+                table.append(tuple(neighbors))
+        return table
+
+    def _rebuild(self, game_state):
+        """Rebuild the blocked-cell mirror and the whole distance field.
+
+        Args:
+            game_state (GameState): Current game state
+        """
+        snake = game_state.snake
+        board = snake.board
+        self._snake = snake
+        if board is not self._board:
+            self._board = board
+            self._neighbors = self._neighbor_table(board)
+        self._food_position = game_state.food.position
+        self._obstacles = game_state.obstacles
+        self.rebuilds += 1
+
+        blocked = bytearray(board.num_cells)
+        for obstacle in game_state.obstacles:
+            if board.contains(obstacle.position):
+                blocked[board.cell_index(obstacle.position)] = 1
+        for position in snake.body:
+            if board.contains(position) and position != self._food_position:
+                blocked[board.cell_index(position)] = 1
+        self._blocked = blocked
+
+        distance = array('i', [UNREACHABLE]) * board.num_cells
+        self._distance = distance
+        # Food under a new level's obstacle can't be eaten, so nothing leads to it
+        if (board.contains(self._food_position) and
+                not blocked[board.cell_index(self._food_position)]):
+            food_cell = board.cell_index(self._food_position)
+            distance[food_cell] = 0
+            self._lower_from(deque((food_cell,)))
+
+    def _lower_from(self, queue):
+        """Propagate shorter distances outward from cells whose distance dropped.
+
+        Args:
+            queue (deque): Cells whose distance is already final
+        """
+        distance = self._distance
+        blocked = self._blocked
+        neighbors = self._neighbors
+        while queue:
+            cell = queue.popleft()
+            next_distance = distance[cell] + 1
+            for neighbor in neighbors[cell]:
+                if not blocked[neighbor] and distance[neighbor] > next_distance:
+                    distance[neighbor] = next_distance
+                    queue.append(neighbor)
+
+    def _free_cell(self, cell):
+        """Unblock a cell (the tail left it) and lower distances through it.
+
+        Args:
+            cell (int): Cell index
+        """
+        self._blocked[cell] = 0
+        distance = self._distance
+        best = min((distance[neighbor] for neighbor in self._neighbors[cell]
+                    if not self._blocked[neighbor]), default=UNREACHABLE)
+        if best != UNREACHABLE and best + 1 < distance[cell]:
+            distance[cell] = best + 1
+            self._lower_from(deque((cell,)))
+
+    def _block_cell(self, cell):
+        """Block a cell (the head entered it) and repair the distances behind it.
+
+        Only cells whose every shortest path ran through the blocked cell are
+        invalidated; they are then recomputed from their unaffected
+        neighbors.
+
+        Args:
+            cell (int): Cell index
+        """
+        blocked = self._blocked
+        distance = self._distance
+        neighbors = self._neighbors
+        blocked[cell] = 1
+        if distance[cell] == UNREACHABLE:
+            return
+
+        # Invalidate level by level, so a cell's remaining parents are
+        # already known when its children are checked
+        affected = [(cell, distance[cell])]
+        distance[cell] = UNREACHABLE
+        queue = deque(affected)
+        while queue:
+            parent, parent_distance = queue.popleft()
+            for child in neighbors[parent]:
+                if blocked[child] or distance[child] != parent_distance + 1:
+                    continue
+                if any(distance[other] == parent_distance
+                       for other in neighbors[child] if not blocked[other]):
+                    continue  # Still has a shortest path
+                affected.append((child, distance[child]))
+                distance[child] = UNREACHABLE
+                queue.append((child, parent_distance + 1))
+
+        # Recompute the invalidated cells from the edge of the region inward
+        heap = []
+        for affected_cell, _ in affected:
+            if blocked[affected_cell]:
+                continue
+            best = min((distance[neighbor] for neighbor in neighbors[affected_cell]
+                        if not blocked[neighbor]), default=UNREACHABLE)
+            if best != UNREACHABLE:
+                distance[affected_cell] = best + 1
+                heap.append((best + 1, affected_cell))
+        heapq.heapify(heap)
+        while heap:
+            cell_distance, affected_cell = heapq.heappop(heap)
+            if cell_distance != distance[affected_cell]:
+                continue
+            for neighbor in neighbors[affected_cell]:
+                if not blocked[neighbor] and distance[neighbor] > cell_distance + 1:
+                    distance[neighbor] = cell_distance + 1
+                    heapq.heappush(heap, (cell_distance + 1, neighbor))
+
+    def _update(self, game_state):
+        """Bring the field up to date with the game, patching it if possible.
+
+        Args:
+            game_state (GameState): Current game state
+        """
+        snake = game_state.snake
+        head = snake.get_head_position()
+        length = len(snake.body)
+        moved_once = (self._head is not None and length == self._length and
+                      abs(head[0] - self._head[0]) + abs(head[1] - self._head[1]) == 1)
+        if (snake is not self._snake or
+                game_state.food.position != self._food_position or
+                game_state.obstacles is not self._obstacles or
+                not moved_once):
+            self._rebuild(game_state)
+        else:
+            board = self._board
+            # The food cell stays the field's source until the food respawns
+            if board.contains(head) and head != self._food_position:
+                self._block_cell(board.cell_index(head))
+            if not (snake.contains_position(self._tail) or
+                    self._obstacles.contains_position(self._tail)):
+                self._free_cell(board.cell_index(self._tail))
+
+        self._head = head
+        self._tail = snake.body[-1]
+        self._length = length
+
+    def distance_to_food(self, position):
+        """Get the number of moves from a cell to the food around the body.
+
+        Args:
+            position (tuple): (x, y) grid coordinates
+
+        Returns:
+            int: Moves to the food, or UNREACHABLE
+        """
+        if not self._board.contains(position):
+            return UNREACHABLE
+        return self._distance[self._board.cell_index(position)]
+
+    # -------------------------------------------------------------------------
+    # Safety checks
+    # -------------------------------------------------------------------------
+
+    def _can_reach(self, start, target, freed):
+        """Check if a path of free cells leads from the head's next cell to another.
+
+        Args:
+            start (int): Cell the head would be on
+            target (int): Cell to reach (a body cell, so normally blocked)
+            freed (int): Cell to treat as free, or None
+
+        Returns:
+            bool: True if target can be reached
+        """
+        blocked = self._blocked
+        seen = {start, self._head_cell}
+        queue = deque((start,))
+        while queue:
+            cell = queue.popleft()
+            for neighbor in self._neighbors[cell]:
+                if neighbor == target:
+                    return True
+                if neighbor in seen or (blocked[neighbor] and neighbor != freed):
+                    continue
+                seen.add(neighbor)
+                queue.append(neighbor)
+        return False
+
+    def _open_area(self, start, freed, limit):
+        """Count the free cells reachable from the head's next cell, up to a limit.
+
+        Args:
+            start (int): Cell the head would be on
+            freed (int): Cell to treat as free, or None
+            limit (int): Stop counting at this many cells
+
+        Returns:
+            int: Number of reachable cells, at most limit
+        """
+        blocked = self._blocked
+        seen = {start, self._head_cell}
+        queue = deque((start,))
+        while queue and len(seen) < limit:
+            cell = queue.popleft()
+            for neighbor in self._neighbors[cell]:
+                if neighbor in seen or (blocked[neighbor] and neighbor != freed):
+                    continue
+                seen.add(neighbor)
+                queue.append(neighbor)
+        return len(seen) - 1
+
+    # -------------------------------------------------------------------------
+    # Decisions
+    # -------------------------------------------------------------------------
+
+    def choose_direction(self, game_state):
+        """Pick the direction for the next move.
+
+        Args:
+            game_state (GameState): Current game state
+
+        Returns:
+            tuple: (dx, dy) direction
+        """
+        snake = game_state.snake
+        body = snake.body
+        if snake is self._snake and len(body) == self._length:
+            self._stalled_moves += 1
+        else:
+            self._stalled_moves = 0
+        self._update(game_state)
+        board = self._board
+        blocked = self._blocked
+        head_x, head_y = snake.get_head_position()
+        current_direction = game_state.snake_direction
+        stall_limit = (self.stall_limit if self.stall_limit is not None
+                       else board.num_cells)
+
+        # The tail moves out of the way this move unless the snake grows
+        will_grow = snake.get_head_position() == game_state.food.position
+        self._head_cell = board.cell_index((head_x, head_y))
+        tail_cell = board.cell_index(body[-1])
+        freed = None if will_grow else tail_cell
+
+        candidates = []
+        for direction in DIRECTIONS:
+            if is_reverse_direction(current_direction, direction):
+                continue
+            position = (head_x + direction[0], head_y + direction[1])
+            if not board.contains(position):
+                continue
+            cell = board.cell_index(position)
+            if blocked[cell] and cell != freed:
+                continue
+            candidates.append((self._distance[cell], direction, cell))
+        if not candidates:
+            return current_direction  # Boxed in, nothing helps
+        candidates.sort()
+
+        if not will_grow:
+            for food_distance, direction, cell in candidates:
+                if food_distance == UNREACHABLE:
+                    break
+                if food_distance > 0:
+                    return direction  # Cell still connects to the food
+                # Stepping onto the food: the snake grows next move, so its
+                # tail must stay reachable from there
+                new_tail = (board.cell_index(body[-2]) if len(body) > 1
+                            else cell)
+                if (len(body) == 1 or self._stalled_moves > 2 * stall_limit or
+                        self._can_reach(cell, new_tail, tail_cell)):
+                    return direction
+
+        # No safe way to the food: keep the most room, preferring to follow
+        # the tail
+        limit = len(body) + 1
+        best_direction = candidates[0][1]
+        best_score = (-1, -1)
+        safe_directions = []
+        for _, direction, cell in candidates:
+            reaches_tail = len(body) > 1 and self._can_reach(cell, tail_cell, freed)
+            score = (int(reaches_tail), self._open_area(cell, freed, limit))
+            if reaches_tail or score[1] == len(body):
+                safe_directions.append(direction)
+            if score > best_score:
+                best_score = score
+                best_direction = direction
+        # Circling without eating: a random safe move changes the loop
+        if self._stalled_moves > stall_limit and safe_directions:
+            return self._rng.choice(safe_directions)
+        return best_direction
+
+
+def main():
+    """Play autopilot games headlessly and report decisions per second."""
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else width
+    num_games = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    board = Board(width, height)
+    total_ticks = 0
+    start_time = time.perf_counter()
+    for seed in range(num_games):
+        engine = GameEngine(seed, board)
+        autopilot = Autopilot()
+        result = engine.play(autopilot, max_ticks=20000)
+        total_ticks += result['ticks']
+        print(f"seed {seed}: score {result['score']}, level {result['level']}, "
+              f"{result['ticks']} moves, {autopilot.rebuilds} field rebuilds")
+    elapsed = time.perf_counter() - start_time
+    print(f"{total_ticks / elapsed:.0f} decisions/s on a "
+          f"{board.width}x{board.height} board")
+
+
+if __name__ == "__main__":
+    main()
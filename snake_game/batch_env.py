@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Snake Batch Environment - Thousands of ByteSnake games stepped at once
+
+Holds N games in NumPy arrays and applies the rules from game_logic.py to all
+of them in one vectorized call per move:
+- Heads, directions, scores, levels and tick counters as (N,) arrays
+- Snake bodies as ring buffers of flat cell indices (y * grid_width + x)
+- Per-game occupancy grids counting snake segments on each cell
+- Per-game obstacle grids built from create_level_obstacles layouts
+
+Games that end are reset automatically; their final results are kept in
+BatchGameEngine.finished until the next step.
+"""
+
+import numpy as np
+
+from game_logic import Board, create_level_obstacles
+
+# Action indices accepted by BatchGameEngine.step() (-1 keeps going straight)
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+DIRECTION_DX = np.array([0, 0, -1, 1], dtype=np.int32)
+DIRECTION_DY = np.array([-1, 1, 0, 0], dtype=np.int32)
+OPPOSITE_DIRECTION = np.array([DOWN, UP, RIGHT, LEFT], dtype=np.int8)
+
+MAX_RANDOM_OBSTACLES = 20  # Same cap as create_level_obstacles for level 3+
+
+
+class BatchGameEngine:
+    """N independent snake games stored in NumPy arrays and stepped together."""
+
+    def __init__(self, num_games, seed=None, board=None):
+        """Initialize every game at its starting state.
+
+        Args:
+            num_games (int): Number of games to run side by side
+            seed (int): Optional seed for food and obstacle placement
+            board (Board): Board every game is played on, defaults to the
+                window size
+        """
+        self.num_games = num_games
+        self.board = board if board is not None else Board()
+        self.grid_width = self.board.width
+        self.grid_height = self.board.height
+        self.num_cells = self.grid_width * self.grid_height
+        self.rng = np.random.default_rng(seed)
+
+        # One spare slot so a snake overlapping itself on its final move fits
+        self.capacity = self.num_cells + 1
+
+        self.head_x = np.zeros(num_games, dtype=np.int32)
+        self.head_y = np.zeros(num_games, dtype=np.int32)
+        self.directions = np.zeros(num_games, dtype=np.int8)
+        self.bodies = np.zeros((num_games, self.capacity), dtype=np.int32)
+        self.head_slots = np.zeros(num_games, dtype=np.int32)
+        self.lengths = np.zeros(num_games, dtype=np.int32)
+        self.occupancy = np.zeros((num_games, self.num_cells), dtype=np.uint8)
+        self.obstacles = np.zeros((num_games, self.num_cells), dtype=bool)
+        self.food = np.zeros(num_games, dtype=np.int32)
+        self.scores = np.zeros(num_games, dtype=np.int32)
+        self.levels = np.zeros(num_games, dtype=np.int32)
+        self.ticks = np.zeros(num_games, dtype=np.int32)
+        self.is_game_over = np.zeros(num_games, dtype=bool)
+
+        # The first two layouts are fixed, so build their grids once
+        self._level_layouts = {
+            level: self._layout_cells(
+                create_level_obstacles(level, board=self.board))
+            for level in (1, 2)
+        }
+        self.finished = {}
+        self.reset()
+
+    def _layout_cells(self, obstacles):
+        """Convert a list of Obstacle objects to flat cell indices.
+
+        Obstacles off the board (fixed layouts on boards too small for
+        them) are left out, as they are in the game.
+
+        Args:
+            obstacles (list): Obstacle objects from create_level_obstacles
+
+        Returns:
+            numpy.ndarray: Cell index of each obstacle on the board
+        """
+        board = self.board
+        return np.array([y * self.grid_width + x for x, y in
+                         (obstacle.position for obstacle in obstacles)
+                         if board.contains((x, y))],
+                        dtype=np.int32)
+
+    def reset(self, games=None):
+        """Start new games.
+
+        Args:
+            games (numpy.ndarray): Indices of the games to reset, or None
+                for all of them
+        """
+        if games is None:
+            games = np.arange(self.num_games)
+        if not len(games):
+            return
+
+        start_x = self.grid_width // 2
+        start_y = self.grid_height // 2
+        start_cell = start_y * self.grid_width + start_x
+
+        self.head_x[games] = start_x
+        self.head_y[games] = start_y
+        self.directions[games] = RIGHT
+        self.head_slots[games] = 0
+        self.bodies[games, 0] = start_cell
+        self.lengths[games] = 1
+        self.occupancy[games] = 0
+        self.occupancy[games, start_cell] = 1
+        self.scores[games] = 0
+        self.levels[games] = 1
+        self.ticks[games] = 0
+        self.is_game_over[games] = False
+        self._set_level_obstacles(games, 1)
+        self._respawn_food(games)
+
+    def _set_level_obstacles(self, games, level):
+        """Replace the obstacles of some games with a level's layout.
+
+        Args:
+            games (numpy.ndarray): Indices of the games to update
+            level (int): Level whose obstacle layout to use
+        """
+        self.obstacles[games] = False
+        if level in self._level_layouts:
+            cells = self._level_layouts[level]
+            self.obstacles[games[:, None], cells[None, :]] = True
+            return
+
+        # Level 3+: random cells, each game drawing its own positions
+        num_obstacles = min(level * 3, MAX_RANDOM_OBSTACLES)
+        x = self.rng.integers(2, self.grid_width - 2, size=(len(games), num_obstacles))
+        y = self.rng.integers(2, self.grid_height - 2, size=(len(games), num_obstacles))
+        self.obstacles[games[:, None], y * self.grid_width + x] = True
+
+    def _respawn_food(self, games):
+        """Move food to a uniformly random free cell in some games.
+
+        Games with no free cell left get food at -1, which no head can reach.
+
+        Args:
+            games (numpy.ndarray): Indices of the games to update
+        """
+        free = (self.occupancy[games] == 0) & ~self.obstacles[games]
+        free_counts = free.sum(axis=1)
+        picks = (self.rng.random(len(games)) * free_counts).astype(np.int64)
+        cells = np.argmax(free.cumsum(axis=1) > picks[:, None], axis=1)
+        self.food[games] = np.where(free_counts > 0, cells, -1)
+
+    def step(self, actions=None):
+        """Advance every game by exactly one move.
+
+        Args:
+            actions (numpy.ndarray): Direction index (UP, DOWN, LEFT, RIGHT)
+                per game, or -1 to keep going straight. 180° turns are
+                ignored, as with the keyboard. None keeps every game straight.
+
+        Returns:
+            tuple: (ate_food, is_game_over) boolean arrays for this move.
+                Finished games are reset before returning; their final
+                'score', 'level', 'length' and 'ticks' are in self.finished.
+        """
+        games = np.arange(self.num_games)
+
+        # Turn, ignoring reversals
+        if actions is not None:
+            actions = np.asarray(actions, dtype=np.int8)
+            turns = (actions >= 0) & (actions != OPPOSITE_DIRECTION[self.directions])
+            self.directions[turns] = actions[turns]
+
+        # Food is eaten when the head already sits on it, before moving
+        head_cells = self.head_y * self.grid_width + self.head_x
+        ate_food = head_cells == self.food
+        eaters = games[ate_food]
+        self._respawn_food(eaters)
+        self.scores[eaters] += 1
+
+        # Move heads and push them onto the ring buffers
+        self.head_x += DIRECTION_DX[self.directions]
+        self.head_y += DIRECTION_DY[self.directions]
+        hit_wall = ((self.head_x < 0) | (self.head_x >= self.grid_width) |
+                    (self.head_y < 0) | (self.head_y >= self.grid_height))
+        new_head_cells = np.where(
+            hit_wall, 0, self.head_y * self.grid_width + self.head_x)
+        self.head_slots = (self.head_slots - 1) % self.capacity
+        self.bodies[games, self.head_slots] = new_head_cells
+        self.occupancy[games, new_head_cells] += ~hit_wall
+
+        # Pop tails of snakes that did not grow
+        movers = games[~ate_food]
+        tail_slots = (self.head_slots[movers] + self.lengths[movers]) % self.capacity
+        self.occupancy[movers, self.bodies[movers, tail_slots]] -= 1
+        self.lengths[eaters] += 1
+        self.ticks += 1
+
+        # Collisions: wall, then own body, then obstacle
+        in_bounds = ~hit_wall
+        hit_self = in_bounds & (self.occupancy[games, new_head_cells] > 1)
+        hit_obstacle = in_bounds & self.obstacles[games, new_head_cells]
+        self.is_game_over = hit_wall | hit_self | hit_obstacle
+
+        # Advance levels every 10 points
+        new_levels = self.scores // 10 + 1
+        for level in np.unique(new_levels[new_levels > self.levels]):
+            level_up = games[(new_levels == level) & (new_levels > self.levels)]
+            self.levels[level_up] = level
+            self._set_level_obstacles(level_up, int(level))
+            # Food the new layout buries moves to a free cell
+            has_food = level_up[self.food[level_up] >= 0]
+            self._respawn_food(
+                has_food[self.obstacles[has_food, self.food[has_food]]])
+
+        # Record and reset finished games
+        is_game_over = self.is_game_over.copy()
+        done = games[is_game_over]
+        self.finished = {
+            'games': done,
+            'score': self.scores[done],
+            'level': self.levels[done],
+            'length': self.lengths[done],
+            'ticks': self.ticks[done],
+        }
+        self.reset(done)
+
+        return ate_food, is_game_over
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Snake Benchmarks - Throughput and allocation numbers for the game's hot paths
+
+Measures operations per second and memory allocated per operation for:
+- update_game_logic (one move per call)
+- Food.respawn
+- check_self_collision
+- render_game and DirtyRectRenderer (offscreen, SDL dummy video driver)
+
+across snake lengths and board sizes. Snakes follow a Hamiltonian cycle with
+obstacles cleared and food out of reach, so they can move forever without
+dying or growing.
+
+The stress run instead lays the snake along the perfect-play cycle of the
+level 1 layout (see hamiltonian.py) until it covers 25% to 99% of the board,
+and adds HamiltonianSolver moves to the logic benchmarks, showing how food
+placement and collision checks scale as the board fills up.
+
+Usage:
+    python benchmark.py                            # print a results table
+    python benchmark.py --stress                   # nearly full boards
+    python benchmark.py --output results.json      # also save the results
+    python benchmark.py --baseline baseline.json   # exit 1 on regressions
+"""
+
+import os
+
+# Benchmarks draw offscreen; set before pygame is imported (via main)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+import game_logic
+import hamiltonian
+import main as game
+
+DEFAULT_BOARD_SIZES = ((40, 30), (100, 100), (200, 200))
+DEFAULT_SNAKE_LENGTHS = (1, 100, 1000, 10000)
+STRESS_OCCUPANCIES = (0.25, 0.5, 0.75, 0.9, 0.99)  # Share of the cycle covered
+MIN_BENCHMARK_TIME = 0.2  # Seconds each benchmark runs for
+ALLOCATION_SAMPLES = 200  # Operations traced to measure allocations
+DEFAULT_TOLERANCE = 0.10  # Slowdown that counts as a regression
+UNREACHABLE_LEVEL = 1 << 30  # Keeps update_level from adding obstacles
+
+
+# =============================================================================
+# BENCHMARK SETUP
+# =============================================================================
+
+def hamiltonian_cycle(grid_width, grid_height):
+    """Build a cycle through every cell of a grid with an even height.
+
+    Runs along row 0, snakes back and forth over columns 1+, then returns up
+    column 0.
+
+    Args:
+        grid_width (int): Number of grid columns
+        grid_height (int): Number of grid rows (must be even)
+
+    Returns:
+        list: (x, y) cells in cycle order
+    """
+    cycle = []
+    for y in range(grid_height):
+        columns = range(1, grid_width) if y % 2 == 0 else range(grid_width - 1, 0, -1)
+        cycle.extend((x, y) for x in columns)
+    cycle.extend((0, y) for y in range(grid_height - 1, -1, -1))
+    return cycle
+
+
+def build_game_state(snake_length, board):
+    """Create a game with a snake of a given length lying on a Hamiltonian cycle.
+
+    Args:
+        snake_length (int): Number of snake segments
+        board (Board): Board to play on
+
+    Returns:
+        tuple: (game_state, next_direction) where next_direction maps each
+            cell to the direction that follows the cycle
+    """
+    cycle = hamiltonian_cycle(board.width, board.height)
+    next_direction = {}
+    for index, (x, y) in enumerate(cycle):
+        next_x, next_y = cycle[(index + 1) % len(cycle)]
+        next_direction[(x, y)] = (next_x - x, next_y - y)
+
+    game_state = game.initialize_game_state(seed=0, board=board)
+    free_cells = game_logic.FreeCells(board, game_state.rng)
+    snake = game_logic.Snake(cycle[0], free_cells)
+    for position in cycle[:snake_length - 1]:
+        snake.move(next_direction[position], should_grow=True)
+
+    game_state.snake = snake
+    game_state.obstacles = game_logic.ObstacleLayout(board=board)
+    game_state.level = UNREACHABLE_LEVEL
+    game_state.food = game_logic.Food(free_cells)
+    # Park the food off the board so the snake length stays fixed while timing
+    game_state.food.position = (-1, -1)
+    return game_state, next_direction
+
+
+def build_stress_state(occupancy, board):
+    """Create a game with a snake covering part of the level 1 perfect-play cycle.
+
+    Args:
+        occupancy (float): Share of the cycle the snake covers
+        board (Board): Board to play on
+
+    Returns:
+        tuple: (game_state, next_direction) where next_direction maps each
+            cycle cell to the direction that follows the cycle
+    """
+    game_state = game.initialize_game_state(seed=0, board=board)
+    obstacles = game_state.obstacles
+    cycle = [board.position_of(cell)
+             for cell in hamiltonian.cycle_for_layout(board, obstacles).cells]
+    next_direction = {}
+    for index, (x, y) in enumerate(cycle):
+        next_x, next_y = cycle[(index + 1) % len(cycle)]
+        next_direction[(x, y)] = (next_x - x, next_y - y)
+
+    snake_length = max(1, int(len(cycle) * occupancy))
+    free_cells = game_logic.FreeCells(board, game_state.rng)
+    snake = game_logic.Snake(cycle[0], free_cells)
+    free_cells.set_blocked([obstacle.position for obstacle in obstacles], snake)
+    for position in cycle[:snake_length - 1]:
+        snake.move(next_direction[position], should_grow=True)
+
+    game_state.snake = snake
+    if snake_length > 1:
+        game_state.snake_direction = next_direction[cycle[snake_length - 2]]
+    game_state.level = UNREACHABLE_LEVEL
+    game_state.food = game_logic.Food(free_cells)
+    game_state.food.position = (-1, -1)
+    return game_state, next_direction
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+def measure(operation):
+    """Time an operation and measure the memory it allocates.
+
+    Args:
+        operation (callable): Runs one operation per call
+
+    Returns:
+        dict: 'ops_per_sec', 'iterations', 'alloc_bytes_per_op' (average
+            peak memory allocated during one call) and 'net_blocks_per_op'
+            (memory blocks still held after each call)
+    """
+    operation()  # Warm up caches
+
+    iterations = 0
+    start_time = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < MIN_BENCHMARK_TIME:
+        for _ in range(100):
+            operation()
+        iterations += 100
+        elapsed = time.perf_counter() - start_time
+
+    tracemalloc.start()
+    peak_total = 0
+    start_blocks = sys.getallocatedblocks()
+    for _ in range(ALLOCATION_SAMPLES):
+        tracemalloc.reset_peak()
+        current_before, _ = tracemalloc.get_traced_memory()
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - current_before
+    net_blocks = sys.getallocatedblocks() - start_blocks
+    tracemalloc.stop()
+
+    return {
+        'ops_per_sec': iterations / elapsed,
+        'iterations': iterations,
+        'alloc_bytes_per_op': peak_total / ALLOCATION_SAMPLES,
+        'net_blocks_per_op': net_blocks / ALLOCATION_SAMPLES,
+    }
+
+
+def bench_update_game_logic(game_state, next_direction):
+    """Benchmark one move through update_game_logic."""
+    def operation():
+        game_state.snake_direction = next_direction[
+            game_state.snake.get_head_position()]
+        game.update_game_logic(
+            game_state, game.get_move_interval(game_state.score))
+    return measure(operation)
+
+
+def bench_food_respawn(game_state, next_direction):
+    """Benchmark Food.respawn."""
+    food = game_state.food
+    free_cells = game_state.snake.free_cells
+    return measure(lambda: food.respawn(free_cells))
+
+
+def bench_check_self_collision(game_state, next_direction):
+    """Benchmark check_self_collision."""
+    snake = game_state.snake
+    return measure(lambda: game_logic.check_self_collision(snake))
+
+
+def bench_render_game(game_state, next_direction):
+    """Benchmark a full-frame render_game to an offscreen surface."""
+    surface = game.pygame.Surface((game.WINDOW_WIDTH, game.WINDOW_HEIGHT))
+    return measure(lambda: game.render_game(surface, game_state))
+
+
+def bench_render_incremental(game_state, next_direction):
+    """Benchmark a move plus a DirtyRectRenderer frame."""
+    renderer = game.DirtyRectRenderer(game.pygame.display.get_surface())
+
+    def operation():
+        game_state.snake_direction = next_direction[
+            game_state.snake.get_head_position()]
+        game.step_game_logic(game_state)
+        renderer.render(game_state)
+    return measure(operation)
+
+
+def bench_perfect_play(game_state, next_direction):
+    """Benchmark a HamiltonianSolver decision plus one move."""
+    solver = hamiltonian.HamiltonianSolver()
+
+    def operation():
+        game_state.snake_direction = solver(game_state)
+        game.step_game_logic(game_state)
+    return measure(operation)
+
+
+LOGIC_BENCHMARKS = {
+    'update_game_logic': bench_update_game_logic,
+    'food_respawn': bench_food_respawn,
+    'check_self_collision': bench_check_self_collision,
+}
+
+# The window only shows the default board, so rendering is measured there
+RENDER_BENCHMARKS = {
+    'render_game': bench_render_game,
+    'render_incremental': bench_render_incremental,
+}
+
+
+def run_benchmarks(board_sizes=DEFAULT_BOARD_SIZES,
+                   snake_lengths=DEFAULT_SNAKE_LENGTHS, names=None):
+    """Run every benchmark over the board sizes and snake lengths.
+
+    Args:
+        board_sizes (tuple): (grid_width, grid_height) pairs
+        snake_lengths (tuple): Snake lengths to test on each board
+        names (list): Optional benchmark names to limit the run to
+
+    Returns:
+        dict: Results keyed by 'name[WxH,len=N]'
+    """
+    game.ENABLE_SOUND = False
+    game.RECORD_REPLAYS = False
+    game.SAVE_SCORES = False
+    game.initialize_pygame()
+    default_size = (game.WINDOW_WIDTH // game.CELL_SIZE,
+                    game.WINDOW_HEIGHT // game.CELL_SIZE)
+
+    results = {}
+    for grid_width, grid_height in board_sizes:
+        benchmarks = dict(LOGIC_BENCHMARKS)
+        if (grid_width, grid_height) == default_size:
+            benchmarks.update(RENDER_BENCHMARKS)
+
+        for snake_length in snake_lengths:
+            # Leave room for the snake to move and food to spawn
+            if snake_length >= grid_width * grid_height // 2:
+                continue
+            for name, benchmark in benchmarks.items():
+                if names and name not in names:
+                    continue
+                board = game_logic.Board(grid_width, grid_height)
+                game_state, next_direction = build_game_state(snake_length, board)
+                result = benchmark(game_state, next_direction)
+                key = f"{name}[{grid_width}x{grid_height},len={snake_length}]"
+                results[key] = result
+                print(f"{key:<50} {result['ops_per_sec']:>12.0f} ops/s "
+                      f"{result['alloc_bytes_per_op']:>10.0f} B/op", flush=True)
+    return results
+
+
+def run_stress_benchmarks(board_sizes=DEFAULT_BOARD_SIZES,
+                          occupancies=STRESS_OCCUPANCIES, names=None):
+    """Run the logic benchmarks on boards filling up with snake.
+
+    Args:
+        board_sizes (tuple): (grid_width, grid_height) pairs
+        occupancies (tuple): Shares of the perfect-play cycle the snake covers
+        names (list): Optional benchmark names to limit the run to
+
+    Returns:
+        dict: Results keyed by 'name[WxH,occupancy=N%]'
+    """
+    game.ENABLE_SOUND = False
+    game.RECORD_REPLAYS = False
+    game.SAVE_SCORES = False
+    benchmarks = dict(LOGIC_BENCHMARKS, perfect_play=bench_perfect_play)
+
+    results = {}
+    for grid_width, grid_height in board_sizes:
+        for occupancy in occupancies:
+            for name, benchmark in benchmarks.items():
+                if names and name not in names:
+                    continue
+                board = game_logic.Board(grid_width, grid_height)
+                game_state, next_direction = build_stress_state(occupancy, board)
+                result = benchmark(game_state, next_direction)
+                key = f"{name}[{grid_width}x{grid_height},occupancy={occupancy:.0%}]"
+                results[key] = result
+                print(f"{key:<50} {result['ops_per_sec']:>12.0f} ops/s "
+                      f"{result['alloc_bytes_per_op']:>10.0f} B/op", flush=True)
+    return results
+
+
+def compare_with_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Find benchmarks that got slower than a stored baseline.
+
+    Args:
+        results (dict): Current results from run_benchmarks()
+        baseline (dict): Earlier results from run_benchmarks()
+        tolerance (float): Allowed fractional slowdown
+
+    Returns:
+        list: (key, baseline ops/s, current ops/s) for each regression
+    """
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        baseline_speed = baseline[key]['ops_per_sec']
+        if result['ops_per_sec'] < baseline_speed * (1 - tolerance):
+            regressions.append((key, baseline_speed, result['ops_per_sec']))
+    return regressions
+
+
+def main():
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', help="write results as JSON to this file")
+    parser.add_argument('--baseline', help="JSON results to compare against")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before failing (default 0.10)")
+    parser.add_argument('--lengths', type=int, nargs='+',
+                        default=DEFAULT_SNAKE_LENGTHS, help="snake lengths")
+    parser.add_argument('--only', nargs='+', help="benchmark names to run")
+    parser.add_argument('--stress', action='store_true',
+                        help="run on boards 25%%-99%% full of snake instead")
+    args = parser.parse_args()
+
+    if args.stress:
+        results = run_stress_benchmarks(names=args.only)
+    else:
+        results = run_benchmarks(snake_lengths=args.lengths, names=args.only)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        for key, baseline_speed, current_speed in regressions:
+            print(f"REGRESSION {key}: {baseline_speed:.0f} -> "
+                  f"{current_speed:.0f} ops/s")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Snake Game Engine - Headless ByteSnake for bots and batch simulations
+
+Runs the exact rules from game_logic.py without pygame, a window or a clock:
+every call to GameEngine.step() advances the game by one move, so games run
+as fast as the CPU allows.
+
+Search bots can branch cheaply with snapshot()/restore(), or step and undo()
+in place with record_undo=True.
+
+Example:
+    engine = GameEngine()
+    while not engine.is_game_over:
+        engine.step((0, -1))
+"""
+
+from game_logic import (
+    Board, GameState, start_new_game, is_reverse_direction, level_for_state,
+    move_snake, detect_collision, update_level,
+)
+
+# Directions a bot can pass to GameEngine.step()
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+
+def new_game_state(seed=None, board=None):
+    """Create the state for a fresh game, ready to be stepped.
+    
+    The pygame front end's state is a subclass of the same GameState, so
+    the shared rules in game_logic.py work on both.
+    
+    Args:
+        seed (int): Seed for the game, or None to pick a new one
+        board (Board): Board to play on, defaults to the window size
+        
+    Returns:
+        GameState: Game state with all initial values
+    """
+    return start_new_game(GameState(), seed, board)
+
+
+class GameEngine:
+    """Headless snake game advanced one move at a time."""
+    
+    def __init__(self, seed=None, board=None, record_undo=False, max_level=None):
+        """Initialize the engine with a fresh game.
+        
+        Args:
+            seed (int): Seed for the first game, or None to pick a new one
+            board (Board): Board to play on, defaults to the window size
+            record_undo (bool): Keep a log of moves so undo() can take them
+                back
+            max_level (int): Level every game stops advancing at (keeping
+                its obstacles), or None for no limit
+        """
+        self.board = board if board is not None else Board()
+        self.max_level = max_level
+        self.undo_log = [] if record_undo else None
+        self.reset(seed)
+    
+    def reset(self, seed=None):
+        """Start a new game on the engine's board.
+        
+        Args:
+            seed (int): Seed for the game, or None to pick a new one
+            
+        Returns:
+            GameState: The new game state
+        """
+        self.game_state = new_game_state(seed, self.board)
+        self.game_state.max_level = self.max_level
+        self.ticks = 0
+        if self.undo_log is not None:
+            self.undo_log.clear()
+        return self.game_state
+    
+    @property
+    def is_game_over(self):
+        """bool: True once the snake has collided with something."""
+        return self.game_state.is_game_over
+    
+    @property
+    def score(self):
+        """int: Current game score."""
+        return self.game_state.score
+    
+    @property
+    def level(self):
+        """int: Current level."""
+        return self.game_state.level
+    
+    def step(self, action=None):
+        """Advance the game by exactly one move.
+        
+        Args:
+            action (tuple): New (dx, dy) direction, or None to keep going
+                straight. 180° turns are ignored, as with the keyboard.
+                
+        Returns:
+            tuple: (ate_food, is_game_over) for this move
+        """
+        game_state = self.game_state
+        if game_state.is_game_over:
+            return False, True
+        
+        if self.undo_log is not None:
+            return self._step_with_undo(action)
+        
+        if action is not None and not is_reverse_direction(
+                game_state.snake_direction, action):
+            game_state.snake_direction = action
+        
+        ate_food = move_snake(game_state)
+        self.ticks += 1
+        
+        if detect_collision(game_state):
+            game_state.is_game_over = True
+        update_level(game_state)
+        
+        return ate_food, game_state.is_game_over
+    
+    def _step_with_undo(self, action):
+        """Advance one move like step(), logging what undo() needs.
+        
+        Args:
+            action (tuple): New (dx, dy) direction, or None
+            
+        Returns:
+            tuple: (ate_food, is_game_over) for this move
+        """
+        game_state = self.game_state
+        snake = game_state.snake
+        old_direction = game_state.snake_direction
+        if action is not None and not is_reverse_direction(old_direction, action):
+            game_state.snake_direction = action
+        
+        # Only new food and level 3+ obstacles draw from the random source
+        food_position = game_state.food.position
+        old_score = game_state.score
+        old_level = game_state.level
+        old_obstacles = game_state.obstacles
+        if (snake.get_head_position() == food_position or
+                level_for_state(game_state) > old_level):
+            rng_state = game_state.rng.getstate()
+        else:
+            rng_state = None
+        move_record = snake.move_record(game_state.snake_direction)
+        
+        ate_food = move_snake(game_state)
+        self.ticks += 1
+        if detect_collision(game_state):
+            game_state.is_game_over = True
+        
+        # A new level re-blocks many cells, so keep the whole index instead
+        free_cells = None
+        if level_for_state(game_state) > game_state.level:
+            free_cells = snake.free_cells.copy()
+        update_level(game_state)
+        
+        self.undo_log.append((old_direction, food_position, rng_state,
+                              move_record, ate_food, old_score, old_level,
+                              old_obstacles, free_cells))
+        return ate_food, game_state.is_game_over
+    
+    def undo(self):
+        """Take back the last move, restoring the exact previous state.
+        
+        Requires record_undo=True. Food placement and the random source are
+        restored too, so replaying the same move gives the same result.
+        
+        Raises:
+            IndexError: If there is no move to undo
+        """
+        (old_direction, food_position, rng_state, move_record, ate_food,
+         old_score, old_level, old_obstacles, free_cells) = self.undo_log.pop()
+        game_state = self.game_state
+        snake = game_state.snake
+        
+        if free_cells is not None:
+            snake.free_cells = free_cells
+        snake.undo_move(move_record, ate_food)
+        if rng_state is not None:
+            game_state.rng.setstate(rng_state)
+        game_state.food.position = food_position
+        game_state.snake_direction = old_direction
+        game_state.score = old_score
+        game_state.level = old_level
+        game_state.obstacles = old_obstacles
+        game_state.is_game_over = False
+        self.ticks -= 1
+    
+    def snapshot(self):
+        """Copy the current game so it can be restored later.
+        
+        Returns:
+            tuple: (game_state snapshot, ticks) for restore()
+        """
+        return self.game_state.snapshot(), self.ticks
+    
+    def restore(self, snapshot):
+        """Return to a game copied with snapshot().
+        
+        The undo log is cleared, since its moves led somewhere else.
+        
+        Args:
+            snapshot (tuple): Value returned by snapshot()
+        """
+        game_state, self.ticks = snapshot
+        self.game_state.restore(game_state)
+        if self.undo_log is not None:
+            self.undo_log.clear()
+    
+    def play(self, policy, max_ticks=None):
+        """Play the current game to the end using a policy.
+        
+        Args:
+            policy (callable): Called with the game state before each move,
+                returns an action for step()
+            max_ticks (int): Optional cap on the number of moves
+            
+        Returns:
+            dict: Final score, level, snake length and ticks survived
+        """
+        while not self.game_state.is_game_over:
+            if max_ticks is not None and self.ticks >= max_ticks:
+                break
+            self.step(policy(self.game_state))
+        
+        return {
+            'score': self.game_state.score,
+            'level': self.game_state.level,
+            'length': len(self.game_state.snake.body),
+            'ticks': self.ticks,
+        }
@@ -0,0 +1,1140 @@
+#!/usr/bin/env python3
+"""
+Snake Game Logic - Core rules shared by every way of playing ByteSnake
+
+Everything in this module is plain Python with no pygame dependency, so it
+can be imported by the pygame front end, the headless engine and bots alike:
+- Board, Snake, Food and Obstacle game objects
+- Level obstacle layouts
+- Wall, self and obstacle collision rules
+- GameState and the one-move update (movement, scoring, collisions, levels)
+"""
+
+import random
+from array import array
+from functools import cached_property, lru_cache
+
+# =============================================================================
+# GAME SETTINGS - Grid and gameplay parameters shared by all front ends
+# =============================================================================
+
+# Window and Grid Settings
+WINDOW_WIDTH = 800
+WINDOW_HEIGHT = 600
+CELL_SIZE = 20
+BASE_FPS = 10  # Base speed for snake movement (moves per second)
+
+# Gameplay Settings
+SPEED_INCREASE_INTERVAL = 5  # Score interval for speed increase
+POINTS_PER_LEVEL = 10  # Score needed to advance a level
+NO_FOOD_POSITION = (-1, -1)  # Off the board, where food goes once no cell is free
+
+# Zobrist Hash Settings
+ZOBRIST_SEED = 0x5A0B  # Fixed so hashes are the same in every process
+ZOBRIST_HEAD_ROTATION = 13  # Cell keys are rotated to give each role its own key
+ZOBRIST_TAIL_ROTATION = 29
+ZOBRIST_FOOD_ROTATION = 41
+ZOBRIST_OBSTACLE_ROTATION = 53
+ZOBRIST_DIRECTION_KEYS = {
+    direction: key for direction, key in zip(
+        ((0, -1), (0, 1), (-1, 0), (1, 0)),
+        (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F,
+         0x165667B19E3779F9, 0xD6E8FEB86659FD93))
+}
+
+# =============================================================================
+# GAME CLASSES
+# =============================================================================
+
+class Board:
+    """The grid the game is played on.
+    
+    Cells are numbered column by column (index = x * height + y), which lets
+    per-cell state live in flat arrays and bitsets instead of tuples, so
+    arenas of a million cells or more stay compact.
+    """
+    
+    def __init__(self, width=None, height=None):
+        """Initialize a board, by default one that fills the window.
+        
+        Args:
+            width (int): Number of grid columns, or None to fit the window
+            height (int): Number of grid rows, or None to fit the window
+        """
+        self.width = width if width is not None else WINDOW_WIDTH // CELL_SIZE
+        self.height = height if height is not None else WINDOW_HEIGHT // CELL_SIZE
+        self.num_cells = self.width * self.height
+        
+        # Smallest array typecode that holds every cell index plus a sentinel
+        self.typecode = 'H' if self.num_cells < 0xFFFF else 'I'
+        self.no_cell = self.num_cells  # Sentinel for "no cell"
+        
+        # Layouts of levels without random obstacles, shared by every game
+        self.fixed_layouts = {}
+    
+    @cached_property
+    def zobrist_keys(self):
+        """array.array: Random 64-bit key per cell, built on first use."""
+        keys = array('Q')
+        keys.frombytes(random.Random(ZOBRIST_SEED).randbytes(8 * self.num_cells))
+        return keys
+    
+    def contains(self, position):
+        """Check if a position lies on the board.
+        
+        Args:
+            position (tuple): (x, y) coordinates to check
+            
+        Returns:
+            bool: True if the position is inside the board
+        """
+        x, y = position
+        return 0 <= x < self.width and 0 <= y < self.height
+    
+    def cell_index(self, position):
+        """Get the cell index of an on-board position.
+        
+        Args:
+            position (tuple): (x, y) coordinates
+            
+        Returns:
+            int: Cell index
+        """
+        return position[0] * self.height + position[1]
+    
+    def position_of(self, cell):
+        """Get the position of a cell index.
+        
+        Args:
+            cell (int): Cell index
+            
+        Returns:
+            tuple: (x, y) coordinates
+        """
+        return divmod(cell, self.height)
+    
+    def new_cell_array(self, fill, size=None):
+        """Create a compact array of cell indices.
+        
+        Args:
+            fill (int): Value for every element
+            size (int): Number of elements, defaults to one per cell
+            
+        Returns:
+            array.array: Array using the board's typecode
+        """
+        size = self.num_cells if size is None else size
+        return array(self.typecode, [fill]) * size
+
+
+class BitGrid:
+    """One bit per board cell, for compact occupancy flags."""
+    
+    __slots__ = ('_bits',)
+    
+    def __init__(self, num_cells):
+        """Initialize with every bit clear.
+        
+        Args:
+            num_cells (int): Number of cells
+        """
+        self._bits = bytearray((num_cells + 7) >> 3)
+    
+    def __getitem__(self, cell):
+        return (self._bits[cell >> 3] >> (cell & 7)) & 1
+    
+    def set(self, cell):
+        """Set the bit for a cell.
+        
+        Args:
+            cell (int): Cell index
+        """
+        self._bits[cell >> 3] |= 1 << (cell & 7)
+    
+    def clear(self, cell):
+        """Clear the bit for a cell.
+        
+        Args:
+            cell (int): Cell index
+        """
+        self._bits[cell >> 3] &= ~(1 << (cell & 7))
+    
+    def copy(self):
+        """Copy the bitset.
+        
+        Returns:
+            BitGrid: Independent copy
+        """
+        grid = BitGrid.__new__(BitGrid)
+        grid._bits = self._bits[:]
+        return grid
+
+
+class SnakeBody:
+    """Read-only view of a snake's segment positions, head first."""
+    
+    __slots__ = ('_snake',)
+    
+    def __init__(self, snake):
+        self._snake = snake
+    
+    def __len__(self):
+        return self._snake._length
+    
+    def __getitem__(self, index):
+        snake = self._snake
+        if index < 0:
+            index += snake._length
+        if not 0 <= index < snake._length:
+            raise IndexError("snake body index out of range")
+        if index == 0:
+            return snake._head
+        slot = (snake._head_slot + index) % len(snake._cells)
+        return snake.board.position_of(snake._cells[slot])
+    
+    def __iter__(self):
+        snake = self._snake
+        cells = snake._cells
+        capacity = len(cells)
+        position_of = snake.board.position_of
+        yield snake._head
+        for index in range(1, snake._length):
+            yield position_of(cells[(snake._head_slot + index) % capacity])
+    
+    def __contains__(self, position):
+        return self._snake.contains_position(position)
+
+
+class Snake:
+    """Represents the snake in the game as a ring buffer of cell indices.
+    
+    Segments are stored head first in a growable array of cell indices, and
+    a bitset marks the cells the snake covers, so head/tail updates,
+    membership and self-collision checks are all O(1) and each segment takes
+    a few bytes instead of a tuple.
+    """
+    
+    INITIAL_CAPACITY = 16
+    
+    def __init__(self, start_position, free_cells=None, board=None):
+        """Initialize snake with starting position.
+        
+        Args:
+            start_position (tuple): (x, y) grid coordinates for snake head
+            free_cells (FreeCells): Optional free-cell index to keep updated
+                as the snake moves
+            board (Board): Board the snake is on, defaults to the free-cell
+                index's board or a window-sized board
+        """
+        if board is None:
+            board = free_cells.board if free_cells is not None else Board()
+        self.board = board
+        self.free_cells = free_cells
+        
+        start_cell = board.cell_index(start_position)
+        self._cells = board.new_cell_array(start_cell, self.INITIAL_CAPACITY)
+        self._head_slot = 0
+        self._length = 1
+        self._head = start_position
+        self._occupancy = BitGrid(board.num_cells)
+        self._occupancy.set(start_cell)
+        self._head_on_body = False
+        self._body_hash = None  # Zobrist hash of the covered cells, once asked for
+        self.body = SnakeBody(self)
+        if free_cells is not None:
+            free_cells.remove(start_position)
+    
+    def move(self, direction, should_grow=False):
+        """Move snake in given direction.
+        
+        Args:
+            direction (tuple): (dx, dy) movement direction
+            should_grow (bool): If True, snake grows by one segment
+        """
+        current_head_x, current_head_y = self._head
+        new_head_position = (current_head_x + direction[0], current_head_y + direction[1])
+        board = self.board
+        occupancy = self._occupancy
+        free_cells = self.free_cells
+        cells = self._cells
+        
+        if should_grow:
+            if self._length == len(cells):
+                self._grow_buffer()
+                cells = self._cells
+            tail_cell = board.no_cell
+            self._length += 1
+        else:
+            tail_cell = cells[(self._head_slot + self._length - 1) % len(cells)]
+        old_head_cell = cells[self._head_slot]
+        old_head_on_body = self._head_on_body
+        
+        # Add new head to the front of the ring buffer
+        if board.contains(new_head_position):
+            head_cell = board.cell_index(new_head_position)
+            was_covered = occupancy[head_cell]
+            self._head_on_body = bool(was_covered) and head_cell != tail_cell
+            occupancy.set(head_cell)
+            if free_cells is not None:
+                free_cells.remove(new_head_position)
+            if self._body_hash is not None and not was_covered:
+                self._body_hash ^= board.zobrist_keys[head_cell]
+        else:
+            head_cell = board.no_cell  # Off the board, the game is over
+            self._head_on_body = False
+        self._head_slot = (self._head_slot - 1) % len(cells)
+        self._head = new_head_position
+        
+        # Remove tail if not growing, unless another segment still covers it
+        # (the head just moved in, or the old head overlapped the body there)
+        if (tail_cell != board.no_cell and tail_cell != head_cell and
+                not (old_head_on_body and tail_cell == old_head_cell)):
+            occupancy.clear(tail_cell)
+            if free_cells is not None:
+                free_cells.add(board.position_of(tail_cell))
+            if self._body_hash is not None:
+                self._body_hash ^= board.zobrist_keys[tail_cell]
+        cells[self._head_slot] = head_cell
+    
+    def move_record(self, direction):
+        """Capture what undo_move() needs, before moving in a direction.
+        
+        Args:
+            direction (tuple): (dx, dy) direction about to be moved in
+            
+        Returns:
+            tuple: (tail_cell, head_on_body, head_free_slot) for undo_move()
+        """
+        head_x, head_y = self._head
+        new_head_position = (head_x + direction[0], head_y + direction[1])
+        tail_cell = self._cells[(self._head_slot + self._length - 1) % len(self._cells)]
+        if self.free_cells is not None:
+            head_free_slot = self.free_cells.slot(new_head_position)
+        else:
+            head_free_slot = self.board.no_cell
+        return tail_cell, self._head_on_body, head_free_slot
+    
+    def undo_move(self, record, grew):
+        """Reverse the last move(), restoring the free-cell order exactly.
+        
+        Args:
+            record (tuple): move_record() taken before that move
+            grew (bool): Whether that move grew the snake
+        """
+        tail_cell, old_head_on_body, head_free_slot = record
+        board = self.board
+        occupancy = self._occupancy
+        free_cells = self.free_cells
+        cells = self._cells
+        capacity = len(cells)
+        head_cell = cells[self._head_slot]
+        if not grew:
+            cells[(self._head_slot + self._length) % capacity] = tail_cell
+        old_head_cell = cells[(self._head_slot + 1) % capacity]
+        
+        # Put the tail back (the reverse of freeing it, which came last)
+        if (not grew and tail_cell != board.no_cell and tail_cell != head_cell and
+                not (old_head_on_body and tail_cell == old_head_cell)):
+            occupancy.set(tail_cell)
+            if free_cells is not None:
+                free_cells.remove(board.position_of(tail_cell))
+            if self._body_hash is not None:
+                self._body_hash ^= board.zobrist_keys[tail_cell]
+        
+        # Take the head off, unless the cell was covered before the move
+        was_covered = self._head_on_body or (not grew and head_cell == tail_cell)
+        if head_cell != board.no_cell and not was_covered:
+            occupancy.clear(head_cell)
+            if head_free_slot != board.no_cell:
+                free_cells.restore(board.position_of(head_cell), head_free_slot)
+            if self._body_hash is not None:
+                self._body_hash ^= board.zobrist_keys[head_cell]
+        
+        self._head_slot = (self._head_slot + 1) % capacity
+        if grew:
+            self._length -= 1
+        self._head = board.position_of(old_head_cell)
+        self._head_on_body = old_head_on_body
+    
+    def copy(self, free_cells=None):
+        """Copy the snake.
+        
+        Args:
+            free_cells (FreeCells): Free-cell index for the copy to keep
+                updated, usually a copy of this snake's
+                
+        Returns:
+            Snake: Independent copy
+        """
+        snake = Snake.__new__(Snake)
+        snake.board = self.board
+        snake.free_cells = free_cells
+        snake._cells = self._cells[:]
+        snake._head_slot = self._head_slot
+        snake._length = self._length
+        snake._head = self._head
+        snake._occupancy = self._occupancy.copy()
+        snake._head_on_body = self._head_on_body
+        snake._body_hash = self._body_hash
+        snake.body = SnakeBody(snake)
+        return snake
+    
+    def body_hash(self):
+        """Get the Zobrist hash of the cells the snake covers.
+        
+        Computed in full on the first call, then kept up to date by every
+        move.
+        
+        Returns:
+            int: XOR of the board's Zobrist key for each covered cell
+        """
+        if self._body_hash is None:
+            keys = self.board.zobrist_keys
+            covered = set(self.board.cell_index(position) for position in self.body
+                          if self.board.contains(position))
+            body_hash = 0
+            for cell in covered:
+                body_hash ^= keys[cell]
+            self._body_hash = body_hash
+        return self._body_hash
+    
+    def _grow_buffer(self):
+        """Double the ring buffer, unrolling it so the head is in slot 0."""
+        cells = self._cells
+        start = self._head_slot
+        self._cells = cells[start:] + cells[:start] + cells
+        self._head_slot = 0
+    
+    def get_head_position(self):
+        """Get the current head position.
+        
+        Returns:
+            tuple: (x, y) coordinates of snake head
+        """
+        return self._head
+    
+    def contains_position(self, position):
+        """Check if snake body contains the given position.
+        
+        Args:
+            position (tuple): (x, y) coordinates to check
+            
+        Returns:
+            bool: True if position is occupied by snake
+        """
+        if not self.board.contains(position):
+            return position == self._head
+        return self._occupancy[self.board.cell_index(position)] == 1
+    
+    def is_head_on_body(self):
+        """Check if the head shares its cell with another segment.
+        
+        Returns:
+            bool: True if the head overlaps the rest of the body
+        """
+        return self._head_on_body
+
+
+class FreeCells:
+    """Index of the empty grid cells, for O(1) updates and uniform sampling.
+    
+    Free cell indices are packed at the front of one array, with a second
+    array giving each cell's slot in it. Removing a cell swaps the last free
+    cell into its slot, so add, remove and random choice are all O(1) no
+    matter how big the board or the snake gets.
+    """
+    
+    def __init__(self, board, rng=random):
+        """Initialize with every cell of the board free.
+        
+        Args:
+            board (Board): Board whose cells to index
+            rng (random.Random): Random source for choice(), defaults to the
+                global random module
+        """
+        self.board = board
+        self.rng = rng
+        self._cells = array(board.typecode, range(board.num_cells))
+        self._slots = array(board.typecode, range(board.num_cells))
+        self._count = board.num_cells
+        self._blocked = BitGrid(board.num_cells)
+        self._blocked_positions = set()
+    
+    def __len__(self):
+        return self._count
+    
+    def __contains__(self, position):
+        board = self.board
+        return (board.contains(position) and
+                self._slots[board.cell_index(position)] != board.no_cell)
+    
+    def add(self, position):
+        """Mark a cell as free. Off-grid and blocked cells are ignored.
+        
+        Args:
+            position (tuple): (x, y) coordinates of the cell
+        """
+        board = self.board
+        if not board.contains(position):
+            return
+        cell = board.cell_index(position)
+        if self._slots[cell] != board.no_cell or self._blocked[cell]:
+            return
+        self._cells[self._count] = cell
+        self._slots[cell] = self._count
+        self._count += 1
+    
+    def remove(self, position):
+        """Mark a cell as taken. Cells that are not free are ignored.
+        
+        Args:
+            position (tuple): (x, y) coordinates of the cell
+        """
+        board = self.board
+        if not board.contains(position):
+            return
+        cell = board.cell_index(position)
+        slot = self._slots[cell]
+        if slot == board.no_cell:
+            return
+        self._count -= 1
+        last_cell = self._cells[self._count]
+        self._cells[slot] = last_cell
+        self._slots[last_cell] = slot
+        self._slots[cell] = board.no_cell
+    
+    def slot(self, position):
+        """Get a free cell's slot in the index.
+        
+        Args:
+            position (tuple): (x, y) coordinates of the cell
+            
+        Returns:
+            int: Slot of the cell, or board.no_cell if it is not free
+        """
+        board = self.board
+        if not board.contains(position):
+            return board.no_cell
+        return self._slots[board.cell_index(position)]
+    
+    def restore(self, position, slot):
+        """Undo remove(), putting a cell back in the slot it was removed from.
+        
+        Args:
+            position (tuple): (x, y) coordinates of the cell
+            slot (int): Slot the cell had before remove(), from slot()
+        """
+        cell = self.board.cell_index(position)
+        if slot != self._count:
+            # Move the cell that was swapped into the slot back to the end
+            moved_cell = self._cells[slot]
+            self._cells[self._count] = moved_cell
+            self._slots[moved_cell] = self._count
+        self._cells[slot] = cell
+        self._slots[cell] = slot
+        self._count += 1
+    
+    def copy(self, rng=None):
+        """Copy the index.
+        
+        Args:
+            rng (random.Random): Random source for the copy, defaults to
+                this index's
+                
+        Returns:
+            FreeCells: Independent copy
+        """
+        free_cells = FreeCells.__new__(FreeCells)
+        free_cells.board = self.board
+        free_cells.rng = rng if rng is not None else self.rng
+        free_cells._cells = self._cells[:]
+        free_cells._slots = self._slots[:]
+        free_cells._count = self._count
+        free_cells._blocked = self._blocked.copy()
+        free_cells._blocked_positions = self._blocked_positions
+        return free_cells
+    
+    def set_blocked(self, positions, snake=None):
+        """Replace the set of permanently blocked (obstacle) cells.
+        
+        Args:
+            positions (iterable): (x, y) coordinates of the new blocked cells
+            snake (Snake): Snake whose cells must stay taken when unblocked,
+                or None if no unblocked cell is taken
+        """
+        board = self.board
+        old_positions = self._blocked_positions
+        self._blocked_positions = set(positions)
+        for position in old_positions:
+            if board.contains(position):
+                self._blocked.clear(board.cell_index(position))
+        for position in self._blocked_positions:
+            if board.contains(position):
+                self._blocked.set(board.cell_index(position))
+        
+        # Set order keeps food placement, and so replays, the same as before
+        for position in old_positions - self._blocked_positions:
+            if snake is None or not snake.contains_position(position):
+                self.add(position)
+        for position in self._blocked_positions:
+            self.remove(position)
+    
+    def choice(self):
+        """Pick a free cell uniformly at random.
+        
+        Returns:
+            tuple: (x, y) coordinates of a free cell
+            
+        Raises:
+            IndexError: If no cell is free
+        """
+        if not self._count:
+            raise IndexError("no free cells left")
+        return self.board.position_of(self._cells[self.rng.randrange(self._count)])
+
+
+class Food:
+    """Represents the food that the snake can eat."""
+    
+    def __init__(self, free_cells):
+        """Initialize food at a random position not occupied by snake or obstacles.
+        
+        Args:
+            free_cells (FreeCells): Index of the cells food may spawn on
+        """
+        self.position = self._find_random_position(free_cells)
+    
+    def _find_random_position(self, free_cells):
+        """Find a random position not occupied by the snake or an obstacle.
+        
+        Args:
+            free_cells (FreeCells): Index of the cells food may spawn on
+            
+        Returns:
+            tuple: (x, y) coordinates for food position, NO_FOOD_POSITION
+                if the snake fills every free cell
+        """
+        try:
+            return free_cells.choice()
+        except IndexError:
+            return NO_FOOD_POSITION
+    
+    def respawn(self, free_cells):
+        """Respawn food at a new random position.
+        
+        Args:
+            free_cells (FreeCells): Index of the cells food may spawn on
+        """
+        self.position = self._find_random_position(free_cells)
+    
+    def copy(self):
+        """Copy the food without drawing a new position.
+        
+        Returns:
+            Food: Food at the same position
+        """
+        food = Food.__new__(Food)
+        food.position = self.position
+        return food
+
+
+# =============================================================================
+# OBSTACLE SYSTEM
+# =============================================================================
+
+class Obstacle:
+    """Represents a fixed obstacle block on the grid."""
+    
+    __slots__ = ('position',)
+    
+    def __init__(self, position):
+        """Initialize obstacle at given position.
+        
+        Args:
+            position (tuple): (x, y) grid coordinates
+        """
+        self.position = position
+    
+    def draw(self, surface):
+        """Draw the obstacle on the surface.
+        
+        Args:
+            surface: pygame surface to draw on
+        """
+        import pygame  # Imported here so the rules stay usable without pygame
+        
+        x, y = self.position
+        rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+        pygame.draw.rect(surface, (100, 100, 100), rect)  # Gray obstacle
+
+
+class ObstacleLayout:
+    """The obstacles of a level, with an occupancy bitset for O(1) lookups.
+    
+    Iterates like a list of Obstacle objects. Layouts are not changed after
+    they are created; a new level gets a new layout.
+    """
+    
+    def __init__(self, obstacles=(), board=None):
+        """Initialize the layout and mark its cells on the grid.
+        
+        Args:
+            obstacles (iterable): Obstacle objects in the layout
+            board (Board): Board the layout is for, defaults to the window size
+        """
+        self.board = board if board is not None else Board()
+        self._obstacles = list(obstacles)
+        self._grid = BitGrid(self.board.num_cells)
+        for obstacle in self._obstacles:
+            if self.board.contains(obstacle.position):
+                self._grid.set(self.board.cell_index(obstacle.position))
+    
+    def __iter__(self):
+        return iter(self._obstacles)
+    
+    def __len__(self):
+        return len(self._obstacles)
+    
+    def contains_position(self, position):
+        """Check if an obstacle covers the given position.
+        
+        Args:
+            position (tuple): (x, y) coordinates to check
+            
+        Returns:
+            bool: True if position is occupied by an obstacle
+        """
+        return (self.board.contains(position) and
+                self._grid[self.board.cell_index(position)] == 1)
+    
+    @cached_property
+    def zobrist_hash(self):
+        """int: Zobrist hash of the covered cells, computed on first use."""
+        keys = self.board.zobrist_keys
+        covered = set(self.board.cell_index(obstacle.position)
+                      for obstacle in self._obstacles
+                      if self.board.contains(obstacle.position))
+        layout_hash = 0
+        for cell in covered:
+            layout_hash ^= _rotate_key(keys[cell], ZOBRIST_OBSTACLE_ROTATION)
+        return layout_hash
+
+
+def create_level_obstacles(level, rng=random, board=None):
+    """Create obstacles for different levels.
+    
+    Args:
+        level (int): Current level number
+        rng (random.Random): Random source for level 3+ layouts, defaults to
+            the global random module
+        board (Board): Board to lay the obstacles out on, defaults to the
+            window size
+        
+    Returns:
+        ObstacleLayout: The level's Obstacle objects, shared between games
+            for levels 1 and 2
+    """
+    if board is None:
+        board = Board()
+    if level in board.fixed_layouts:
+        return board.fixed_layouts[level]
+    obstacles = []
+    
+    if level == 1:
+        # Level 1: Simple border obstacles
+        grid_width = board.width
+        grid_height = board.height
+        
+        # Add some corner obstacles
+        obstacles.extend([
+            Obstacle((5, 5)),
+            Obstacle((grid_width - 6, 5)),
+            Obstacle((5, grid_height - 6)),
+            Obstacle((grid_width - 6, grid_height - 6))
+        ])
+    
+    elif level == 2:
+        # Level 2: More complex pattern
+        grid_width = board.width
+        grid_height = board.height
+        
+        # Create a cross pattern in the middle
+        center_x, center_y = grid_width // 2, grid_height // 2
+        for i in range(-2, 3):
+            obstacles.extend([
+                Obstacle((center_x + i, center_y)),
+                Obstacle((center_x, center_y + i))
+            ])
+    
+    elif level >= 3:
+        # Level 3+: Random obstacles
+        grid_width = board.width
+        grid_height = board.height
+        num_obstacles = min(level * 3, 20)  # Cap at 20 obstacles
+        
+        for _ in range(num_obstacles):
+            x = rng.randint(2, grid_width - 3)
+            y = rng.randint(2, grid_height - 3)
+            obstacles.append(Obstacle((x, y)))
+    
+    layout = ObstacleLayout(obstacles, board)
+    if level < 3:
+        board.fixed_layouts[level] = layout
+    return layout
+
+
+# =============================================================================
+# GAME STATE
+# =============================================================================
+
+def _rotate_key(key, bits):
+    """Rotate a 64-bit Zobrist key left.
+    
+    Args:
+        key (int): 64-bit key
+        bits (int): Number of bits to rotate by
+        
+    Returns:
+        int: Rotated key
+    """
+    return ((key << bits) | (key >> (64 - bits))) & 0xFFFFFFFFFFFFFFFF
+
+
+@lru_cache(maxsize=None)
+def _slot_names(cls):
+    """Get every __slots__ attribute of a class and its bases.
+    
+    Args:
+        cls (type): GameState or a subclass
+        
+    Returns:
+        tuple: Attribute names
+    """
+    return tuple(name for klass in reversed(cls.__mro__)
+                 for name in getattr(klass, '__slots__', ()))
+
+
+class GameState:
+    """Everything the rules need to know about one game.
+    
+    Attributes live in fixed __slots__ rather than a dict, so a state is a
+    few pointers in size and attribute lookups are fast in the tick loop.
+    Front ends can subclass it to add their own slots.
+    
+    snapshot() copies only what moves change (the snake's arrays and
+    bitset, the free-cell index, the food and the random state); boards and
+    obstacle layouts are never modified, so they are shared.
+    """
+    
+    __slots__ = ('seed', 'board', 'rng', 'snake_direction', 'score', 'level',
+                 'max_level', 'is_game_over', 'snake', 'obstacles', 'food')
+    
+    def __init__(self):
+        """Initialize an empty state; start_new_game() fills it in."""
+        self.seed = None
+        self.board = None
+        self.rng = None
+        self.snake_direction = (1, 0)
+        self.score = 0
+        self.level = 1
+        self.max_level = None  # Level the game stops advancing at, if any
+        self.is_game_over = False
+        self.snake = None
+        self.obstacles = None
+        self.food = None
+    
+    def snapshot(self):
+        """Copy the state so it can be restored or explored independently.
+        
+        Returns:
+            GameState: Independent copy of the same class
+        """
+        snapshot = type(self).__new__(type(self))
+        for name in _slot_names(type(self)):
+            setattr(snapshot, name, getattr(self, name))
+        
+        if self.rng is not None:
+            snapshot.rng = random.Random()
+            snapshot.rng.setstate(self.rng.getstate())
+        if self.snake is not None:
+            free_cells = self.snake.free_cells
+            if free_cells is not None:
+                free_cells = free_cells.copy(snapshot.rng)
+            snapshot.snake = self.snake.copy(free_cells)
+        if self.food is not None:
+            snapshot.food = self.food.copy()
+        return snapshot
+    
+    def restore(self, snapshot):
+        """Return to a state taken with snapshot().
+        
+        The snapshot is copied, so it can be restored again later.
+        
+        Args:
+            snapshot (GameState): State from snapshot()
+        """
+        state = snapshot.snapshot()
+        for name in _slot_names(type(state)):
+            setattr(self, name, getattr(state, name))
+    
+    def zobrist_hash(self):
+        """Hash the board position for transposition tables.
+        
+        Combines the covered cells, head, tail, food, obstacles and
+        direction. The covered cells are tracked incrementally by the snake,
+        so this is O(1) after the first call.
+        
+        Returns:
+            int: 64-bit Zobrist hash
+        """
+        snake = self.snake
+        board = snake.board
+        keys = board.zobrist_keys
+        state_hash = snake.body_hash() ^ ZOBRIST_DIRECTION_KEYS.get(self.snake_direction, 0)
+        for position, rotation in ((snake.get_head_position(), ZOBRIST_HEAD_ROTATION),
+                                   (snake.body[-1], ZOBRIST_TAIL_ROTATION),
+                                   (self.food.position, ZOBRIST_FOOD_ROTATION)):
+            if board.contains(position):
+                state_hash ^= _rotate_key(keys[board.cell_index(position)], rotation)
+        if self.obstacles is not None:
+            state_hash ^= self.obstacles.zobrist_hash
+        return state_hash
+
+
+# =============================================================================
+# GAME LOGIC FUNCTIONS
+# =============================================================================
+
+def check_wall_collision(snake_head_position, board=None):
+    """Check if snake head hits the wall boundaries.
+    
+    Args:
+        snake_head_position (tuple): (x, y) coordinates of snake head
+        board (Board): Board whose edges are the walls, defaults to the
+            window size
+        
+    Returns:
+        bool: True if collision with wall detected
+    """
+    if board is None:
+        board = Board()
+    return not board.contains(snake_head_position)
+
+
+def check_self_collision(snake):
+    """Check if snake head collides with its own body.
+    
+    Args:
+        snake (Snake): Snake to check
+        
+    Returns:
+        bool: True if self-collision detected
+    """
+    return snake.is_head_on_body()
+
+
+def check_obstacle_collision(snake_head_position, obstacles):
+    """Check if snake head collides with any obstacle.
+    
+    Args:
+        snake_head_position (tuple): (x, y) coordinates of snake head
+        obstacles (ObstacleLayout): Current level's obstacles
+        
+    Returns:
+        bool: True if collision with obstacle detected
+    """
+    return obstacles.contains_position(snake_head_position)
+
+
+def calculate_game_speed(score):
+    """Calculate current game speed based on score.
+    
+    Args:
+        score (int): Current game score
+        
+    Returns:
+        int: Current speed in moves per second
+    """
+    return BASE_FPS + score // SPEED_INCREASE_INTERVAL
+
+
+def is_reverse_direction(current_direction, new_direction):
+    """Check if a new direction would turn the snake 180° onto itself.
+    
+    Args:
+        current_direction (tuple): Current snake direction (dx, dy)
+        new_direction (tuple): Requested snake direction (dx, dy)
+        
+    Returns:
+        bool: True if the new direction is directly opposite the current one
+    """
+    return (current_direction[0] + new_direction[0] == 0 and
+            current_direction[1] + new_direction[1] == 0)
+
+
+def move_snake(game_state):
+    """Move the snake one cell, growing and respawning food if it is eaten.
+    
+    Args:
+        game_state (GameState): Current game state
+        
+    Returns:
+        bool: True if the snake ate food on this move
+    """
+    snake = game_state.snake
+    food = game_state.food
+    direction = game_state.snake_direction
+    
+    # Check if snake eats food
+    if snake.get_head_position() == food.position:
+        # Snake ate food - grow and respawn food
+        food.respawn(snake.free_cells)
+        game_state.score += 1
+        snake.move(direction, should_grow=True)
+        return True
+    
+    # Normal movement without growth
+    snake.move(direction, should_grow=False)
+    return False
+
+
+def detect_collision(game_state):
+    """Check the snake head against walls, its own body and obstacles.
+    
+    Args:
+        game_state (GameState): Current game state
+        
+    Returns:
+        bool: True if the snake collided with anything
+    """
+    snake = game_state.snake
+    head_position = snake.get_head_position()
+    
+    return (check_wall_collision(head_position, snake.board) or
+            check_self_collision(snake) or
+            check_obstacle_collision(head_position, game_state.obstacles))
+
+
+def level_for_score(score):
+    """Get the level a score has reached.
+    
+    Args:
+        score (int): Current score
+        
+    Returns:
+        int: Level, starting at 1
+    """
+    return score // POINTS_PER_LEVEL + 1
+
+
+def level_for_state(game_state):
+    """Get the level a game's score has reached, up to its max_level.
+    
+    Args:
+        game_state (GameState): Current game state
+        
+    Returns:
+        int: Level, starting at 1
+    """
+    level = level_for_score(game_state.score)
+    if game_state.max_level is not None:
+        level = min(level, game_state.max_level)
+    return level
+
+
+def update_level(game_state):
+    """Advance the level (and its obstacles) every 10 points, up to max_level.
+    
+    Args:
+        game_state (GameState): Current game state
+        
+    Returns:
+        bool: True if the level changed
+    """
+    new_level = level_for_state(game_state)
+    if new_level > game_state.level:
+        game_state.level = new_level
+        set_level_obstacles(game_state, new_level)
+        return True
+    return False
+
+
+def set_level_obstacles(game_state, level):
+    """Create the obstacles for a level and block their cells for food.
+    
+    Food the new layout buries is moved to a free cell, so it can still be
+    eaten.
+    
+    Args:
+        game_state (GameState): Current game state
+        level (int): Level whose obstacle layout to use
+    """
+    snake = game_state.snake
+    obstacles = create_level_obstacles(level, game_state.rng, snake.board)
+    game_state.obstacles = obstacles
+    snake.free_cells.set_blocked(
+        [obstacle.position for obstacle in obstacles], snake)
+    food = game_state.food
+    if food is not None and obstacles.contains_position(food.position):
+        food.respawn(snake.free_cells)
+
+
+def create_snake(rng=random, board=None):
+    """Create a snake in the middle of the board with a fresh free-cell index.
+    
+    Args:
+        rng (random.Random): Random source for food placement
+        board (Board): Board to play on, defaults to the window size
+        
+    Returns:
+        Snake: New snake tracking its free cells
+    """
+    if board is None:
+        board = Board()
+    free_cells = FreeCells(board, rng)
+    return Snake((board.width // 2, board.height // 2), free_cells)
+
+
+def new_seed():
+    """Pick a seed for a new game.
+    
+    Returns:
+        int: Random 32-bit seed
+    """
+    return random.getrandbits(32)
+
+
+def start_new_game(game_state, seed=None, board=None):
+    """Set up the snake, obstacles and food for a new game.
+    
+    Every random choice in the game (food and level 3+ obstacles) comes from
+    a random.Random seeded here, so a seed plus the direction of every move
+    reproduces a whole game.
+    
+    Args:
+        game_state (GameState): Game state to (re)initialize
+        seed (int): Seed for the game, or None to pick a new one
+        board (Board): Board to play on, defaults to the game state's current
+            board or the window size
+        
+    Returns:
+        GameState: The same game state, ready to play
+    """
+    if seed is None:
+        seed = new_seed()
+    rng = random.Random(seed)
+    if board is None:
+        board = game_state.board or Board()
+    
+    game_state.seed = seed
+    game_state.board = board
+    game_state.rng = rng
+    game_state.snake_direction = (1, 0)  # Start moving right
+    game_state.score = 0
+    game_state.level = 1
+    game_state.is_game_over = False
+    game_state.snake = create_snake(rng, board)
+    game_state.food = None  # Placed once the obstacles are
+    set_level_obstacles(game_state, 1)
+    game_state.food = Food(game_state.snake.free_cells)
+    return game_state
@@ -0,0 +1,715 @@
+#!/usr/bin/env python3
+"""
+Snake Hamiltonian Solver - Perfect play along a cycle through the whole board
+
+Builds a Hamiltonian cycle (a closed tour visiting every free cell once) for
+a board and an obstacle layout from create_level_obstacles:
+- The board is split into 2x2 blocks; a spanning tree over the blocks free
+  of obstacles is walked around, which visits every cell of those blocks
+- Free cells left over (next to obstacles or on odd edges) are spliced in
+  two at a time wherever the cycle runs alongside them
+
+Cycles are cached per board size and layout, so the fixed level layouts and
+every game on the same board share one.
+
+A snake that moves along the cycle can never trap itself, so HamiltonianSolver
+follows it and takes shortcuts towards the food while the snake is short:
+- Cycle positions order the board; the body always lies in cycle order
+  between tail and head, so any move landing strictly between head and tail
+  (going forward) is safe
+- Food off the cycle is fetched by stepping out to it and back onto the cycle
+  further ahead
+- When a new level's layout changes the cycle, the snake follows the new one
+  once its body is sure to clear the way, with the autopilot steering until
+  then
+
+Only a game that keeps one layout can fill the board: a long snake rarely
+fits a new cycle, so perfect play stays on level 1 (max_level=1). Cells the
+cycle misses (one per odd-sized board, some beside obstacles) are still
+fetched by stepping out to them, but food there can end a nearly full game.
+
+Works as a policy for the headless engine and steers the pygame game when
+PERFECT_PLAY is enabled in main.py:
+    GameEngine(max_level=1).play(HamiltonianSolver())
+"""
+
+import sys
+import time
+from array import array
+from collections import OrderedDict, deque
+
+from autopilot import Autopilot
+from engine import GameEngine, DIRECTIONS
+from game_logic import Board, is_reverse_direction
+
+CYCLE_CACHE_SIZE = 32  # Cycles kept for reuse, one per board and layout
+SHORTCUT_MAX_FILL = 0.5  # Only shortcut while the snake covers less of the cycle
+SHORTCUT_MARGIN = 2  # Free cycle cells a shortcut must leave ahead of the head
+
+# Solver modes
+ALIGNED = 'aligned'  # Body lies in cycle order; shortcuts allowed
+TRANSITION = 'transition'  # Following a new cycle until the body is in order
+FALLBACK = 'fallback'  # No safe way onto the cycle yet; the autopilot steers
+
+_cycle_cache = OrderedDict()
+
+# =============================================================================
+# CYCLE CONSTRUCTION
+# =============================================================================
+
+class HamiltonianCycle:
+    """A closed tour of a board's free cells in cycle order."""
+
+    def __init__(self, board, cells):
+        """Initialize the cycle and index each cell's place in it.
+
+        Args:
+            board (Board): Board the cycle is on
+            cells (array.array): Cell indices in cycle order
+        """
+        self.board = board
+        self.cells = cells
+        self.index = array('i', [-1]) * board.num_cells  # -1 off the cycle
+        for position, cell in enumerate(cells):
+            self.index[cell] = position
+
+    def __len__(self):
+        return len(self.cells)
+
+    def next_cell(self, cell):
+        """Get the cell after a cell on the cycle.
+
+        Args:
+            cell (int): Cell index on the cycle
+
+        Returns:
+            int: Index of the next cell
+        """
+        return self.cells[(self.index[cell] + 1) % len(self.cells)]
+
+    def covers(self, position):
+        """Check if the cycle passes through a position.
+
+        Args:
+            position (tuple): (x, y) grid coordinates
+
+        Returns:
+            bool: True if the position is on the cycle
+        """
+        return (self.board.contains(position) and
+                self.index[self.board.cell_index(position)] >= 0)
+
+
+def _free_block_tree(board, blocked):
+    """Find a spanning tree over the largest group of connected free 2x2 blocks.
+
+    Args:
+        board (Board): Board to split into blocks
+        blocked (bytearray): 1 for each obstacle cell
+
+    Returns:
+        tuple: (blocks, edges) with the (bx, by) blocks in the tree and the
+            (block, neighbor) tree edges
+    """
+    height = board.height
+    blocks_wide, blocks_high = board.width // 2, board.height // 2
+    free = set()
+    for bx in range(blocks_wide):
+        for by in range(blocks_high):
+            x, y = bx * 2, by * 2
+            if not (blocked[x * height + y] or blocked[x * height + y + 1] or
+                    blocked[(x + 1) * height + y] or
+                    blocked[(x + 1) * height + y + 1]):
+                free.add((bx, by))
+
+    best_blocks, best_edges = [], []
+    seen = set()
+    for bx in range(blocks_wide):
+        for by in range(blocks_high):
+            if (bx, by) not in free or (bx, by) in seen:
+                continue
+            seen.add((bx, by))
+            blocks, edges = [(bx, by)], []
+            queue = deque(blocks)
+            while queue:
+                block = queue.popleft()
+                for dx, dy in DIRECTIONS:
+                    neighbor = (block[0] + dx, block[1] + dy)
+                    if neighbor in free and neighbor not in seen:
+                        seen.add(neighbor)
+                        blocks.append(neighbor)
+                        edges.append((block, neighbor))
+                        queue.append(neighbor)
+            if len(blocks) > len(best_blocks):
+                best_blocks, best_edges = blocks, edges
+    return best_blocks, best_edges
+
+
+def build_cycle(board, obstacles=()):
+    """Build a Hamiltonian cycle through as many free cells as possible.
+
+    Cells that cannot be part of any cycle (a single free cell beside an
+    obstacle, one cell of an odd-sized board) are left off it.
+
+    Args:
+        board (Board): Board to cover
+        obstacles (ObstacleLayout): Obstacles the cycle must avoid
+
+    Returns:
+        HamiltonianCycle: The cycle, empty if no 2x2 block is free
+    """
+    height = board.height
+    blocked = bytearray(board.num_cells)
+    for obstacle in obstacles:
+        if board.contains(obstacle.position):
+            blocked[board.cell_index(obstacle.position)] = 1
+
+    blocks, edges = _free_block_tree(board, blocked)
+    if not blocks:
+        return HamiltonianCycle(board, board.new_cell_array(0, 0))
+
+    # Each block on its own is a small loop: down, right, up, left
+    successor = board.new_cell_array(board.no_cell)
+    for bx, by in blocks:
+        top_left = bx * 2 * height + by * 2
+        top_right = top_left + height
+        successor[top_left] = top_left + 1
+        successor[top_left + 1] = top_right + 1
+        successor[top_right + 1] = top_right
+        successor[top_right] = top_left
+
+    # Joining two neighboring loops across their shared side merges them, so
+    # joining along every tree edge leaves one loop through all the blocks
+    for (bx, by), (nx, ny) in edges:
+        (bx, by), (nx, ny) = min((bx, by), (nx, ny)), max((bx, by), (nx, ny))
+        top_left = bx * 2 * height + by * 2
+        if nx != bx:  # Neighbor to the right
+            successor[top_left + height + 1] = top_left + 2 * height + 1
+            successor[top_left + 2 * height] = top_left + height
+        else:  # Neighbor below
+            successor[top_left + 1] = top_left + 2
+            successor[top_left + height + 2] = top_left + height + 1
+
+    # Splice in pairs of leftover cells that run alongside a cycle edge
+    start = blocks[0][0] * 2 * height + blocks[0][1] * 2
+    on_cycle = bytearray(board.num_cells)
+    cell = start
+    while True:
+        on_cycle[cell] = 1
+        cell = successor[cell]
+        if cell == start:
+            break
+
+    def is_spare(x, y):
+        """Check if a cell is free and not yet on the cycle."""
+        if not (0 <= x < board.width and 0 <= y < height):
+            return False
+        cell = x * height + y
+        return not (blocked[cell] or on_cycle[cell])
+
+    spliced = True
+    while spliced:
+        spliced = False
+        cell = start
+        while True:
+            after = successor[cell]
+            x, y = divmod(cell, height)
+            next_x, next_y = divmod(after, height)
+            offsets = ((0, -1), (0, 1)) if next_y == y else ((-1, 0), (1, 0))
+            for dx, dy in offsets:
+                if is_spare(x + dx, y + dy) and is_spare(next_x + dx, next_y + dy):
+                    side = (x + dx) * height + y + dy
+                    next_side = (next_x + dx) * height + next_y + dy
+                    successor[cell] = side
+                    successor[side] = next_side
+                    successor[next_side] = after
+                    on_cycle[side] = on_cycle[next_side] = 1
+                    spliced = True
+                    break
+            cell = successor[cell]
+            if cell == start:
+                break
+
+    cells = board.new_cell_array(0, 0)
+    cell = start
+    while True:
+        cells.append(cell)
+        cell = successor[cell]
+        if cell == start:
+            break
+    return HamiltonianCycle(board, cells)
+
+
+def cycle_for_layout(board, obstacles):
+    """Get the Hamiltonian cycle for a board and layout, building it once.
+
+    Args:
+        board (Board): Board to cover
+        obstacles (ObstacleLayout): Obstacles the cycle must avoid
+
+    Returns:
+        HamiltonianCycle: Cycle shared by every caller with the same layout
+    """
+    key = (board.width, board.height, obstacles.zobrist_hash)
+    cycle = _cycle_cache.get(key)
+    if cycle is not None:
+        _cycle_cache.move_to_end(key)
+        return cycle
+    cycle = build_cycle(board, obstacles)
+    _cycle_cache[key] = cycle
+    if len(_cycle_cache) > CYCLE_CACHE_SIZE:
+        _cycle_cache.popitem(last=False)
+    return cycle
+
+# =============================================================================
+# SOLVER
+# =============================================================================
+
+class HamiltonianSolver:
+    """Plays along the layout's Hamiltonian cycle, shortcutting to the food."""
+
+    def __init__(self, shortcuts=True):
+        """Initialize with no game tracked yet.
+
+        Args:
+            shortcuts (bool): Cut across the cycle towards the food while the
+                snake is short; False follows the cycle strictly
+        """
+        self.shortcuts = shortcuts
+        self._snake = None
+        self._obstacles = None
+        self._cycle = None
+        self._detours = {}  # Off-cycle food cells entered: cell -> position
+        self._food_position = None
+        self._moves_since_food = 0
+        self._expected_head = None
+        self._mode = None
+        self._transition_moves = 0
+        self._fallback = Autopilot()
+        self.fallback_moves = 0  # Moves steered by the autopilot
+
+    def __call__(self, game_state):
+        """Policy interface for GameEngine.play() and rollouts.
+
+        Args:
+            game_state (GameState): Current game state
+
+        Returns:
+            tuple: (dx, dy) direction for the next move
+        """
+        return self.choose_direction(game_state)
+
+    @property
+    def mode(self):
+        """str: ALIGNED, TRANSITION or FALLBACK (None until the next check)."""
+        return self._mode
+
+    # -------------------------------------------------------------------------
+    # Cycle positions
+    # -------------------------------------------------------------------------
+
+    def _position(self, cell):
+        """Get a cell's place on the cycle, counted in half steps.
+
+        Cycle cells are at even positions; an off-cycle food cell entered
+        from the cycle sits at the odd position just after its entry cell.
+
+        Args:
+            cell (int): Cell index
+
+        Returns:
+            int: Position, or -1 for a cell off the cycle
+        """
+        index = self._cycle.index[cell]
+        if index >= 0:
+            return index * 2
+        return self._detours.get(cell, -1)
+
+    def _is_aligned(self, body):
+        """Check if the body lies in cycle order from tail to head.
+
+        Args:
+            body (list): Cell index of each segment, head first
+
+        Returns:
+            bool: True if every segment is ahead of the one behind it and the
+                body spans less than one lap
+        """
+        size = len(self._cycle) * 2
+        positions = [self._position(cell) for cell in body]
+        if not size or min(positions) < 0:
+            return False
+        span = 0
+        for ahead, behind in zip(positions, positions[1:]):
+            gap = (ahead - behind) % size
+            if not gap:
+                return False
+            span += gap
+        return span < size
+
+    def _can_follow(self, body, will_grow):
+        """Check if following the cycle strictly from the head is safe.
+
+        Segment j (0 = head) leaves its cell after len(body) - j moves, so
+        every segment on the cycle must be at least that far ahead of the
+        head along it.
+
+        Args:
+            body (list): Cell index of each segment, head first
+            will_grow (bool): True if the snake grows on the next move
+
+        Returns:
+            bool: True if the head can follow the cycle until the whole body
+                has been replaced
+        """
+        cycle = self._cycle
+        head_index = cycle.index[body[0]]
+        if head_index < 0:
+            return False
+        if len(body) > 1 and cycle.next_cell(body[0]) == body[1]:
+            return False  # The way on is a reversal, which the game ignores
+        extra = 1 if will_grow else 0
+        length = len(body)
+        cycle_length = len(cycle)
+        for segment, cell in enumerate(body[1:], 1):
+            index = cycle.index[cell]
+            if index < 0:
+                continue  # The head never visits cells off the cycle
+            if (index - head_index) % cycle_length < length - segment + extra:
+                return False
+        return True
+
+    def _resync(self, game_state, head):
+        """Work out how to steer after a new game, layout or unexpected move.
+
+        Args:
+            game_state (GameState): Current game state
+            head (int): Cell index of the head
+        """
+        snake = game_state.snake
+        board = snake.board
+        if snake is not self._snake:
+            self._snake = snake
+            self._detours = {}
+        if game_state.obstacles is not self._obstacles:
+            self._obstacles = game_state.obstacles
+            cycle = cycle_for_layout(board, game_state.obstacles)
+            if cycle is not self._cycle:
+                self._cycle = cycle
+                self._detours = {}
+        self._expected_head = head
+
+        body = [board.cell_index(position) for position in snake.body]
+        will_grow = snake.get_head_position() == game_state.food.position
+        if self._is_aligned(body):
+            self._mode = ALIGNED
+        elif self._can_follow(body, will_grow):
+            self._mode = TRANSITION
+            self._transition_moves = len(body)
+        else:
+            self._mode = FALLBACK
+
+    # -------------------------------------------------------------------------
+    # Decisions
+    # -------------------------------------------------------------------------
+
+    def _food_target(self, game_state, head, head_position):
+        """Get the cycle position the food is reached from.
+
+        Args:
+            game_state (GameState): Current game state
+            head (int): Cell index of the head
+            head_position (int): Cycle position of the head
+
+        Returns:
+            tuple: (food cell, target position); both None if there is no
+                food to head for
+        """
+        board = self._cycle.board
+        food = game_state.food.position
+        if not board.contains(food) or game_state.obstacles.contains_position(food):
+            return None, None  # Off the board or buried by a new level
+        food_cell = board.cell_index(food)
+        if food_cell == head:
+            return None, None  # Eaten this move; the new food is not out yet
+        index = self._cycle.index[food_cell]
+        if index >= 0:
+            return food_cell, index * 2
+
+        # Off the cycle: aim for the first cycle cell beside it
+        size = len(self._cycle) * 2
+        entries = [self._cycle.index[neighbor] * 2
+                   for neighbor in self._neighbors(food_cell)
+                   if self._cycle.index[neighbor] >= 0]
+        if not entries:
+            return None, None
+        return food_cell, min(entries,
+                              key=lambda entry: (entry - head_position) % size or size)
+
+    def _is_food_on_route(self, game_state):
+        """Check if the cycle, with a step out for food off it, leads to the food.
+
+        Args:
+            game_state (GameState): Current game state
+
+        Returns:
+            bool: False if the food sits off the cycle with fewer than two
+                cycle cells beside it, or the snake has gone round the
+                cycle twice since it appeared; True if there is no food
+                that can be eaten
+        """
+        cycle = self._cycle
+        food = game_state.food.position
+        if food != self._food_position:
+            self._food_position = food
+            self._moves_since_food = 0
+        if (not cycle.board.contains(food) or
+                game_state.obstacles.contains_position(food)):
+            return True  # Nothing to eat; keep circling
+        self._moves_since_food += 1
+        if self._moves_since_food > len(cycle) * 2:
+            return False
+        food_cell = cycle.board.cell_index(food)
+        if cycle.index[food_cell] >= 0:
+            return True
+        entries = sum(1 for neighbor in self._neighbors(food_cell)
+                      if cycle.index[neighbor] >= 0)
+        return entries >= 2
+
+    def _neighbors(self, cell):
+        """Get the on-board neighbors of a cell.
+
+        Args:
+            cell (int): Cell index
+
+        Returns:
+            list: Neighboring cell indices
+        """
+        board = self._cycle.board
+        x, y = divmod(cell, board.height)
+        return [nx * board.height + ny for nx, ny in
+                ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y))
+                if 0 <= nx < board.width and 0 <= ny < board.height]
+
+    def _has_way_on(self, cell, position, tail_position, will_grow):
+        """Check if the head has a safe move after landing on a cell.
+
+        Args:
+            cell (int): Cell the head lands on
+            position (int): Cycle position of that cell
+            tail_position (int): Cycle position of the tail after the move
+            will_grow (bool): True if the snake grows on the following move
+
+        Returns:
+            bool: True if some next move stays between head and tail
+        """
+        size = len(self._cycle) * 2
+        limit = (tail_position - position) % size or size
+        for neighbor in self._neighbors(cell):
+            index = self._cycle.index[neighbor]
+            if index < 0:
+                continue
+            step = (index * 2 - position) % size
+            if 0 < step < limit or (step == limit and not will_grow):
+                return True
+        return False
+
+    def _aligned_move(self, game_state, head):
+        """Pick the next cell for a snake lying in cycle order.
+
+        Args:
+            game_state (GameState): Current game state
+            head (int): Cell index of the head
+
+        Returns:
+            int: Cell to move to, or None if no move keeps the body in order
+        """
+        snake = game_state.snake
+        body = snake.body
+        board = self._cycle.board
+        cycle = self._cycle
+        size = len(cycle) * 2
+        length = len(body)
+        head_position = self._position(head)
+        will_grow = snake.get_head_position() == game_state.food.position
+
+        # Moves must land strictly between head and tail, or on a tail that
+        # moves away this turn
+        tail_position = self._position(board.cell_index(body[-1]))
+        limit = (tail_position - head_position) % size or size
+        if will_grow:
+            new_tail_position = tail_position
+        elif length > 1:
+            new_tail_position = self._position(board.cell_index(body[-2]))
+        else:
+            new_tail_position = None  # The head becomes the tail
+
+        food_cell, target = self._food_target(game_state, head, head_position)
+        to_target = (target - head_position) % size or size if target is not None else 0
+        may_shortcut = (self.shortcuts and
+                        length < len(cycle) * SHORTCUT_MAX_FILL)
+        head_x, head_y = snake.get_head_position()
+
+        best_cell, best_key = None, None
+        for direction in DIRECTIONS:
+            if is_reverse_direction(game_state.snake_direction, direction):
+                continue
+            x, y = head_x + direction[0], head_y + direction[1]
+            if not board.contains((x, y)):
+                continue
+            cell = board.cell_index((x, y))
+            index = cycle.index[cell]
+            if index >= 0:
+                position = index * 2
+            elif cell == food_cell and head_position % 2 == 0:
+                position = head_position + 1  # Step out to the food
+            else:
+                continue
+            step = (position - head_position) % size
+            if not (0 < step < limit or (step == limit and not will_grow)):
+                continue
+            is_shortcut = step > 2 and head_position % 2 == 0
+            if is_shortcut and not (
+                    may_shortcut and (limit - step) // 2 >= SHORTCUT_MARGIN):
+                continue
+            tail_after = (position if new_tail_position is None
+                          else new_tail_position)
+            if not self._has_way_on(cell, position, tail_after,
+                                    cell == food_cell):
+                continue
+
+            if cell == food_cell:
+                key = -1
+            elif target is None:
+                key = step  # No food to chase: keep to the cycle
+            elif step <= to_target:
+                key = (target - position) % size
+            else:
+                key = size + step  # Past the food: overshoot as little as possible
+            if best_key is None or key < best_key:
+                best_cell, best_key = cell, key
+
+        if best_cell is not None and cycle.index[best_cell] < 0:
+            self._detours[best_cell] = head_position + 1
+        return best_cell
+
+    def _transition_move(self, game_state, head):
+        """Follow a new cycle strictly until the body lies in its order.
+
+        Args:
+            game_state (GameState): Current game state
+            head (int): Cell index of the head
+
+        Returns:
+            int: Cell to move to, or None if following is no longer safe
+        """
+        snake = game_state.snake
+        if snake.get_head_position() == game_state.food.position:
+            # Growing delays the body clearing the way, so check again
+            board = snake.board
+            body = [board.cell_index(position) for position in snake.body]
+            if not self._can_follow(body, True):
+                return None
+        self._transition_moves -= 1
+        if not self._transition_moves:
+            self._mode = None  # Check the body's order again next move
+        return self._cycle.next_cell(head)
+
+    def _rejoin_move(self, game_state, head):
+        """Find a move after which the snake can follow the cycle safely.
+
+        Args:
+            game_state (GameState): Current game state
+            head (int): Cell index of the head
+
+        Returns:
+            int: Cell to move to, or None if no move leads onto the cycle
+        """
+        snake = game_state.snake
+        board = snake.board
+        will_grow = snake.get_head_position() == game_state.food.position
+        body = [board.cell_index(position) for position in snake.body]
+        if not will_grow:
+            body.pop()
+        head_x, head_y = snake.get_head_position()
+        for direction in DIRECTIONS:
+            if is_reverse_direction(game_state.snake_direction, direction):
+                continue
+            position = (head_x + direction[0], head_y + direction[1])
+            if (not self._cycle.covers(position) or
+                    game_state.obstacles.contains_position(position)):
+                continue
+            cell = board.cell_index(position)
+            if cell in body:
+                continue
+            moved_body = [cell] + body
+            if self._can_follow(moved_body, position == game_state.food.position):
+                self._mode = TRANSITION
+                self._transition_moves = len(moved_body)
+                return cell
+        return None
+
+    def choose_direction(self, game_state):
+        """Pick the direction for the next move.
+
+        Args:
+            game_state (GameState): Current game state
+
+        Returns:
+            tuple: (dx, dy) direction
+        """
+        snake = game_state.snake
+        board = snake.board
+        head_x, head_y = snake.get_head_position()
+        head = board.cell_index((head_x, head_y))
+        if (snake is not self._snake or
+                game_state.obstacles is not self._obstacles or
+                head != self._expected_head or
+                self._mode not in (ALIGNED, TRANSITION)):
+            self._resync(game_state, head)
+
+        # Food the cycle can't lead to is left to the autopilot
+        cell = None
+        if not self._is_food_on_route(game_state):
+            self._mode = FALLBACK
+        else:
+            if self._mode == ALIGNED:
+                cell = self._aligned_move(game_state, head)
+            elif self._mode == TRANSITION:
+                cell = self._transition_move(game_state, head)
+            if cell is None:
+                cell = self._rejoin_move(game_state, head)
+        if cell is None:
+            self._mode = FALLBACK
+            self.fallback_moves += 1
+            return self._fallback(game_state)
+
+        self._expected_head = cell
+        x, y = board.position_of(cell)
+        return (x - head_x, y - head_y)
+
+
+def main():
+    """Play perfect-play games headlessly and report how full the board got."""
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else width
+    num_games = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+
+    board = Board(width, height)
+    total_ticks = 0
+    start_time = time.perf_counter()
+    for seed in range(num_games):
+        engine = GameEngine(seed, board, max_level=1)
+        solver = HamiltonianSolver()
+        result = engine.play(solver, max_ticks=1000000)
+        total_ticks += result['ticks']
+        print(f"seed {seed}: score {result['score']}, level {result['level']}, "
+              f"length {result['length']} of {board.num_cells} cells, "
+              f"{result['ticks']} moves, {solver.fallback_moves} autopilot moves")
+    elapsed = time.perf_counter() - start_time
+    print(f"{total_ticks / elapsed:.0f} moves/s on a "
+          f"{board.width}x{board.height} board")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Snake Leaderboard - Every finished game kept in SQLite, written off the game thread
+
+Each game's player, score, level, length, moves and seed are stored in a
+SQLite database in WAL mode, giving per-player history, top-N tables and
+per-level stats:
+- Writes are queued and a background thread inserts them in batches, so
+  finishing a game never waits on the disk
+- The high score, top scores and per-level stats are cached in memory and
+  updated as games are recorded, so the game loop never queries the database
+- An old highscore.txt is imported the first time the database is created
+
+Pygame-free; main.py records each game as it ends:
+    leaderboard = Leaderboard('leaderboard.db')
+    leaderboard.record_game('player', score=12, level=2, length=15)
+    print(leaderboard.high_score, leaderboard.top_scores(5))
+    leaderboard.close()
+
+Usage:
+    python leaderboard.py [DATABASE]   # prints the top scores and level stats
+"""
+
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+LEADERBOARD_DATABASE = 'leaderboard.db'
+LEGACY_HIGH_SCORE_FILE = 'highscore.txt'  # Imported once into a new database
+LEGACY_PLAYER = 'legacy'  # Player name given to the imported high score
+TOP_SCORES_CACHED = 100  # Longest top-N table served from memory
+WRITE_BATCH_SIZE = 500  # Most games inserted in one transaction
+WRITE_BATCH_DELAY = 0.5  # Seconds the writer waits for a batch to fill up
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    ticks INTEGER NOT NULL,
+    seed INTEGER,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_score ON games (score DESC);
+CREATE INDEX IF NOT EXISTS games_by_player ON games (player, played_at);
+"""
+
+INSERT_GAME = """
+INSERT INTO games (player, score, level, length, ticks, seed, played_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_STOP = object()  # Queued by close() to end the writer thread
+
+
+def connect(path):
+    """Open a connection to a leaderboard database, creating its tables.
+
+    Args:
+        path (str): Database file
+
+    Returns:
+        sqlite3.Connection: Connection in WAL mode
+    """
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA journal_mode=WAL')
+    # WAL stays consistent without syncing every commit; a crash can at
+    # worst lose the last few games
+    connection.execute('PRAGMA synchronous=NORMAL')
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class Leaderboard:
+    """Scores of all finished games, cached for reads and written in batches."""
+
+    def __init__(self, path=LEADERBOARD_DATABASE,
+                 legacy_file=LEGACY_HIGH_SCORE_FILE):
+        """Open the database, load the caches and start the writer thread.
+
+        Args:
+            path (str): Database file, created if missing
+            legacy_file (str): highscore.txt to import into a new database,
+                or None to skip the import
+        """
+        self.path = path
+        self.write_errors = 0  # Batches the writer failed to store
+        self._connection = connect(path)
+        if legacy_file is not None:
+            self._import_legacy_high_score(legacy_file)
+        self._load_caches()
+
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_batches,
+                                        name='leaderboard-writer', daemon=True)
+        self._writer.start()
+
+    # -------------------------------------------------------------------------
+    # Cached reads
+    # -------------------------------------------------------------------------
+
+    def _import_legacy_high_score(self, legacy_file):
+        """Import highscore.txt if the database has no games yet.
+
+        Args:
+            legacy_file (str): Path of the old high score file
+        """
+        if self._connection.execute('SELECT 1 FROM games LIMIT 1').fetchone():
+            return
+        try:
+            with open(legacy_file, 'r') as file:
+                score = int(file.read().strip())
+        except (FileNotFoundError, ValueError):
+            return
+        with self._connection:
+            self._connection.execute(INSERT_GAME, (
+                LEGACY_PLAYER, score, 0, 0, 0, None,
+                os.path.getmtime(legacy_file)))
+
+    def _load_caches(self):
+        """Read the top scores and per-level stats into memory."""
+        self._top_scores = self._connection.execute(
+            'SELECT score, player FROM games ORDER BY score DESC, id LIMIT ?',
+            (TOP_SCORES_CACHED,)).fetchall()
+        self._level_stats = {
+            level: [games, best, total]
+            for level, games, best, total in self._connection.execute(
+                'SELECT level, COUNT(*), MAX(score), SUM(score) '
+                'FROM games GROUP BY level')}
+
+    @property
+    def high_score(self):
+        """int: Best score of any game, 0 before the first game."""
+        return self._top_scores[0][0] if self._top_scores else 0
+
+    def top_scores(self, count=10):
+        """Get the best scores, from memory.
+
+        Args:
+            count (int): Number of scores, at most TOP_SCORES_CACHED
+
+        Returns:
+            list: (score, player) tuples, best first
+        """
+        return self._top_scores[:count]
+
+    def level_stats(self):
+        """Get per-level stats of the games that ended on each level, from memory.
+
+        Returns:
+            dict: Level -> {'games', 'best', 'average'}, by level
+        """
+        return {level: {'games': games, 'best': best, 'average': total / games}
+                for level, (games, best, total)
+                in sorted(self._level_stats.items())}
+
+    def player_history(self, player, count=20):
+        """Get a player's most recent games from the database.
+
+        Waits for queued games to be written first, so it is meant for menus
+        and tools rather than the game loop.
+
+        Args:
+            player (str): Player name
+            count (int): Number of games
+
+        Returns:
+            list: Dicts with 'score', 'level', 'length', 'ticks', 'seed'
+                and 'played_at', newest first
+        """
+        self.flush()
+        rows = self._connection.execute(
+            'SELECT score, level, length, ticks, seed, played_at FROM games '
+            'WHERE player = ? ORDER BY played_at DESC, id DESC LIMIT ?',
+            (player, count))
+        return [{'score': score, 'level': level, 'length': length,
+                 'ticks': ticks, 'seed': seed, 'played_at': played_at}
+                for score, level, length, ticks, seed, played_at in rows]
+
+    # -------------------------------------------------------------------------
+    # Batched writes
+    # -------------------------------------------------------------------------
+
+    def record_game(self, player, score, level, length, ticks=0, seed=None):
+        """Record a finished game without waiting for the database.
+
+        The caches are updated at once; the row is written by the writer
+        thread with the next batch.
+
+        Args:
+            player (str): Player name
+            score (int): Final score
+            level (int): Level the game ended on
+            length (int): Final snake length
+            ticks (int): Moves played
+            seed (int): Seed the game was started with
+        """
+        self._queue.put((player, score, level, length, ticks, seed,
+                         time.time()))
+
+        top_scores = self._top_scores
+        if (len(top_scores) < TOP_SCORES_CACHED or
+                score > top_scores[-1][0]):
+            # Ties keep the earlier game first, as ORDER BY score, id does
+            index = len(top_scores)
+            while index and top_scores[index - 1][0] < score:
+                index -= 1
+            top_scores.insert(index, (score, player))
+            del top_scores[TOP_SCORES_CACHED:]
+
+        stats = self._level_stats.setdefault(level, [0, score, 0])
+        stats[0] += 1
+        stats[1] = max(stats[1], score)
+        stats[2] += score
+
+    def _write_batches(self):
+        """Writer thread: insert queued games, many per transaction.
+
+        Every queued game is taken off the queue even when it cannot be
+        stored, so flush() and close() never hang on a broken database.
+        Failed batches are counted in write_errors; only the first one is
+        reported.
+        """
+        connection = None  # Opened with the first batch, retried if it fails
+        is_running = True
+        while is_running:
+            batch = []
+            item = self._queue.get()
+            deadline = time.monotonic() + WRITE_BATCH_DELAY
+            while item is not _STOP:
+                batch.append(item)
+                if len(batch) == WRITE_BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get(
+                        timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+            is_running = item is not _STOP
+
+            try:
+                if batch:
+                    if connection is None:
+                        connection = connect(self.path)
+                    with connection:
+                        connection.executemany(INSERT_GAME, batch)
+            except sqlite3.Error as error:
+                self.write_errors += 1
+                if self.write_errors == 1:
+                    print(f"Leaderboard: could not save {len(batch)} games "
+                          f"to {self.path}: {error}", file=sys.stderr)
+            finally:
+                for _ in range(len(batch) + (not is_running)):
+                    self._queue.task_done()
+        if connection is not None:
+            connection.close()
+
+    def flush(self):
+        """Wait until every recorded game has been written (or has failed to be)."""
+        if self._writer.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """Write the remaining games and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        self._connection.close()
+
+
+def main():
+    """Print the top scores and per-level stats of a leaderboard database."""
+    path = sys.argv[1] if len(sys.argv) > 1 else LEADERBOARD_DATABASE
+    leaderboard = Leaderboard(path, legacy_file=None)
+    print("Top scores:")
+    for rank, (score, player) in enumerate(leaderboard.top_scores(), 1):
+        print(f"  {rank:>2}. {score:>6}  {player}")
+    print("Levels:")
+    for level, stats in leaderboard.level_stats().items():
+        print(f"  level {level:>2}: {stats['games']} games, best "
+              f"{stats['best']}, average {stats['average']:.1f}")
+    leaderboard.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,70 @@
 #!/usr/bin/env python3
 """
-Snake Game - A simple implementation using pygame and deque
+Snake Game - The pygame front end for the rules in game_logic.py
 
 A classic Snake game with:
-- Grid-based movement using collections.deque
+- Grid-based movement; the snake is a ring buffer of cell indices (see
+  game_logic.Snake)
 - Progressive speed increase with score
-- High score persistence
+- High scores kept in a SQLite leaderboard
 - Game over screen with restart functionality
 """
 
-import pygame
+import time
+
+_import_start_time = time.perf_counter()
+_startup_times = []  # (step name, seconds) in the order startup steps ran
+
+import atexit
+import hashlib
+import importlib.util
+import os
 import sys
-import random
 from collections import deque
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+
+from game_logic import (
+    WINDOW_WIDTH, WINDOW_HEIGHT, CELL_SIZE,
+    Board, GameState, start_new_game,
+    calculate_game_speed,
+    is_reverse_direction, move_snake, detect_collision, update_level,
+)
+
+
+def _lazy_import(module_name):
+    """Import a module whose code only runs when an attribute is first used.
+    
+    Args:
+        module_name (str): Name of the module to import
+        
+    Returns:
+        module: The (possibly not yet loaded) module
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.find_spec(module_name)
+    if spec is None:
+        raise ImportError(f"No module named '{module_name}'")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    loader.exec_module(module)
+    return module
+
+
+# pygame loads on first use, so tools importing this module for its game
+# logic don't pay for it
+pygame = _lazy_import('pygame')
+
+_startup_times.append(('module import', time.perf_counter() - _import_start_time))
 
 # =============================================================================
-# GAME SETTINGS - Easy to modify colors, sizes, and gameplay parameters
+# GAME SETTINGS - Easy to modify colors and display parameters
+# (grid size and game speed live in game_logic.py)
 # =============================================================================
 
-# Window and Grid Settings
-WINDOW_WIDTH = 800
-WINDOW_HEIGHT = 600
-CELL_SIZE = 20
-BASE_FPS = 10  # Base speed for snake movement (moves per second)
-
 # Color Settings (RGB values)
 COLORS = {
     'background': (0, 0, 0),           # Black background
@@ -31,136 +72,169 @@ COLORS = {
     'snake_head': (0, 255, 0),         # Bright green snake head
     'snake_body': (0, 200, 0),         # Darker green snake body
     'food': (255, 0, 0),               # Red food
+    'obstacle': (100, 100, 100),       # Gray obstacles
     'text': (255, 255, 255),           # White text
 }
 
 # Gameplay Settings
-SPEED_INCREASE_INTERVAL = 5  # Score interval for speed increase
 DISPLAY_FPS = 60  # Fixed display refresh rate
 ENABLE_SOUND = True  # Set to False to disable sound effects
-
-# Initialize Pygame
-pygame.init()
-
-# Initialize sound mixer if sound is enabled
-if ENABLE_SOUND:
-    pygame.mixer.init()
+INCREMENTAL_RENDERING = True  # Repaint only changed cells instead of full frames
+INTERPOLATE_MOVEMENT = False  # Slide the head and tail between cells (full frames)
+TEXT_CACHE_SIZE = 64  # Number of rendered text surfaces kept for reuse
+MAX_CATCH_UP_MOVES = 5  # Most moves run in one frame after a slow frame
+TURN_QUEUE_SIZE = 3  # Turns buffered ahead of the snake, one used per move
+TURBO_MODE = False  # Run one move per frame with no frame cap (soak tests)
+RECORD_REPLAYS = False  # Save every game as a replay file (see replay.py)
+REPLAY_DIRECTORY = 'replays'  # Where replay files are written
+AUTOPILOT = False  # Let the pathfinding bot steer (attract mode, load tests)
+PERFECT_PLAY = False  # Play along a Hamiltonian cycle on level 1 (fills the board)
+
+# Sprite Settings
+SNAKE_SKIN = 'classic'  # 'classic' flat cells or 'segmented' (rounded, with eyes)
+SKIN_IMAGE = None  # Sprite sheet file to take the tiles from instead (see TILE_NAMES)
+
+# Board Settings (None fits the window; bigger boards scroll with the snake)
+BOARD_WIDTH = None  # Grid columns
+BOARD_HEIGHT = None  # Grid rows
+
+# Sound Settings
+SOUND_FREQUENCY = 44100  # Mixer sample rate (Hz)
+SOUND_CHANNELS = 2  # Stereo
+SOUND_CACHE_DIRECTORY = 'sound_cache'  # Synthesized waveforms cached as raw PCM
+
+# Sawtooth waveforms for each sound effect
+EAT_SOUND = {'amplitude': 4096, 'ramp': 0.5, 'period': 100, 'length': 1000}
+GAME_OVER_SOUND = {'amplitude': 2048, 'ramp': 0.3, 'period': 200, 'length': 2000}
+
+REPORT_STARTUP_TIME = False  # Print how long each startup step took
+
+# Leaderboard Settings
+SAVE_SCORES = True  # Record finished games in the leaderboard database
+LEADERBOARD_FILE = 'leaderboard.db'  # SQLite database of all finished games
+PLAYER_NAME = 'player'  # Name finished games are recorded under
+
+# Profiling Settings
+PROFILE_FRAMES = False  # Time each part of every frame and show the debug overlay
+PROFILE_TRACE_FILE = 'frame_trace.json'  # chrome://tracing file written on exit
+OVERLAY_REFRESH_FRAMES = 30  # Frames between debug overlay text updates
+OVERLAY_FONT_SIZE = 20
 
 # =============================================================================
-# GAME CLASSES
+# SOUND EFFECTS
 # =============================================================================
 
-class Snake:
-    """Represents the snake in the game using deque for efficient head/tail operations."""
+def synthesize_sound(amplitude, ramp, period, length):
+    """Synthesize a sawtooth waveform as 16-bit PCM samples.
     
-    def __init__(self, start_position):
-        """Initialize snake with starting position.
+    Args:
+        amplitude (int): Base sample value
+        ramp (float): How far each sawtooth tooth rises above the base
+        period (int): Samples per tooth
+        length (int): Number of samples
         
-        Args:
-            start_position (tuple): (x, y) grid coordinates for snake head
-        """
-        self.body = deque([start_position])
+    Returns:
+        bytes: Interleaved 16-bit PCM for SOUND_CHANNELS channels
+    """
+    import numpy as np  # Only needed when the sound cache is cold
     
-    def move(self, direction, should_grow=False):
-        """Move snake in given direction.
-        
-        Args:
-            direction (tuple): (dx, dy) movement direction
-            should_grow (bool): If True, snake grows by one segment
-        """
-        current_head_x, current_head_y = self.body[0]
-        new_head_position = (current_head_x + direction[0], current_head_y + direction[1])
-        
-        # Add new head to front of deque
-        self.body.appendleft(new_head_position)
-        
-        # Remove tail if not growing
-        if not should_grow:
-            self.body.pop()
+    sample_index = np.arange(length)
+    wave = (amplitude * (1 + ramp * (sample_index % period) / period)).astype(np.int16)
+    return np.repeat(wave[:, None], SOUND_CHANNELS, axis=1).tobytes()
+
+
+def load_sound_pcm(name, params):
+    """Load a sound's PCM samples from the disk cache, synthesizing on a miss.
     
-    def get_head_position(self):
-        """Get the current head position.
+    Args:
+        name (str): Sound name, used in the cache file name
+        params (dict): Arguments for synthesize_sound
         
-        Returns:
-            tuple: (x, y) coordinates of snake head
-        """
-        return self.body[0]
+    Returns:
+        bytes: Interleaved 16-bit PCM samples
+    """
+    key = hashlib.sha1(repr((sorted(params.items()), SOUND_CHANNELS)).encode())
+    cache_path = os.path.join(SOUND_CACHE_DIRECTORY,
+                              f"{name}_{key.hexdigest()[:16]}.pcm")
+    try:
+        with open(cache_path, 'rb') as file:
+            return file.read()
+    except IOError:
+        pass
     
-    def contains_position(self, position):
-        """Check if snake body contains the given position.
-        
-        Args:
-            position (tuple): (x, y) coordinates to check
-            
-        Returns:
-            bool: True if position is occupied by snake
-        """
-        return position in self.body
+    pcm = synthesize_sound(**params)
+    try:
+        os.makedirs(SOUND_CACHE_DIRECTORY, exist_ok=True)
+        with open(cache_path, 'wb') as file:
+            file.write(pcm)
+    except IOError:
+        pass  # Silently fail if can't write file
+    return pcm
+
+
+_mixer_failed = False  # Set once mixer init fails, so it isn't retried
 
 
-class Food:
-    """Represents the food that the snake can eat."""
+def _ensure_mixer():
+    """Start the sound mixer if it is not running yet.
     
-    def __init__(self, snake_body):
-        """Initialize food at a random position not occupied by snake.
-        
-        Args:
-            snake_body (deque): Current snake body positions to avoid
-        """
-        self.position = self._find_random_position(snake_body)
+    A failed start is remembered: without an audio device every later
+    sound returns at once instead of retrying the slow init.
     
-    def _find_random_position(self, snake_body):
-        """Find a random position not occupied by the snake.
-        
-        Args:
-            snake_body (deque): Snake body positions to avoid
-            
-        Returns:
-            tuple: (x, y) coordinates for food position
-        """
-        grid_width = WINDOW_WIDTH // CELL_SIZE
-        grid_height = WINDOW_HEIGHT // CELL_SIZE
-        
-        # Generate all possible grid positions
-        all_positions = [(x, y) for x in range(grid_width) for y in range(grid_height)]
-        
-        # Filter out positions occupied by snake
-        available_positions = [pos for pos in all_positions if pos not in snake_body]
-        
-        return random.choice(available_positions)
+    Returns:
+        bool: True if the mixer is available
+    """
+    global _mixer_failed
+    if _mixer_failed:
+        return False
+    if pygame.mixer.get_init():
+        return True
+    try:
+        with startup_step('mixer init'):
+            pygame.mixer.init(frequency=SOUND_FREQUENCY, size=-16,
+                              channels=SOUND_CHANNELS)
+    except pygame.error:
+        _mixer_failed = True  # No audio device, play silently
+        return False
+    return True
+
+
+class LazySound:
+    """Sound effect that starts the mixer and loads its samples on first play."""
     
-    def respawn(self, snake_body):
-        """Respawn food at a new random position.
+    def __init__(self, name, params):
+        """Initialize the sound without touching the mixer.
         
         Args:
-            snake_body (deque): Current snake body to avoid
+            name (str): Sound name, used for the cache file
+            params (dict): Arguments for synthesize_sound
         """
-        self.position = self._find_random_position(snake_body)
+        self.name = name
+        self.params = params
+        self._sound = None
+    
+    def play(self):
+        """Play the sound, loading it first if needed."""
+        if self._sound is None:
+            if not _ensure_mixer():
+                return
+            self._sound = pygame.mixer.Sound(
+                buffer=load_sound_pcm(self.name, self.params))
+        self._sound.play()
 
-# =============================================================================
-# SOUND EFFECTS
-# =============================================================================
 
 def create_sound_effects():
-    """Create simple sound effects using pygame's sound generation."""
+    """Create the eat and game over sound effects.
+    
+    Returns:
+        tuple: (eat_sound, game_over_sound), or (None, None) with sound off
+    """
     if not ENABLE_SOUND:
         return None, None
     
-    # Create a simple beep sound for eating food
-    eat_sound = pygame.sndarray.make_sound(
-        pygame.sndarray.array(
-            [[int(4096 * (1 + 0.5 * (i % 100) / 100)) for _ in range(2)] 
-             for i in range(1000)]
-        )
-    )
-    
-    # Create a lower pitched sound for game over
-    game_over_sound = pygame.sndarray.make_sound(
-        pygame.sndarray.array(
-            [[int(2048 * (1 + 0.3 * (i % 200) / 200)) for _ in range(2)] 
-             for i in range(2000)]
-        )
-    )
+    # A simple beep for eating food and a lower pitched sound for game over
+    eat_sound = LazySound('eat', EAT_SOUND)
+    game_over_sound = LazySound('game_over', GAME_OVER_SOUND)
     
     return eat_sound, game_over_sound
 
@@ -172,116 +246,421 @@ def play_sound(sound):
 
 
 # =============================================================================
-# OBSTACLE SYSTEM
+# INITIALIZATION FUNCTIONS
+# =============================================================================
+
+@contextmanager
+def startup_step(name):
+    """Time a startup step for the startup report.
+    
+    Args:
+        name (str): Step name shown in the report
+    """
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        _startup_times.append((name, time.perf_counter() - start_time))
+
+
+def get_startup_report():
+    """Get how long each startup step took so far.
+    
+    Returns:
+        list: (step name, seconds) pairs, starting with the module import
+    """
+    return list(_startup_times)
+
+
+def print_startup_report():
+    """Print the startup report to stdout."""
+    print("ByteSnake startup:")
+    for name, seconds in get_startup_report():
+        print(f"  {name:<24} {seconds * 1000:8.1f} ms")
+    total = sum(seconds for _, seconds in _startup_times)
+    print(f"  {'total':<24} {total * 1000:8.1f} ms")
+
+
+def initialize_pygame():
+    """Initialize pygame display and return screen and clock objects.
+    
+    Starts only the display and font subsystems; the sound mixer starts
+    when the first sound plays.
+    
+    Returns:
+        tuple: (screen, clock) pygame objects
+    """
+    with startup_step('display init'):  # Its first use also loads pygame
+        pygame.display.init()
+    with startup_step('font init'):
+        pygame.font.init()
+    with startup_step('window'):
+        screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption("ByteSnake")
+    clock = pygame.time.Clock()
+    return screen, clock
+
+
+# =============================================================================
+# TILE ATLAS
 # =============================================================================
 
-class Obstacle:
-    """Represents a fixed obstacle block on the grid."""
+# Order of the tiles in an atlas, and in a SKIN_IMAGE sprite sheet (one row,
+# any tile size). Heads face and tail tips point the named way, turns join
+# the two named sides of their cell, and 'body' is a segment whose
+# neighbours aren't known.
+TILE_NAMES = (
+    'head_up', 'head_down', 'head_left', 'head_right',
+    'body_vertical', 'body_horizontal',
+    'turn_up_left', 'turn_up_right', 'turn_down_left', 'turn_down_right',
+    'tail_up', 'tail_down', 'tail_left', 'tail_right',
+    'body', 'food', 'obstacle',
+)
+SIDES = {'up': (0, -1), 'down': (0, 1), 'left': (-1, 0), 'right': (1, 0)}
+OPPOSITE_SIDES = {'up': 'down', 'down': 'up', 'left': 'right', 'right': 'left'}
+
+
+class TileAtlas:
+    """Every cell sprite prerendered side by side on one surface.
+    
+    A frame's cells are drawn with one Surface.blits() call taking a
+    different area of the atlas for each cell, so sprite skins cost one
+    copy per cell however many shapes make up a tile.
+    """
     
-    def __init__(self, position):
-        """Initialize obstacle at given position.
+    def __init__(self, surface, is_directional, is_opaque=False):
+        """Initialize the atlas from a surface holding the tiles.
         
         Args:
+            surface (pygame.Surface): CELL_SIZE tiles in TILE_NAMES order
+            is_directional (bool): Whether heads, tails and turns have their
+                own sprites; if not, every segment uses the same body tile
+            is_opaque (bool): Whether every tile covers its whole cell
+        """
+        self.surface = surface
+        self.is_directional = is_directional
+        self.is_opaque = is_opaque
+        self.areas = {name: pygame.Rect(index * CELL_SIZE, 0, CELL_SIZE, CELL_SIZE)
+                      for index, name in enumerate(TILE_NAMES)}
+        
+        # Tile areas keyed by the offsets to a segment's neighbours
+        self._head_areas = {SIDES[side]: self.areas['head_' + side]
+                            for side in SIDES}
+        self._tail_areas = {SIDES[side]: self.areas['tail_' + side]
+                            for side in SIDES}
+        self._body_areas = {}
+        for first in SIDES:
+            for second in SIDES:
+                if first == second:
+                    continue
+                sides = {first, second}
+                if sides == {'up', 'down'}:
+                    area = self.areas['body_vertical']
+                elif sides == {'left', 'right'}:
+                    area = self.areas['body_horizontal']
+                else:
+                    vertical = 'up' if 'up' in sides else 'down'
+                    horizontal = 'left' if 'left' in sides else 'right'
+                    area = self.areas[f'turn_{vertical}_{horizontal}']
+                self._body_areas[SIDES[first] + SIDES[second]] = area
+    
+    def segment_area(self, position, toward_head, toward_tail):
+        """Get the tile for a snake segment from its neighbours.
+        
+        Args:
+            position (tuple): (x, y) grid coordinates of the segment
+            toward_head (tuple): Neighbouring segment towards the head, or
+                None for the head itself
+            toward_tail (tuple): Neighbouring segment towards the tail, or
+                None for the tail itself
+                
+        Returns:
+            pygame.Rect: Area of the atlas to draw
+        """
+        x, y = position
+        if toward_head is None:
+            if toward_tail is None:
+                return self.areas['head_right']
+            # The head faces away from the segment behind it
+            return self._head_areas.get(
+                (x - toward_tail[0], y - toward_tail[1]), self.areas['head_right'])
+        if not self.is_directional:
+            return self.areas['body']
+        if toward_tail is None:
+            return self._tail_areas.get(
+                (x - toward_head[0], y - toward_head[1]), self.areas['body'])
+        return self._body_areas.get(
+            (toward_head[0] - x, toward_head[1] - y,
+             toward_tail[0] - x, toward_tail[1] - y), self.areas['body'])
+    
+    def cell_blit(self, name, position, origin=(0, 0)):
+        """Get the blit that draws a tile on a cell.
+        
+        Args:
+            name (str): Tile name from TILE_NAMES
             position (tuple): (x, y) grid coordinates
+            origin (tuple): Pixel position of the surface's top-left corner
+                on the board, for scrolled views
+                
+        Returns:
+            tuple: (source, destination, area) for Surface.blits()
         """
-        self.position = position
+        x, y = position
+        return (self.surface, (x * CELL_SIZE - origin[0], y * CELL_SIZE - origin[1]),
+                self.areas[name])
     
-    def draw(self, surface):
-        """Draw the obstacle on the surface.
+    def snake_blits(self, snake_body, origin=(0, 0)):
+        """Get the blits that draw a whole snake, head first.
         
         Args:
-            surface: pygame surface to draw on
+            snake_body: Snake body positions, head first
+            origin (tuple): Pixel position of the surface's top-left corner
+                on the board
+                
+        Returns:
+            list: (source, destination, area) tuples for Surface.blits()
         """
-        x, y = self.position
-        rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-        pygame.draw.rect(surface, (100, 100, 100), rect)  # Gray obstacle
-
-
-def create_level_obstacles(level):
-    """Create obstacles for different levels.
+        surface = self.surface
+        origin_x, origin_y = origin
+        positions = list(snake_body)
+        if not self.is_directional:
+            body_area = self.areas['body']
+            blits = [(surface, (x * CELL_SIZE - origin_x, y * CELL_SIZE - origin_y),
+                      body_area) for x, y in positions]
+        else:
+            segment_area = self.segment_area
+            last = len(positions) - 1
+            blits = []
+            for index, (x, y) in enumerate(positions):
+                area = segment_area(
+                    (x, y), positions[index - 1] if index else None,
+                    positions[index + 1] if index < last else None)
+                blits.append((surface, (x * CELL_SIZE - origin_x,
+                                        y * CELL_SIZE - origin_y), area))
+        if blits:
+            head_area = self.segment_area(
+                positions[0], None, positions[1] if len(positions) > 1 else None)
+            blits[0] = (surface, blits[0][1], head_area)
+        return blits
+
+
+def _classic_tile_color(name):
+    """Get the color of a classic skin tile, which is one flat cell.
     
     Args:
-        level (int): Current level number
+        name (str): Tile name from TILE_NAMES
         
     Returns:
-        list: List of Obstacle objects
-    """
-    obstacles = []
-    
-    if level == 1:
-        # Level 1: Simple border obstacles
-        grid_width = WINDOW_WIDTH // CELL_SIZE
-        grid_height = WINDOW_HEIGHT // CELL_SIZE
-        
-        # Add some corner obstacles
-        obstacles.extend([
-            Obstacle((5, 5)),
-            Obstacle((grid_width - 6, 5)),
-            Obstacle((5, grid_height - 6)),
-            Obstacle((grid_width - 6, grid_height - 6))
-        ])
-    
-    elif level == 2:
-        # Level 2: More complex pattern
-        grid_width = WINDOW_WIDTH // CELL_SIZE
-        grid_height = WINDOW_HEIGHT // CELL_SIZE
-        
-        # Create a cross pattern in the middle
-        center_x, center_y = grid_width // 2, grid_height // 2
-        for i in range(-2, 3):
-            obstacles.extend([
-                Obstacle((center_x + i, center_y)),
-                Obstacle((center_x, center_y + i))
-            ])
-    
-    elif level >= 3:
-        # Level 3+: Random obstacles
-        grid_width = WINDOW_WIDTH // CELL_SIZE
-        grid_height = WINDOW_HEIGHT // CELL_SIZE
-        num_obstacles = min(level * 3, 20)  # Cap at 20 obstacles
-        
-        for _ in range(num_obstacles):
-            x = random.randint(2, grid_width - 3)
-            y = random.randint(2, grid_height - 3)
-            obstacles.append(Obstacle((x, y)))
-    
-    return obstacles
+        tuple: RGB color from COLORS
+    """
+    if name.startswith('head'):
+        return COLORS['snake_head']
+    if name in ('food', 'obstacle'):
+        return COLORS[name]
+    return COLORS['snake_body']
 
 
-# =============================================================================
-# INITIALIZATION FUNCTIONS
-# =============================================================================
+def _draw_segmented_tile(tile, name):
+    """Draw a tile of the segmented skin: a rounded snake with eyes.
+    
+    Args:
+        tile (pygame.Surface): Transparent CELL_SIZE surface to draw on
+        name (str): Tile name from TILE_NAMES
+    """
+    size = CELL_SIZE
+    margin = max(1, size // 6)
+    width = size - 2 * margin
+    center = size // 2
+    
+    def draw_arm(color, side):
+        # Band from the middle of the cell out to one side
+        bands = {'up': (margin, 0, width, center), 'down': (margin, center, width, size - center),
+                'left': (0, margin, center, width), 'right': (center, margin, size - center, width)}
+        pygame.draw.rect(tile, color, bands[side])
+    
+    kind, _, sides = name.partition('_')
+    body_color = COLORS['snake_body']
+    if name == 'food':
+        pygame.draw.circle(tile, COLORS['food'], (center, center), center - margin // 2)
+    elif name == 'obstacle':
+        tile.fill(COLORS['obstacle'])
+        pygame.draw.rect(tile, COLORS['grid_lines'], tile.get_rect(), max(1, size // 10))
+    elif kind == 'head':
+        draw_arm(COLORS['snake_head'], OPPOSITE_SIDES[sides])
+        pygame.draw.circle(tile, COLORS['snake_head'], (center, center), center - margin // 2)
+        dx, dy = SIDES[sides]
+        for eye_side in (-1, 1):
+            eye = (center + (dx - dy * eye_side) * size // 5,
+                   center + (dy + dx * eye_side) * size // 5)
+            pygame.draw.circle(tile, COLORS['background'], eye, max(1, size // 10))
+    elif kind == 'tail':
+        draw_arm(body_color, OPPOSITE_SIDES[sides])
+        pygame.draw.circle(tile, body_color, (center, center), width // 3)
+    else:
+        if kind == 'turn':
+            arm_sides = sides.split('_')
+        else:
+            arm_sides = {'vertical': ('up', 'down'),
+                         'horizontal': ('left', 'right')}.get(sides, ())
+        for side in arm_sides:
+            draw_arm(body_color, side)
+        pygame.draw.circle(tile, body_color, (center, center), width // 2)
 
-def initialize_pygame():
-    """Initialize pygame display and return screen and clock objects.
+
+def build_tile_atlas(skin=None, image_path=None):
+    """Render every tile of a skin, or load them from a sprite sheet.
     
+    Args:
+        skin (str): 'classic' or 'segmented', defaults to SNAKE_SKIN
+        image_path (str): Sprite sheet to load instead, defaults to
+            SKIN_IMAGE
+            
     Returns:
-        tuple: (screen, clock) pygame objects
+        TileAtlas: Atlas with every tile in TILE_NAMES
     """
-    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-    pygame.display.set_caption("ByteSnake")
-    clock = pygame.time.Clock()
-    return screen, clock
+    skin = skin or SNAKE_SKIN
+    image_path = image_path or SKIN_IMAGE
+    atlas_size = (CELL_SIZE * len(TILE_NAMES), CELL_SIZE)
+    
+    # Per-pixel alpha even for opaque tiles: SDL's blitter copies these
+    # several times faster than plain surfaces, and faster than filling
+    surface = pygame.Surface(atlas_size, pygame.SRCALPHA)
+    if image_path:
+        # Copy the sheet's pixels and alpha as they are, whatever its format
+        sheet = pygame.transform.scale(pygame.image.load(image_path), atlas_size)
+        surface.blit(sheet, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        return TileAtlas(surface, is_directional=True)
+    
+    is_classic = skin == 'classic'
+    for index, name in enumerate(TILE_NAMES):
+        area = (index * CELL_SIZE, 0, CELL_SIZE, CELL_SIZE)
+        if is_classic:
+            surface.fill(_classic_tile_color(name), area)
+        else:
+            _draw_segmented_tile(surface.subsurface(area), name)
+    return TileAtlas(surface, is_directional=not is_classic, is_opaque=is_classic)
+
+
+_tile_atlas = None  # TileAtlas for the current skin, built on first use
 
 
+def get_tile_atlas():
+    """Get the tile atlas, building it on first use.
+    
+    Returns:
+        TileAtlas: Atlas for SNAKE_SKIN or SKIN_IMAGE
+    """
+    global _tile_atlas
+    if _tile_atlas is None:
+        _tile_atlas = build_tile_atlas()
+    return _tile_atlas
+
 # =============================================================================
 # DRAWING FUNCTIONS
 # =============================================================================
 
+_background_surface = None  # Cached background and grid, built on first use
+
+
+def _get_background_surface():
+    """Get the background and grid surface, building it on first use.
+    
+    Returns:
+        pygame.Surface: Window-sized surface with the background and grid
+    """
+    global _background_surface
+    if _background_surface is None:
+        _background_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        
+        # Fill background
+        _background_surface.fill(COLORS['background'])
+        
+        # Draw grid lines
+        for x in range(0, WINDOW_WIDTH, CELL_SIZE):
+            pygame.draw.line(_background_surface, COLORS['grid_lines'],
+                             (x, 0), (x, WINDOW_HEIGHT))
+        for y in range(0, WINDOW_HEIGHT, CELL_SIZE):
+            pygame.draw.line(_background_surface, COLORS['grid_lines'],
+                             (0, y), (WINDOW_WIDTH, y))
+    return _background_surface
+
+
 def draw_background(surface):
     """Draw the game background and grid.
     
     Args:
         surface: pygame surface to draw on
     """
-    # Fill background
-    surface.fill(COLORS['background'])
+    surface.blit(_get_background_surface(), (0, 0))
+
+
+_level_surface_cache = (None, None)  # (obstacle layout, its level surface)
+
+
+def _get_level_surface(obstacles):
+    """Get the background with a level's obstacles drawn on it.
     
-    # Draw grid lines
-    for x in range(0, WINDOW_WIDTH, CELL_SIZE):
-        pygame.draw.line(surface, COLORS['grid_lines'], (x, 0), (x, WINDOW_HEIGHT))
-    for y in range(0, WINDOW_HEIGHT, CELL_SIZE):
-        pygame.draw.line(surface, COLORS['grid_lines'], (0, y), (WINDOW_WIDTH, y))
+    The surface is rebuilt only when the obstacle layout changes, which
+    happens on a new level or a new game.
+    
+    Args:
+        obstacles (ObstacleLayout): Current level's obstacles
+        
+    Returns:
+        pygame.Surface: Window-sized background, grid and obstacles
+    """
+    global _level_surface_cache
+    cached_obstacles, level_surface = _level_surface_cache
+    if cached_obstacles is not obstacles:
+        level_surface = _get_background_surface().copy()
+        atlas = get_tile_atlas()
+        level_surface.blits([atlas.cell_blit('obstacle', obstacle.position)
+                             for obstacle in obstacles], doreturn=False)
+        _level_surface_cache = (obstacles, level_surface)
+    return level_surface
+
+
+def draw_level(surface, obstacles):
+    """Draw the background, grid and obstacles from the cached level surface.
+    
+    Args:
+        surface: pygame surface to draw on
+        obstacles (ObstacleLayout): Current level's obstacles
+    """
+    surface.blit(_get_level_surface(obstacles), (0, 0))
+
+
+@lru_cache(maxsize=None)
+def get_font(font_size):
+    """Get the default font at a size, loading it only once.
+    
+    Args:
+        font_size (int): Font size
+        
+    Returns:
+        pygame.font.Font: Loaded font
+    """
+    if not pygame.font.get_init():
+        pygame.font.init()
+    return pygame.font.Font(None, font_size)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(text, font_size, color):
+    """Render text to a surface, reusing recently rendered surfaces.
+    
+    Least recently used surfaces are evicted, so only text whose value
+    changed (score, speed, level) gets rendered again.
+    
+    Args:
+        text (str): Text to render
+        font_size (int): Font size for the text
+        color (tuple): RGB text color
+        
+    Returns:
+        pygame.Surface: Rendered text
+    """
+    return get_font(font_size).render(text, True, color)
 
 
 def draw_text(surface, text, position, font_size=36):
@@ -292,39 +671,88 @@ def draw_text(surface, text, position, font_size=36):
         text (str): Text to display
         position (tuple): (x, y) coordinates for text
         font_size (int): Font size for the text
+        
+    Returns:
+        pygame.Rect: Area covered by the text
     """
-    font = pygame.font.Font(None, font_size)
-    text_surface = font.render(text, True, COLORS['text'])
-    surface.blit(text_surface, position)
+    text_surface = render_text(text, font_size, COLORS['text'])
+    return surface.blit(text_surface, position)
 
 
 def draw_snake(surface, snake_body):
-    """Draw the snake with different colors for head and body.
+    """Draw the snake from the tile atlas in one batch.
     
     Args:
         surface: pygame surface to draw on
-        snake_body (deque): Snake body positions
+        snake_body: Snake body positions, head first
     """
-    for segment_index, segment_position in enumerate(snake_body):
-        x, y = segment_position
-        rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-        
-        if segment_index == 0:  # Head
-            pygame.draw.rect(surface, COLORS['snake_head'], rect)
-        else:  # Body
-            pygame.draw.rect(surface, COLORS['snake_body'], rect)
+    surface.blits(get_tile_atlas().snake_blits(snake_body), doreturn=False)
 
 
 def draw_food(surface, food_position):
-    """Draw the food as a rectangle.
+    """Draw the food tile.
     
     Args:
         surface: pygame surface to draw on
         food_position (tuple): (x, y) grid coordinates of food
     """
-    x, y = food_position
-    rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-    pygame.draw.rect(surface, COLORS['food'], rect)
+    surface.blit(*get_tile_atlas().cell_blit('food', food_position))
+
+
+def draw_game_objects(surface, snake_body, food_position):
+    """Draw the snake and then the food with a single Surface.blits() call.
+    
+    Args:
+        surface: pygame surface to draw on
+        snake_body: Snake body positions, head first
+        food_position (tuple): (x, y) grid coordinates of food
+    """
+    atlas = get_tile_atlas()
+    blits = atlas.snake_blits(snake_body)
+    blits.append(atlas.cell_blit('food', food_position))
+    surface.blits(blits, doreturn=False)
+
+
+def draw_moving_game_objects(surface, game_state, progress):
+    """Draw the food and then the snake part of the way into its next move.
+    
+    The head slides toward the cell it moves to next and the tail toward
+    the segment ahead of it (unless the move grows the snake); the segments
+    in between stay on their cells.
+    
+    Args:
+        surface: pygame surface to draw on
+        game_state (SessionState): Current game state
+        progress (float): Fraction of the move already made (0.0 to 1.0)
+    """
+    atlas = get_tile_atlas()
+    positions = list(game_state.snake.body)
+    food_position = game_state.food.position
+    blits = [atlas.cell_blit('food', food_position)]
+    snake_blits = atlas.snake_blits(positions)
+    shift = int(progress * CELL_SIZE)
+    if shift:
+        head = positions[0]
+        dx, dy = (game_state.turn_queue[0] if game_state.turn_queue
+                  else game_state.snake_direction)
+        next_head = (head[0] + dx, head[1] + dy)
+        grows = head == food_position  # Food is eaten by moving off it
+        if grows or len(positions) > 1:
+            # The head leaves a segment behind on its cell
+            blits.append((atlas.surface, snake_blits[0][1], atlas.segment_area(
+                head, next_head, positions[1] if len(positions) > 1 else None)))
+        source, (x, y), area = snake_blits[0]
+        snake_blits[0] = (source, (x + dx * shift, y + dy * shift), area)
+        if not grows and len(positions) > 1:
+            tail = positions[-1]
+            tail_dx = positions[-2][0] - tail[0]
+            tail_dy = positions[-2][1] - tail[1]
+            source, (x, y), area = snake_blits[-1]
+            snake_blits[-1] = (source, (x + tail_dx * shift, y + tail_dy * shift), area)
+    # Tail last, so it slides over the segment ahead of it, and the head on top
+    blits.extend(snake_blits[1:])
+    blits.append(snake_blits[0])
+    surface.blits(blits, doreturn=False)
 
 
 def draw_game_ui(surface, current_score, current_speed, high_score, level, is_paused):
@@ -337,17 +765,22 @@ def draw_game_ui(surface, current_score, current_speed, high_score, level, is_pa
         high_score (int): High score
         level (int): Current level
         is_paused (bool): Whether the game is paused
+        
+    Returns:
+        pygame.Rect: Area covered by the score panel
     """
-    draw_text(surface, f"Score: {current_score}", (10, 10))
-    draw_text(surface, f"Speed: {current_speed}", (10, 50))
-    draw_text(surface, f"High Score: {high_score}", (10, 90))
-    draw_text(surface, f"Level: {level}", (10, 130))
+    panel_rect = draw_text(surface, f"Score: {current_score}", (10, 10))
+    panel_rect.union_ip(draw_text(surface, f"Speed: {current_speed}", (10, 50)))
+    panel_rect.union_ip(draw_text(surface, f"High Score: {high_score}", (10, 90)))
+    panel_rect.union_ip(draw_text(surface, f"Level: {level}", (10, 130)))
     
     if is_paused:
         center_x = WINDOW_WIDTH // 2
         center_y = WINDOW_HEIGHT // 2
         draw_text(surface, "PAUSED", (center_x - 50, center_y - 20), 48)
         draw_text(surface, "Press P to Resume", (center_x - 100, center_y + 20))
+    
+    return panel_rect
 
 
 def draw_game_over_screen(surface):
@@ -367,29 +800,82 @@ def draw_game_over_screen(surface):
 # INPUT HANDLING FUNCTIONS
 # =============================================================================
 
-def handle_events(snake_direction, is_game_over, is_paused):
-    """Handle keyboard input and pygame events.
+def handle_events(snake_direction, turn_queue, is_game_over, is_paused):
+    """Handle all pending keyboard input and pygame events.
+    
+    Every event queued since the last frame is processed, so quick key
+    presses are never dropped. Turns go into the turn queue and are applied
+    one per move by step_game_logic().
     
     Args:
         snake_direction (tuple): Current snake direction (dx, dy)
+        turn_queue (deque): Turns waiting for the next moves
         is_game_over (bool): Whether the game is in game over state
         is_paused (bool): Whether the game is paused
         
     Returns:
-        tuple: (is_running, new_direction, should_restart, new_pause_state)
+        tuple: (is_running, should_restart, new_pause_state)
     """
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
-            return False, snake_direction, False, is_paused
+            return False, False, is_paused
         elif event.type == pygame.KEYDOWN:
             if is_game_over:
-                running, direction, restart = _handle_game_over_input(event)
-                return running, direction, restart, is_paused
+                running, restart = _handle_game_over_input(event)
+                if restart or not running:
+                    return running, restart, is_paused
             else:
-                snake_direction, new_pause_state = _handle_game_input(event, snake_direction, is_paused)
-                return True, snake_direction, False, new_pause_state
+                direction, is_paused = _handle_game_input(event, is_paused)
+                if direction is not None:
+                    queue_turn(turn_queue, snake_direction, direction)
     
-    return True, snake_direction, False, is_paused
+    return True, False, is_paused
+
+
+def queue_turn(turn_queue, snake_direction, direction):
+    """Buffer a turn if it is valid after the turns already queued.
+    
+    Each turn is checked against the one before it rather than only the
+    current direction, so two quick turns within one move (e.g. up then
+    left while heading right) play out over two moves instead of the second
+    reversing the snake into itself. Repeats and reversals are dropped, as
+    are turns beyond TURN_QUEUE_SIZE.
+    
+    Args:
+        turn_queue (deque): Turns waiting for the next moves
+        snake_direction (tuple): Current snake direction (dx, dy)
+        direction (tuple): Requested direction (dx, dy)
+        
+    Returns:
+        bool: True if the turn was queued
+    """
+    previous = turn_queue[-1] if turn_queue else snake_direction
+    if (len(turn_queue) >= TURN_QUEUE_SIZE or direction == previous or
+            is_reverse_direction(previous, direction)):
+        return False
+    turn_queue.append(direction)
+    return True
+
+
+def next_turn(game_state):
+    """Apply the oldest buffered turn to the snake direction.
+    
+    Args:
+        game_state (SessionState): Current game state
+    """
+    if game_state.turn_queue:
+        direction = game_state.turn_queue.popleft()
+        if not is_reverse_direction(game_state.snake_direction, direction):
+            game_state.snake_direction = direction
+
+
+def wait_for_event():
+    """Block until the next pygame event arrives, leaving it in the queue.
+    
+    Used while paused or on the game over screen so the game loop sleeps
+    instead of spinning.
+    """
+    pygame.event.post(pygame.event.wait())
 
 
 def _handle_game_over_input(event):
@@ -399,308 +885,332 @@ def _handle_game_over_input(event):
         event: pygame event object
         
     Returns:
-        tuple: (is_running, direction, should_restart)
+        tuple: (is_running, should_restart)
     """
     if event.key == pygame.K_r:
-        return True, (1, 0), True  # Restart game
+        return True, True  # Restart game
     elif event.key == pygame.K_q:
-        return False, (1, 0), False  # Quit game
-    return True, (1, 0), False
+        return False, False  # Quit game
+    return True, False
 
 
-def _handle_game_input(event, current_direction, is_paused):
+def _handle_game_input(event, is_paused):
     """Handle input during gameplay.
     
     Args:
         event: pygame event object
-        current_direction (tuple): Current snake direction
         is_paused (bool): Current pause state
         
     Returns:
-        tuple: (new_direction, new_pause_state)
+        tuple: (requested_direction or None, new_pause_state)
     """
     # Pause toggle
     if event.key == pygame.K_p:
-        return current_direction, not is_paused
+        return None, not is_paused
     
     # Only handle movement if not paused
     if is_paused:
-        return current_direction, is_paused
+        return None, is_paused
     
-    # Arrow keys and WASD mapping with 180° turn prevention
+    # Arrow keys and WASD mapping (queue_turn() prevents 180° turns)
     if event.key == pygame.K_UP or event.key == pygame.K_w:
-        # Can't go up if currently going down
-        if current_direction != (0, 1):
-            return (0, -1), is_paused
+        return (0, -1), is_paused
     elif event.key == pygame.K_DOWN or event.key == pygame.K_s:
-        # Can't go down if currently going up
-        if current_direction != (0, -1):
-            return (0, 1), is_paused
+        return (0, 1), is_paused
     elif event.key == pygame.K_LEFT or event.key == pygame.K_a:
-        # Can't go left if currently going right
-        if current_direction != (1, 0):
-            return (-1, 0), is_paused
+        return (-1, 0), is_paused
     elif event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-        # Can't go right if currently going left
-        if current_direction != (-1, 0):
-            return (1, 0), is_paused
+        return (1, 0), is_paused
     
-    return current_direction, is_paused
+    return None, is_paused
 
 # =============================================================================
-# GAME LOGIC FUNCTIONS
+# HIGH SCORE FUNCTIONS
 # =============================================================================
 
-def check_wall_collision(snake_head_position):
-    """Check if snake head hits the wall boundaries.
-    
-    Args:
-        snake_head_position (tuple): (x, y) coordinates of snake head
-        
-    Returns:
-        bool: True if collision with wall detected
-    """
-    x, y = snake_head_position
-    grid_width = WINDOW_WIDTH // CELL_SIZE
-    grid_height = WINDOW_HEIGHT // CELL_SIZE
-    
-    return (x < 0 or x >= grid_width or y < 0 or y >= grid_height)
+_leaderboard = None  # Leaderboard, opened on first use
 
 
-def check_self_collision(snake_body):
-    """Check if snake head collides with its own body.
+def get_leaderboard():
+    """Get the leaderboard, opening its database on first use.
     
-    Args:
-        snake_body (deque): Snake body positions
-        
     Returns:
-        bool: True if self-collision detected
+        Leaderboard: The leaderboard, or None if SAVE_SCORES is off
     """
-    head_position = snake_body[0]
-    body_positions = list(snake_body)[1:]  # Exclude head from body check
-    return head_position in body_positions
+    global _leaderboard
+    if _leaderboard is None and SAVE_SCORES:
+        from leaderboard import Leaderboard  # Loads sqlite3, so only when saving
+        
+        _leaderboard = Leaderboard(LEADERBOARD_FILE)
+        atexit.register(close_leaderboard)  # Don't lose queued games on exit
+    return _leaderboard
 
 
-def check_obstacle_collision(snake_head_position, obstacles):
-    """Check if snake head collides with any obstacle.
+def load_high_score():
+    """Load high score from the leaderboard's in-memory cache.
     
-    Args:
-        snake_head_position (tuple): (x, y) coordinates of snake head
-        obstacles (list): List of Obstacle objects
-        
     Returns:
-        bool: True if collision with obstacle detected
+        int: High score value, 0 if no game has been recorded
     """
-    for obstacle in obstacles:
-        if snake_head_position == obstacle.position:
-            return True
-    return False
+    leaderboard = get_leaderboard()
+    return leaderboard.high_score if leaderboard is not None else 0
 
 
-def calculate_game_speed(score):
-    """Calculate current game speed based on score.
+def record_game_result(game_state):
+    """Record a finished game on the leaderboard.
+    
+    The game is queued for the leaderboard's writer thread, so this never
+    waits on the disk.
     
     Args:
-        score (int): Current game score
+        game_state (SessionState): State of the game that just ended
         
     Returns:
-        int: Current speed in moves per second
+        int: Updated high score
     """
-    return BASE_FPS + score // SPEED_INCREASE_INTERVAL
+    leaderboard = get_leaderboard()
+    if leaderboard is None:
+        return max(game_state.score, game_state.high_score)
+    leaderboard.record_game(PLAYER_NAME, game_state.score, game_state.level,
+                            len(game_state.snake.body), game_state.ticks,
+                            game_state.seed)
+    return leaderboard.high_score
+
+
+def close_leaderboard():
+    """Write any queued games and close the leaderboard database."""
+    global _leaderboard
+    if _leaderboard is not None:
+        _leaderboard.close()
+        _leaderboard = None
 
+# =============================================================================
+# GAME STATE MANAGEMENT
+# =============================================================================
 
-def load_high_score():
-    """Load high score from persistent storage.
+class SessionState(GameState):
+    """Game state plus what the pygame front end tracks between frames."""
+    
+    __slots__ = ('is_paused', 'high_score', 'move_time_accumulator', 'ticks',
+                 'turn_queue', 'replay', 'autopilot', 'eat_sound',
+                 'game_over_sound')
+    
+    def __init__(self):
+        """Initialize the front end's fields; start_new_game() sets the rest."""
+        super().__init__()
+        self.is_paused = False
+        self.high_score = 0
+        self.move_time_accumulator = 0  # Milliseconds not yet spent on moves
+        self.ticks = 0  # Moves made so far
+        self.turn_queue = deque()  # Buffered turns, applied one per move
+        self.replay = None
+        self.autopilot = None  # Policy steering the snake, if any
+        if PERFECT_PLAY:
+            from hamiltonian import HamiltonianSolver  # Only for perfect play
+            
+            self.autopilot = HamiltonianSolver()
+            # New levels' layouts would break the cycle before the board fills
+            self.max_level = 1
+        elif AUTOPILOT:
+            from autopilot import Autopilot  # Only for attract mode
+            
+            self.autopilot = Autopilot()
+        self.eat_sound = None
+        self.game_over_sound = None
     
-    Returns:
-        int: High score value, 0 if file doesn't exist
-    """
-    try:
-        with open('highscore.txt', 'r') as file:
-            return int(file.read().strip())
-    except (FileNotFoundError, ValueError):
-        return 0
+    def snapshot(self):
+        """Copy the state, including the buffered turns.
+        
+        Returns:
+            SessionState: Independent copy
+        """
+        snapshot = super().snapshot()
+        snapshot.turn_queue = deque(self.turn_queue)
+        return snapshot
 
 
-def save_high_score(score):
-    """Save high score to persistent storage.
+def initialize_game_state(seed=None, board=None):
+    """Initialize a new game state with default values.
     
     Args:
-        score (int): Score to save as high score
+        seed (int): Seed for the game, or None to pick a new one
+        board (Board): Board to play on, defaults to BOARD_WIDTH x BOARD_HEIGHT
+        
+    Returns:
+        SessionState: Game state with all initial values
     """
-    try:
-        with open('highscore.txt', 'w') as file:
-            file.write(str(score))
-    except IOError:
-        pass  # Silently fail if can't write file
+    game_state = SessionState()
+    game_state.high_score = load_high_score()
+    if board is None:
+        board = Board(BOARD_WIDTH, BOARD_HEIGHT)
+    start_new_game(game_state, seed, board)
+    _start_replay(game_state)
+    return game_state
 
 
-def update_high_score_if_needed(current_score, current_high_score):
-    """Update high score if current score is higher.
+def reset_game_state(game_state, seed=None):
+    """Reset game state to initial values.
     
     Args:
-        current_score (int): Current game score
-        current_high_score (int): Current high score
+        game_state (SessionState): Current game state to reset
+        seed (int): Seed for the new game, or None to pick a new one
         
     Returns:
-        int: Updated high score
+        SessionState: Reset game state
     """
-    if current_score > current_high_score:
-        new_high_score = current_score
-        save_high_score(new_high_score)
-        return new_high_score
-    return current_high_score
+    _finish_replay(game_state)
+    start_new_game(game_state, seed)
+    game_state.is_paused = False
+    game_state.high_score = load_high_score()
+    game_state.move_time_accumulator = 0
+    game_state.ticks = 0
+    game_state.turn_queue.clear()
+    _start_replay(game_state)
+    
+    return game_state
 
-# =============================================================================
-# GAME STATE MANAGEMENT
-# =============================================================================
 
-def initialize_game_state():
-    """Initialize a new game state with default values.
-    
-    Returns:
-        dict: Game state dictionary with all initial values
-    """
-    center_x = WINDOW_WIDTH // CELL_SIZE // 2
-    center_y = WINDOW_HEIGHT // CELL_SIZE // 2
-    
-    return {
-        'snake_direction': (1, 0),  # Start moving right
-        'score': 0,
-        'level': 1,
-        'is_game_over': False,
-        'is_paused': False,
-        'snake': Snake((center_x, center_y)),
-        'food': None,  # Will be initialized after snake
-        'obstacles': [],
-        'high_score': load_high_score(),
-        'last_move_time': 0,
-        'eat_sound': None,
-        'game_over_sound': None
-    }
-
-
-def reset_game_state(game_state):
-    """Reset game state to initial values.
+def _start_replay(game_state):
+    """Start recording the new game to a replay file if enabled.
     
     Args:
-        game_state (dict): Current game state to reset
+        game_state (SessionState): Game state of a game that is just starting
+    """
+    if RECORD_REPLAYS:
+        from replay import ReplayWriter  # Only when recording
         
-    Returns:
-        dict: Reset game state
-    """
-    center_x = WINDOW_WIDTH // CELL_SIZE // 2
-    center_y = WINDOW_HEIGHT // CELL_SIZE // 2
-    
-    game_state['snake_direction'] = (1, 0)
-    game_state['score'] = 0
-    game_state['level'] = 1
-    game_state['is_game_over'] = False
-    game_state['is_paused'] = False
-    game_state['snake'] = Snake((center_x, center_y))
-    game_state['food'] = Food(game_state['snake'].body)
-    game_state['obstacles'] = create_level_obstacles(1)
-    game_state['high_score'] = load_high_score()
-    game_state['last_move_time'] = 0
+        game_state.replay = ReplayWriter.create_in(
+            REPLAY_DIRECTORY, game_state.seed, game_state.board,
+            game_state.max_level)
+
+
+def _finish_replay(game_state):
+    """Close the current game's replay file, if one is being recorded.
     
-    return game_state
+    Args:
+        game_state (SessionState): Current game state
+    """
+    if game_state.replay is not None:
+        game_state.replay.close()
+        game_state.replay = None
 
 # =============================================================================
 # GAME UPDATE FUNCTIONS
 # =============================================================================
 
-def update_game_logic(game_state, current_time):
+def update_game_logic(game_state, elapsed_time):
     """Update game logic including movement, collisions, and scoring.
     
+    Uses a fixed-timestep accumulator: elapsed time is banked and spent one
+    move interval at a time, so the snake moves at exactly the current speed
+    however the frames are timed.
+    
     Args:
-        game_state (dict): Current game state
-        current_time (int): Current time in milliseconds
+        game_state (SessionState): Current game state
+        elapsed_time (int): Milliseconds since the previous update
         
     Returns:
         bool: True if game should continue, False if game over
     """
-    if game_state['is_game_over'] or game_state['is_paused']:
+    if game_state.is_game_over or game_state.is_paused:
         return True
     
-    current_speed = calculate_game_speed(game_state['score'])
-    time_since_last_move = current_time - game_state['last_move_time']
-    move_interval = 1000 // current_speed
+    game_state.move_time_accumulator += elapsed_time
+    moves_this_frame = 0
     
-    # Only move if enough time has passed (grid-locked movement)
-    if time_since_last_move >= move_interval:
-        _handle_snake_movement(game_state)
-        _check_collisions(game_state)
-        _check_level_progression(game_state)
-        game_state['last_move_time'] = current_time
+    # Only move once a full move interval has built up (grid-locked movement)
+    while not game_state.is_game_over:
+        move_interval = get_move_interval(game_state.score)
+        if game_state.move_time_accumulator < move_interval:
+            break
+        if moves_this_frame == MAX_CATCH_UP_MOVES:
+            # Drop the backlog after a long stall rather than fast-forwarding
+            game_state.move_time_accumulator = 0
+            break
+        game_state.move_time_accumulator -= move_interval
+        step_game_logic(game_state)
+        moves_this_frame += 1
     
     return True
 
 
+def step_game_logic(game_state):
+    """Advance the game by exactly one move.
+    
+    Args:
+        game_state (SessionState): Current game state
+    """
+    next_turn(game_state)
+    if game_state.autopilot is not None:
+        game_state.snake_direction = game_state.autopilot(game_state)
+    if game_state.replay is not None:
+        game_state.replay.record(game_state.snake_direction)
+    
+    _handle_snake_movement(game_state)
+    _check_collisions(game_state)
+    _check_level_progression(game_state)
+    game_state.ticks += 1
+    
+    if game_state.is_game_over:
+        game_state.high_score = record_game_result(game_state)
+        _finish_replay(game_state)
+
+
+def get_move_interval(score):
+    """Get the time between moves at the speed for a score.
+    
+    Args:
+        score (int): Current game score
+        
+    Returns:
+        int: Milliseconds per move
+    """
+    return 1000 // calculate_game_speed(score)
+
+
+def get_move_progress(game_state):
+    """Get how far the game is towards its next move, for interpolated drawing.
+    
+    Args:
+        game_state (SessionState): Current game state
+        
+    Returns:
+        float: Fraction of the move interval already elapsed (0.0 to 1.0)
+    """
+    move_interval = get_move_interval(game_state.score)
+    return min(game_state.move_time_accumulator / move_interval, 1.0)
+
+
 def _handle_snake_movement(game_state):
     """Handle snake movement and food consumption.
     
     Args:
-        game_state (dict): Current game state
+        game_state (SessionState): Current game state
     """
-    snake = game_state['snake']
-    food = game_state['food']
-    direction = game_state['snake_direction']
-    
-    # Check if snake eats food
-    if snake.get_head_position() == food.position:
-        # Snake ate food - grow and respawn food
-        food.respawn(snake.body)
-        game_state['score'] += 1
-        snake.move(direction, should_grow=True)
+    if move_snake(game_state):
         # Play eat sound
-        play_sound(game_state['eat_sound'])
-    else:
-        # Normal movement without growth
-        snake.move(direction, should_grow=False)
+        play_sound(game_state.eat_sound)
 
 
 def _check_collisions(game_state):
     """Check for wall, self, and obstacle collisions.
     
     Args:
-        game_state (dict): Current game state
+        game_state (SessionState): Current game state
     """
-    snake = game_state['snake']
-    head_position = snake.get_head_position()
-    
-    # Check wall collision
-    if check_wall_collision(head_position):
-        game_state['is_game_over'] = True
-        game_state['high_score'] = update_high_score_if_needed(
-            game_state['score'], game_state['high_score'])
-        play_sound(game_state['game_over_sound'])
-    
-    # Check self collision
-    elif check_self_collision(snake.body):
-        game_state['is_game_over'] = True
-        game_state['high_score'] = update_high_score_if_needed(
-            game_state['score'], game_state['high_score'])
-        play_sound(game_state['game_over_sound'])
-    
-    # Check obstacle collision
-    elif check_obstacle_collision(head_position, game_state['obstacles']):
-        game_state['is_game_over'] = True
-        game_state['high_score'] = update_high_score_if_needed(
-            game_state['score'], game_state['high_score'])
-        play_sound(game_state['game_over_sound'])
+    if detect_collision(game_state):
+        game_state.is_game_over = True
+        play_sound(game_state.game_over_sound)
 
 
 def _check_level_progression(game_state):
     """Check if player should advance to next level.
     
     Args:
-        game_state (dict): Current game state
+        game_state (SessionState): Current game state
     """
     # Advance level every 10 points
-    new_level = (game_state['score'] // 10) + 1
-    if new_level > game_state['level']:
-        game_state['level'] = new_level
-        game_state['obstacles'] = create_level_obstacles(new_level)
+    update_level(game_state)
 
 
 def render_game(screen, game_state):
@@ -708,29 +1218,467 @@ def render_game(screen, game_state):
     
     Args:
         screen: pygame screen surface
-        game_state (dict): Current game state
+        game_state (SessionState): Current game state
     """
-    # Draw background and grid
-    draw_background(screen)
+    # Draw background, grid and obstacles
+    draw_level(screen, game_state.obstacles)
     
-    # Draw obstacles
-    for obstacle in game_state['obstacles']:
-        obstacle.draw(screen)
-    
-    # Draw game objects
-    draw_snake(screen, game_state['snake'].body)
-    draw_food(screen, game_state['food'].position)
+    # Draw game objects, mid-move while the snake is moving
+    if (INTERPOLATE_MOVEMENT and not game_state.is_paused and
+            not game_state.is_game_over):
+        draw_moving_game_objects(screen, game_state, get_move_progress(game_state))
+    else:
+        draw_game_objects(screen, game_state.snake.body, game_state.food.position)
     
     # Draw UI elements
-    current_speed = calculate_game_speed(game_state['score'])
-    draw_game_ui(screen, game_state['score'], current_speed, game_state['high_score'], 
-                 game_state['level'], game_state['is_paused'])
+    current_speed = calculate_game_speed(game_state.score)
+    draw_game_ui(screen, game_state.score, current_speed, game_state.high_score, 
+                 game_state.level, game_state.is_paused)
     
     # Draw game over screen if needed
-    if game_state['is_game_over']:
+    if game_state.is_game_over:
         draw_game_over_screen(screen)
 
 
+class DirtyRectRenderer:
+    """Renders the game by repainting only the cells that changed.
+    
+    The board (background, obstacles, snake and food) is kept on an offscreen
+    surface. Each frame only the old tail, old and new head and food cells are
+    repainted on it, copied to the screen and pushed with
+    pygame.display.update(rects). The whole frame is redrawn only when the
+    scene changes: new game, new level, pause or game over.
+    """
+    
+    def __init__(self, screen):
+        """Initialize the renderer for a screen.
+        
+        Args:
+            screen: pygame screen surface
+        """
+        self.screen = screen
+        self.board = pygame.Surface(screen.get_size())
+        self._scene = None
+        self._level_surface = None
+        self._last_ticks = 0
+        self._last_head = None
+        self._last_tail = None
+        self._last_food = None
+        self._hud_values = None
+        self._hud_rect = pygame.Rect(0, 0, 0, 0)
+    
+    def render(self, game_state):
+        """Draw the current frame and push it to the display.
+        
+        Args:
+            game_state (SessionState): Current game state
+        """
+        snake = game_state.snake
+        scene = (snake, game_state.obstacles, game_state.is_paused,
+                 game_state.is_game_over)
+        
+        # Cell repainting only covers a single move between frames
+        if (self._scene is None or
+                game_state.ticks - self._last_ticks > 1 or
+                any(new is not old for new, old in zip(scene, self._scene))):
+            self._render_full_frame(game_state)
+            self._scene = scene
+        else:
+            self._render_changes(game_state)
+        
+        self._last_ticks = game_state.ticks
+        self._last_head = snake.get_head_position()
+        self._last_tail = snake.body[-1]
+        self._last_food = game_state.food.position
+    
+    def _render_full_frame(self, game_state):
+        """Redraw the board and overlays from scratch.
+        
+        Args:
+            game_state (SessionState): Current game state
+        """
+        self._level_surface = _get_level_surface(game_state.obstacles)
+        self.board.blit(self._level_surface, (0, 0))
+        draw_game_objects(self.board, game_state.snake.body,
+                          game_state.food.position)
+        
+        self.screen.blit(self.board, (0, 0))
+        self._hud_values = self._get_hud_values(game_state)
+        self._hud_rect = draw_game_ui(self.screen, *self._hud_values,
+                                      game_state.is_paused)
+        if game_state.is_game_over:
+            draw_game_over_screen(self.screen)
+        present_frame()
+    
+    def _render_changes(self, game_state):
+        """Repaint the cells and HUD text that changed since the last frame.
+        
+        Args:
+            game_state (SessionState): Current game state
+        """
+        snake = game_state.snake
+        food_position = game_state.food.position
+        hud_values = self._get_hud_values(game_state)
+        if (snake.get_head_position() == self._last_head and
+                snake.body[-1] == self._last_tail and
+                food_position == self._last_food and
+                hud_values == self._hud_values):
+            return  # Nothing moved since the last frame
+        
+        changed_positions = {self._last_head, self._last_tail, self._last_food,
+                             snake.get_head_position(), food_position}
+        if get_tile_atlas().is_directional:
+            # The new last segment is drawn as the tail now (the old head,
+            # now the neck, is already in the set)
+            changed_positions.add(snake.body[-1])
+        
+        dirty_rects = []
+        for position in changed_positions:
+            rect = self._paint_cell(position, snake, food_position)
+            self.screen.blit(self.board, rect, rect)
+            dirty_rects.append(rect)
+        
+        # The score panel is drawn over the board, so repaint it when its
+        # text changes or a changed cell lies underneath it
+        if (hud_values != self._hud_values or
+                self._hud_rect.collidelist(dirty_rects) != -1):
+            self.screen.blit(self.board, self._hud_rect, self._hud_rect)
+            hud_rect = draw_game_ui(self.screen, *hud_values, False)
+            dirty_rects.append(hud_rect.union(self._hud_rect))
+            self._hud_values = hud_values
+            self._hud_rect = hud_rect
+        
+        present_frame(dirty_rects, self.board)
+    
+    def _paint_cell(self, position, snake, food_position):
+        """Repaint one cell of the board from the current game state.
+        
+        Args:
+            position (tuple): (x, y) grid coordinates of the cell
+            snake (Snake): Current snake
+            food_position (tuple): (x, y) grid coordinates of food
+            
+        Returns:
+            pygame.Rect: Screen area of the cell
+        """
+        x, y = position
+        rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+        atlas = get_tile_atlas()
+        
+        # Same stacking as render_game: food over snake over the cached
+        # level surface (background or obstacle)
+        blits = []
+        if snake.contains_position(position):
+            blits.append((atlas.surface, rect.topleft,
+                          self._segment_area(atlas, position, snake)))
+        if position == food_position:
+            blits.append(atlas.cell_blit('food', position))
+        if not (blits and atlas.is_opaque):
+            self.board.blit(self._level_surface, rect, rect)
+        self.board.blits(blits, doreturn=False)
+        return rect
+    
+    def _segment_area(self, atlas, position, snake):
+        """Get the tile for one of the cells a move can change.
+        
+        Args:
+            atlas (TileAtlas): Atlas to take the tile from
+            position (tuple): (x, y) grid coordinates of a snake cell
+            snake (Snake): Current snake
+            
+        Returns:
+            pygame.Rect: Area of the atlas to draw
+        """
+        if not atlas.is_directional:
+            return atlas.areas['head_right' if position == snake.get_head_position()
+                               else 'body']
+        body = snake.body
+        length = len(body)
+        if position == body[0]:
+            return atlas.segment_area(position, None,
+                                      body[1] if length > 1 else None)
+        if position == body[-1]:
+            return atlas.segment_area(position, body[-2], None)
+        if length > 2 and position == body[1]:
+            return atlas.segment_area(position, body[0], body[2])
+        return atlas.areas['body']
+    
+    def _get_hud_values(self, game_state):
+        """Get the values shown in the score panel.
+        
+        Args:
+            game_state (SessionState): Current game state
+            
+        Returns:
+            tuple: (score, speed, high_score, level)
+        """
+        return (game_state.score, calculate_game_speed(game_state.score),
+                game_state.high_score, game_state.level)
+
+
+class Camera:
+    """Window-sized view onto a board, following the snake's head.
+    
+    The view is centered on the head and clamped to the board edges, so a
+    board larger than the window scrolls while a smaller one stays put.
+    """
+    
+    def __init__(self, board, view_width=None, view_height=None):
+        """Initialize the camera at the board's top-left corner.
+        
+        Args:
+            board (Board): Board being viewed
+            view_width (int): View width in cells, defaults to the window
+            view_height (int): View height in cells, defaults to the window
+        """
+        self.board = board
+        self.view_width = min(view_width or WINDOW_WIDTH // CELL_SIZE, board.width)
+        self.view_height = min(view_height or WINDOW_HEIGHT // CELL_SIZE, board.height)
+        self.x = 0
+        self.y = 0
+    
+    def follow(self, position):
+        """Center the view on a position, keeping it inside the board.
+        
+        Args:
+            position (tuple): (x, y) grid coordinates to center on
+        """
+        x, y = position
+        self.x = max(0, min(x - self.view_width // 2, self.board.width - self.view_width))
+        self.y = max(0, min(y - self.view_height // 2, self.board.height - self.view_height))
+    
+    def is_visible(self, position):
+        """Check if a position is inside the view.
+        
+        Args:
+            position (tuple): (x, y) grid coordinates to check
+            
+        Returns:
+            bool: True if the position is on screen
+        """
+        x, y = position
+        return (self.x <= x < self.x + self.view_width and
+                self.y <= y < self.y + self.view_height)
+    
+    def cell_rect(self, position):
+        """Get the screen area of a grid cell.
+        
+        Args:
+            position (tuple): (x, y) grid coordinates
+            
+        Returns:
+            pygame.Rect: Screen area of the cell
+        """
+        x, y = position
+        return pygame.Rect((x - self.x) * CELL_SIZE, (y - self.y) * CELL_SIZE,
+                           CELL_SIZE, CELL_SIZE)
+
+
+class ViewportRenderer:
+    """Renders a board larger than the window through a scrolling Camera.
+    
+    Only the cells inside the view are looked at, so the cost of a frame
+    depends on the window size, not the board size. Frames where nothing
+    changed are skipped, apart from the debug overlay while it is shown.
+    """
+    
+    def __init__(self, screen, board):
+        """Initialize the renderer for a screen and board.
+        
+        Args:
+            screen: pygame screen surface
+            board (Board): Board being played on
+        """
+        self.screen = screen
+        self.camera = Camera(board)
+        self._last_frame = None
+        self._background = None  # Last frame without the debug overlay
+    
+    def render(self, game_state):
+        """Draw the visible part of the board and push it to the display.
+        
+        Args:
+            game_state (SessionState): Current game state
+        """
+        snake = game_state.snake
+        frame = (game_state.ticks, snake, game_state.obstacles,
+                 game_state.food.position, game_state.is_paused,
+                 game_state.is_game_over, game_state.high_score)
+        if frame == self._last_frame:
+            # Nothing changed since the last frame, but the overlay's numbers
+            if _debug_overlay is not None:
+                present_frame([], self._background)
+            return
+        self._last_frame = frame
+        
+        camera = self.camera
+        if camera.board is not game_state.board:
+            camera = self.camera = Camera(game_state.board)
+        camera.follow(snake.get_head_position())
+        
+        draw_background(self.screen)
+        atlas = get_tile_atlas()
+        origin = (camera.x * CELL_SIZE, camera.y * CELL_SIZE)
+        blits = [atlas.cell_blit('obstacle', obstacle.position, origin)
+                 for obstacle in game_state.obstacles
+                 if camera.is_visible(obstacle.position)]
+        
+        # Scan the visible cells rather than the (possibly huge) snake, so
+        # segments use the plain body tile
+        contains_position = snake.contains_position
+        for x in range(camera.x, camera.x + camera.view_width):
+            for y in range(camera.y, camera.y + camera.view_height):
+                if contains_position((x, y)):
+                    blits.append(atlas.cell_blit('body', (x, y), origin))
+        
+        head_position = snake.get_head_position()
+        if camera.is_visible(head_position):
+            body = snake.body
+            head_area = atlas.segment_area(
+                head_position, None, body[1] if len(body) > 1 else None)
+            blits.append((atlas.surface, camera.cell_rect(head_position).topleft,
+                          head_area))
+        food_position = game_state.food.position
+        if camera.is_visible(food_position):
+            blits.append(atlas.cell_blit('food', food_position, origin))
+        self.screen.blits(blits, doreturn=False)
+        
+        current_speed = calculate_game_speed(game_state.score)
+        draw_game_ui(self.screen, game_state.score, current_speed,
+                     game_state.high_score, game_state.level,
+                     game_state.is_paused)
+        if game_state.is_game_over:
+            draw_game_over_screen(self.screen)
+        if _debug_overlay is not None:
+            self._background = self.screen.copy()
+        present_frame()
+
+
+def create_renderer(screen, board):
+    """Pick the renderer for a board.
+    
+    Args:
+        screen: pygame screen surface
+        board (Board): Board being played on
+        
+    Returns:
+        object: Renderer with a render(game_state) method, or None to draw
+            full frames with render_game
+    """
+    if (board.width * CELL_SIZE > WINDOW_WIDTH or
+            board.height * CELL_SIZE > WINDOW_HEIGHT):
+        return ViewportRenderer(screen, board)
+    # Interpolated movement changes every frame, so it needs full frames
+    if INCREMENTAL_RENDERING and not INTERPOLATE_MOVEMENT:
+        return DirtyRectRenderer(screen)
+    return None
+
+
+# =============================================================================
+# FRAME PROFILING
+# =============================================================================
+
+_frame_profiler = None  # FrameProfiler while PROFILE_FRAMES is on
+_debug_overlay = None  # DebugOverlay drawn over each frame while profiling
+
+
+def profile_section(name):
+    """Time a section of the current frame if profiling is on.
+    
+    Args:
+        name (str): Section name shown in the overlay and the trace
+        
+    Returns:
+        Context manager timing the section, or doing nothing
+    """
+    if _frame_profiler is None:
+        return nullcontext()
+    return _frame_profiler.section(name)
+
+
+class DebugOverlay:
+    """Frame-time percentiles and per-section times in the top-right corner."""
+    
+    def __init__(self, profiler):
+        """Initialize the overlay for a profiler.
+        
+        Args:
+            profiler (FrameProfiler): Profiler whose statistics to show
+        """
+        self.profiler = profiler
+        self._lines = []
+        self._refreshed_at = 0
+        self._rect = pygame.Rect(0, 0, 0, 0)
+    
+    def draw(self, surface, background=None):
+        """Draw the overlay, refreshing its text every few frames.
+        
+        Args:
+            surface: pygame surface to draw on
+            background: Surface to restore the previous overlay area from,
+                or None if the frame was drawn from scratch
+                
+        Returns:
+            pygame.Rect: Area covered by the old and new overlay
+        """
+        frame_count = self.profiler.frame_count
+        if (not self._lines or
+                frame_count - self._refreshed_at >= OVERLAY_REFRESH_FRAMES):
+            self._lines = self.profiler.summary_lines()
+            self._refreshed_at = frame_count
+        
+        old_rect = self._rect
+        if background is not None:
+            surface.blit(background, old_rect, old_rect)
+        
+        # Rendered directly: changing numbers would churn the text cache
+        font = get_font(OVERLAY_FONT_SIZE)
+        rect = pygame.Rect(WINDOW_WIDTH - 10, 10, 0, 0)
+        y = 10
+        for line in self._lines:
+            text_surface = font.render(line, True, COLORS['text'])
+            line_rect = surface.blit(
+                text_surface, (WINDOW_WIDTH - 10 - text_surface.get_width(), y))
+            rect.union_ip(line_rect)
+            y += line_rect.height
+        self._rect = rect
+        return rect.union(old_rect)
+
+
+def present_frame(dirty_rects=None, background=None):
+    """Push the frame to the display, with the debug overlay on top if shown.
+    
+    Args:
+        dirty_rects (list): Areas to update, or None to flip the whole frame
+        background: Surface under the overlay, for renderers that only
+            repaint changed areas
+    """
+    if _debug_overlay is not None:
+        overlay_rect = _debug_overlay.draw(pygame.display.get_surface(),
+                                           background)
+        if dirty_rects is not None:
+            dirty_rects.append(overlay_rect)
+    with profile_section('display.flip'):
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
+
+
+def start_profiling():
+    """Turn on frame profiling and the debug overlay.
+    
+    Returns:
+        FrameProfiler: The profiler recording every frame
+    """
+    global _frame_profiler, _debug_overlay
+    from profiler import FrameProfiler  # Only when profiling
+    
+    _frame_profiler = FrameProfiler()
+    _debug_overlay = DebugOverlay(_frame_profiler)
+    return _frame_profiler
+
+
 # =============================================================================
 # MAIN GAME LOOP
 # =============================================================================
@@ -738,44 +1686,74 @@ def render_game(screen, game_state):
 def run_game():
     """Main game function that initializes and runs the game loop."""
     screen, clock = initialize_pygame()
-    game_state = initialize_game_state()
+    with startup_step('game state'):
+        game_state = initialize_game_state()
     
     # Initialize sound effects
-    eat_sound, game_over_sound = create_sound_effects()
-    game_state['eat_sound'] = eat_sound
-    game_state['game_over_sound'] = game_over_sound
+    with startup_step('sound effects'):
+        eat_sound, game_over_sound = create_sound_effects()
+    game_state.eat_sound = eat_sound
+    game_state.game_over_sound = game_over_sound
     
-    # Initialize food and obstacles
-    game_state['food'] = Food(game_state['snake'].body)
-    game_state['obstacles'] = create_level_obstacles(1)
+    if REPORT_STARTUP_TIME:
+        print_startup_report()
     
+    renderer = create_renderer(screen, game_state.board)
+    profiler = start_profiling() if PROFILE_FRAMES else None
     is_running = True
+    elapsed_time = 0
     
     while is_running:
-        current_time = pygame.time.get_ticks()
+        # Sleep until the next event while nothing can move
+        if ((game_state.is_paused or game_state.is_game_over)
+                and not TURBO_MODE):
+            wait_for_event()
+            clock.tick()  # Don't count the idle time as game time
+        
+        if profiler:
+            profiler.start_frame()
         
         # Handle input events
-        is_running, new_direction, should_restart, new_pause_state = handle_events(
-            game_state['snake_direction'], game_state['is_game_over'], game_state['is_paused'])
+        with profile_section('handle_events'):
+            is_running, should_restart, new_pause_state = handle_events(
+                game_state.snake_direction, game_state.turn_queue,
+                game_state.is_game_over, game_state.is_paused)
         
-        # Update snake direction and pause state
-        game_state['snake_direction'] = new_direction
-        game_state['is_paused'] = new_pause_state
+        # Update pause state (turns wait in the queue for the next move)
+        game_state.is_paused = new_pause_state
         
         if should_restart:
             game_state = reset_game_state(game_state)
-            game_state['last_move_time'] = current_time
+            clock.tick()
+            if profiler:
+                profiler.end_frame()
             continue
         
         # Update game logic
-        if not update_game_logic(game_state, current_time):
-            break
+        with profile_section('update_game_logic'):
+            if TURBO_MODE:
+                if not game_state.is_game_over and not game_state.is_paused:
+                    step_game_logic(game_state)
+            elif not update_game_logic(game_state, elapsed_time):
+                break
         
         # Render everything
-        render_game(screen, game_state)
-        pygame.display.flip()
-        clock.tick(DISPLAY_FPS)
+        with profile_section('render_game'):
+            if renderer:
+                renderer.render(game_state)
+            else:
+                render_game(screen, game_state)
+                present_frame()
+        with profile_section('clock.tick'):
+            elapsed_time = clock.tick() if TURBO_MODE else clock.tick(DISPLAY_FPS)
+        
+        if profiler:
+            profiler.end_frame()
     
+    _finish_replay(game_state)
+    close_leaderboard()
+    if profiler:
+        profiler.write_trace(PROFILE_TRACE_FILE)
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Snake Observations - The board as a preallocated NumPy tensor for agents
+
+Keeps one (channels, height, width) array (float32 by default) per game and changes only
+the cells a move touched, instead of rebuilding the planes from snake.body
+and the obstacle layout every tick:
+- HEAD is 1 on the head
+- BODY holds the stamp of the move that laid each segment (0 on empty
+  cells), so a segment's age is head_stamp - value and the tail has the
+  smallest stamp; stamping keeps a move to two writes where ages would
+  change every segment
+- FOOD is 1 on the food
+- OBSTACLE is 1 on obstacles and on the walls around the board
+
+The array is padded by crop_radius wall cells on every side, so both the
+whole board and the egocentric crop around the head are plain slices of
+it. Both are ndarray views: torch.from_numpy(), memoryview() or anything
+else speaking the buffer protocol reads them without a copy. The planes
+view stays current as the game goes on. The crop is a new view on each
+read, positioned where the head is, so read crop again after every update.
+
+Pygame-free; step a GameEngine and update after each move:
+    engine = GameEngine(seed=1)
+    observation = ObservationBuffer(engine.board, crop_radius=5)
+    observation.update(engine.game_state)
+    engine.step(policy(observation.crop))
+    observation.update(engine.game_state)
+
+Usage:
+    python observation.py 40 30 100000   # update and rebuild times per move
+"""
+
+import random
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from engine import GameEngine
+from game_logic import Board
+
+HEAD, BODY, FOOD, OBSTACLE = range(4)  # Channel indices
+NUM_CHANNELS = 4
+
+
+class ObservationBuffer:
+    """Observation planes of one game, updated in place move by move."""
+
+    def __init__(self, board=None, crop_radius=0, dtype=np.float32):
+        """Allocate the planes, empty apart from the walls.
+
+        Args:
+            board (Board): Board of the games to observe, defaults to the
+                window size
+            crop_radius (int): Cells seen on each side of the head in crop
+            dtype: NumPy integer or float dtype of the planes
+
+        Raises:
+            ValueError: If the dtype can't count up to a stamp for every
+                cell of the board
+        """
+        self.board = board if board is not None else Board()
+        dtype = np.dtype(dtype)
+        # Stamps are rebased before they stop being exact in this dtype
+        if np.issubdtype(dtype, np.floating):
+            self._stamp_limit = 2 ** (np.finfo(dtype).nmant + 1)
+        elif np.issubdtype(dtype, np.integer):
+            self._stamp_limit = int(np.iinfo(dtype).max)
+        else:
+            raise ValueError(f"observation planes need a numeric dtype, not {dtype}")
+        if self._stamp_limit <= self.board.num_cells + 1:
+            raise ValueError(f"{dtype} can't stamp every segment on a "
+                             f"{self.board.width}x{self.board.height} board")
+        self.crop_radius = crop_radius
+        width = self.board.width
+        height = self.board.height
+        pad = crop_radius
+
+        self._planes = np.zeros(
+            (NUM_CHANNELS, height + 2 * pad, width + 2 * pad), dtype=dtype)
+        self._planes[OBSTACLE] = 1
+        self._planes[OBSTACLE, pad:pad + height, pad:pad + width] = 0
+        self.planes = self._planes[:, pad:pad + height, pad:pad + width]
+
+        self.head_stamp = 0  # Stamp of the newest segment
+        self._snake = None  # Snake the planes show
+        self._segments = deque()  # Its (x, y) segments, head first
+        self._crop_center = (width // 2, height // 2)
+        self._food = None
+        self._obstacles = None
+
+    @property
+    def crop(self):
+        """numpy.ndarray: (channels, 2r + 1, 2r + 1) view centred on the head.
+
+        Cells beyond the walls read as OBSTACLE. Once the head has left the
+        board the view stays on the last cell it was inside.
+        """
+        x, y = self._crop_center
+        size = 2 * self.crop_radius + 1
+        return self._planes[:, y:y + size, x:x + size]
+
+    def rebuild(self, game_state):
+        """Redraw every plane from a game state.
+
+        update() does this by itself for new games, restored snapshots and
+        undone moves.
+
+        Args:
+            game_state (GameState): Game to show
+        """
+        planes = self.planes
+        board = self.board
+        snake = game_state.snake
+        planes[HEAD:FOOD + 1] = 0
+
+        # Tail first, so the head's stamp wins where segments overlap
+        segments = deque(snake.body)
+        stamp = 0
+        for x, y in reversed(segments):
+            stamp += 1
+            if board.contains((x, y)):
+                planes[BODY, y, x] = stamp
+        self.head_stamp = stamp
+        self._snake = snake
+        self._segments = segments
+        self._set_head(segments[0], 1)
+
+        self._food = None
+        self._obstacles = None
+        self._sync_items(game_state)
+
+    def update(self, game_state):
+        """Bring the planes up to date after a move.
+
+        A move costs a handful of cell writes. Anything that isn't one move
+        forward from the last update (a new game, a restored snapshot, an
+        undone move, skipped moves) is redrawn with rebuild().
+
+        Args:
+            game_state (GameState): Game to show, moved at most once since
+                the last update
+        """
+        snake = game_state.snake
+        if snake is not self._snake:
+            self.rebuild(game_state)
+            return
+        segments = self._segments
+        head = snake.get_head_position()
+        length = len(snake.body)
+        if head == segments[0] and length == len(segments):
+            self._sync_items(game_state)  # No move since the last update
+            return
+
+        old_x, old_y = segments[0]
+        if (abs(head[0] - old_x) + abs(head[1] - old_y) != 1 or
+                (len(segments) > 1 and head == segments[1]) or
+                length - len(segments) not in (0, 1) or
+                self.head_stamp + 1 >= self._stamp_limit):
+            self.rebuild(game_state)
+            return
+
+        planes = self.planes
+        board = self.board
+        self._set_head(segments[0], 0)
+        if length == len(segments):
+            # The tail leaves before the head arrives, which may be its cell
+            x, y = segments.pop()
+            if board.contains((x, y)):
+                planes[BODY, y, x] = 0
+        segments.appendleft(head)
+        self.head_stamp += 1
+        if board.contains(head):
+            planes[BODY, head[1], head[0]] = self.head_stamp
+        self._set_head(head, 1)
+        self._sync_items(game_state)
+
+    def _set_head(self, position, value):
+        """Mark or clear the head cell, moving the crop with the head.
+
+        Args:
+            position (tuple): (x, y) of the head
+            value (int): 1 to mark it, 0 to clear it
+        """
+        if self.board.contains(position):
+            x, y = position
+            self.planes[HEAD, y, x] = value
+            self._crop_center = position
+
+    def _sync_items(self, game_state):
+        """Move the food, and redraw the obstacles if the level changed.
+
+        Args:
+            game_state (GameState): Game to show
+        """
+        planes = self.planes
+        board = self.board
+        food_position = game_state.food.position
+        if food_position != self._food:
+            if self._food is not None and board.contains(self._food):
+                planes[FOOD, self._food[1], self._food[0]] = 0
+            if board.contains(food_position):
+                planes[FOOD, food_position[1], food_position[0]] = 1
+            self._food = food_position
+
+        # Layouts are never changed in place, a new level brings a new one
+        obstacles = game_state.obstacles
+        if obstacles is not self._obstacles:
+            planes[OBSTACLE] = 0
+            for obstacle in obstacles:
+                if board.contains(obstacle.position):
+                    x, y = obstacle.position
+                    planes[OBSTACLE, y, x] = 1
+            self._obstacles = obstacles
+
+
+def main():
+    """Play perfect games, comparing incremental updates with full rebuilds."""
+    from hamiltonian import HamiltonianSolver  # Only needed for the demo
+
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else width * 3 // 4
+    moves = int(sys.argv[3]) if len(sys.argv) > 3 else 100000
+
+    board = Board(width, height)
+    engine = GameEngine(seed=1, board=board)
+    updated = ObservationBuffer(board, crop_radius=5)
+    rebuilt = ObservationBuffer(board, crop_radius=5)
+    solver = HamiltonianSolver()
+    rng = random.Random(1)
+    update_time = rebuild_time = 0
+    lengths = mismatches = 0
+    for _ in range(moves):
+        if engine.is_game_over:
+            engine.reset(rng.getrandbits(32))
+        game_state = engine.game_state
+        snake = game_state.snake
+        engine.step(solver(game_state))
+
+        start_time = time.perf_counter()
+        updated.update(game_state)
+        update_time += time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        rebuilt.rebuild(game_state)
+        rebuild_time += time.perf_counter() - start_time
+        lengths += len(snake.body)
+
+        # Stamps differ between the two, segment ages must not
+        ages = [np.where(buffer.planes[BODY] > 0,
+                         buffer.head_stamp - buffer.planes[BODY], -1)
+                for buffer in (updated, rebuilt)]
+        if not (np.array_equal(ages[0], ages[1]) and
+                np.array_equal(np.delete(updated._planes, BODY, 0),
+                               np.delete(rebuilt._planes, BODY, 0)) and
+                np.array_equal(updated.crop[HEAD], rebuilt.crop[HEAD])):
+            mismatches += 1
+
+    print(f"{width}x{height}, average length {lengths / moves:.1f}: "
+          f"update {update_time / moves * 1e6:.2f} us/move, "
+          f"rebuild {rebuild_time / moves * 1e6:.2f} us/move, "
+          f"{mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Snake Frame Profiler - Where each frame's time goes, kept for the last few seconds
+
+Records the time spent in named sections of every frame (input, logic,
+rendering, display flip, ...) with time.perf_counter_ns():
+- Frame times and each section's own time (minus any sections nested in
+  it) go into fixed-size ring buffers, so memory stays flat however long
+  the game runs
+- Rolling p50/p95/p99 frame times and average section times come from
+  those buffers
+- The most recent section and frame events are kept in another ring of
+  preallocated arrays and can be written as a JSON trace that
+  chrome://tracing (or ui.perfetto.dev) opens
+
+Nothing is kept per frame. Each timed section still costs a small context
+manager object and the integers for its times.
+
+Pygame-free; main.py drives it from run_game when PROFILE_FRAMES is on:
+    profiler = FrameProfiler()
+    profiler.start_frame()
+    with profiler.section('render_game'):
+        ...
+    profiler.end_frame()
+    profiler.write_trace('frame_trace.json')
+"""
+
+import json
+import os
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+
+PROFILE_HISTORY = 600  # Frames kept for percentiles (10 seconds at 60 FPS)
+TRACE_EVENTS = 32768  # Events kept for the trace file (~1 minute at 60 FPS)
+FRAME_EVENT = 'frame'  # Trace event name of whole frames
+
+
+class FrameProfiler:
+    """Times the sections of each frame and keeps rolling statistics."""
+
+    def __init__(self, history=PROFILE_HISTORY, trace_events=TRACE_EVENTS):
+        """Initialize empty ring buffers.
+
+        Args:
+            history (int): Number of frames kept for statistics
+            trace_events (int): Number of events kept for the trace file
+        """
+        self.history = history
+        self.trace_events_kept = trace_events
+        self.frame_count = 0
+        self._frame_times = array('q', [0]) * history  # Nanoseconds
+        self._section_times = {}  # Section name -> array('q') of own times
+        self._frame_start = None
+        self._frame_totals = {}
+        self._open_sections = []  # [name, start, nested time] of open sections
+
+        # Trace ring: one slot per event, with its name as an index into
+        # _event_names
+        self._event_names = []
+        self._event_name_ids = {}  # Event name -> index in _event_names
+        self._event_name_slots = array('q', [0]) * trace_events
+        self._event_starts = array('q', [0]) * trace_events
+        self._event_durations = array('q', [0]) * trace_events
+        self._event_count = 0  # Events ever written
+        self._frame_first_event = 0  # Event count when the frame started
+
+    # -------------------------------------------------------------------------
+    # Recording
+    # -------------------------------------------------------------------------
+
+    def start_frame(self):
+        """Start timing a frame, dropping a frame that was never ended."""
+        if self._frame_start is not None:
+            self._event_count = self._frame_first_event
+        self._frame_first_event = self._event_count
+        self._frame_totals.clear()
+        self._open_sections.clear()
+        self._frame_start = time.perf_counter_ns()
+
+    def _add_event(self, name, start, duration):
+        """Write a trace event over the oldest one in the ring.
+
+        Args:
+            name (str): Section name, or FRAME_EVENT
+            start (int): perf_counter_ns() at the start
+            duration (int): Nanoseconds
+        """
+        name_id = self._event_name_ids.get(name)
+        if name_id is None:
+            name_id = self._event_name_ids[name] = len(self._event_names)
+            self._event_names.append(name)
+        slot = self._event_count % self.trace_events_kept
+        self._event_name_slots[slot] = name_id
+        self._event_starts[slot] = start
+        self._event_durations[slot] = duration
+        self._event_count += 1
+
+    @contextmanager
+    def section(self, name):
+        """Time a section of the current frame.
+
+        Sections may nest; each one's own time excludes its nested sections,
+        while the trace shows them stacked.
+
+        Args:
+            name (str): Section name, e.g. 'render_game'
+        """
+        entry = [name, time.perf_counter_ns(), 0]
+        self._open_sections.append(entry)
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self._open_sections.pop()
+            duration = end - entry[1]
+            if self._open_sections:
+                self._open_sections[-1][2] += duration
+            self._frame_totals[name] = (self._frame_totals.get(name, 0) +
+                                        duration - entry[2])
+            self._add_event(name, entry[1], duration)
+
+    def end_frame(self):
+        """Finish the current frame and add it to the statistics."""
+        if self._frame_start is None:
+            return
+        end = time.perf_counter_ns()
+        slot = self.frame_count % self.history
+        self._frame_times[slot] = end - self._frame_start
+
+        for name in self._frame_totals:
+            if name not in self._section_times:
+                self._section_times[name] = array('q', [0]) * self.history
+        for name, times in self._section_times.items():
+            times[slot] = self._frame_totals.get(name, 0)
+
+        self._add_event(FRAME_EVENT, self._frame_start, end - self._frame_start)
+        self.frame_count += 1
+        self._frame_start = None
+
+    # -------------------------------------------------------------------------
+    # Statistics
+    # -------------------------------------------------------------------------
+
+    def _recorded(self, ring):
+        """Get the filled part of a ring buffer.
+
+        Args:
+            ring (array.array): One of the per-frame ring buffers
+
+        Returns:
+            array.array: Values for the frames recorded so far
+        """
+        return ring[:min(self.frame_count, self.history)]
+
+    def percentiles(self, percents=(50, 95, 99)):
+        """Get frame-time percentiles over the recorded frames.
+
+        Args:
+            percents (tuple): Percentiles to compute
+
+        Returns:
+            dict: Percentile -> frame time in milliseconds (nearest rank),
+                empty before the first frame
+        """
+        times = sorted(self._recorded(self._frame_times))
+        if not times:
+            return {}
+        return {percent: times[round(percent / 100 * (len(times) - 1))] / 1e6
+                for percent in percents}
+
+    def section_averages(self):
+        """Get the average own time of each section per frame.
+
+        Returns:
+            dict: Section name -> milliseconds, in first-seen order
+        """
+        frames = min(self.frame_count, self.history)
+        if not frames:
+            return {}
+        return {name: sum(self._recorded(times)) / frames / 1e6
+                for name, times in self._section_times.items()}
+
+    def summary_lines(self):
+        """Format the statistics as short lines for an overlay or a log.
+
+        Returns:
+            list: Text lines, starting with the frame-time percentiles
+        """
+        percentiles = self.percentiles()
+        if not percentiles:
+            return []
+        lines = ["frame p50 {:.1f}  p95 {:.1f}  p99 {:.1f} ms".format(
+            percentiles[50], percentiles[95], percentiles[99])]
+        for name, milliseconds in self.section_averages().items():
+            lines.append(f"{name} {milliseconds:.2f} ms")
+        return lines
+
+    # -------------------------------------------------------------------------
+    # Trace export
+    # -------------------------------------------------------------------------
+
+    def trace_events(self):
+        """Get the kept events as Chrome trace 'complete' events.
+
+        Returns:
+            list: Event dicts with microsecond 'ts' and 'dur', oldest first
+        """
+        process_id = os.getpid()
+        thread_id = threading.get_ident()
+        kept = self.trace_events_kept
+        first_event = max(self._event_count - kept, 0)
+        slots = [event % kept for event in range(first_event, self._event_count)]
+        return [{'name': self._event_names[self._event_name_slots[slot]],
+                 'ph': 'X', 'ts': self._event_starts[slot] / 1000,
+                 'dur': self._event_durations[slot] / 1000,
+                 'pid': process_id, 'tid': thread_id}
+                for slot in slots]
+
+    def write_trace(self, path):
+        """Write the kept events as a trace file for chrome://tracing.
+
+        Args:
+            path (str): File to write
+        """
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': self.trace_events(),
+                       'displayTimeUnit': 'ms'}, file)
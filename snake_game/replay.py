@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Snake Replays - Compact recording and headless playback of ByteSnake games
+
+A game is fully determined by its board size, level limit, seed and the
+direction of every move, so a replay stores just those:
+- 18-byte header: magic b'BSR1', seed (uint32), move count (uint32),
+  board width and height (uint16 each), max level (uint16, 0 for none)
+- Direction stream packed 2 bits per move, 4 moves per byte
+
+Bytes are written as soon as they fill up, so a replay is usable even if the
+game crashes before it is closed (the move count is then left at
+UNKNOWN_MOVE_COUNT and every complete byte is played).
+
+Usage:
+    python replay.py replays/20240101-120000_1234.bsr
+"""
+
+import os
+import struct
+import sys
+import time
+
+from engine import GameEngine, UP, DOWN, LEFT, RIGHT
+from game_logic import Board
+
+REPLAY_MAGIC = b'BSR1'
+HEADER_FORMAT = '<4sIIHHH'  # magic, seed, move count, board size, max level
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+UNKNOWN_MOVE_COUNT = 0xFFFFFFFF
+
+# 2-bit code for each direction, in the same order as batch_env's actions
+DIRECTION_CODES = {UP: 0, DOWN: 1, LEFT: 2, RIGHT: 3}
+CODE_DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+
+class ReplayWriter:
+    """Streams a game's moves to a replay file as they happen."""
+
+    def __init__(self, path, seed, board=None, max_level=None):
+        """Create the replay file and write its header.
+
+        Args:
+            path (str): File to write
+            seed (int): Seed the game was started with
+            board (Board): Board the game is played on, defaults to the
+                window size
+            max_level (int): Level the game stops advancing at, or None
+
+        Raises:
+            ValueError: If the seed does not fit the header's uint32
+        """
+        if not 0 <= seed <= 0xFFFFFFFF:
+            raise ValueError(f"replay seed {seed} is not a 32-bit unsigned int")
+        self.path = path
+        self.seed = seed
+        self.board = board if board is not None else Board()
+        self.max_level = max_level
+        self.move_count = 0
+        self._pending_byte = 0
+        # Unbuffered, so every complete byte reaches the file at once
+        self._file = open(path, 'wb', buffering=0)
+        self._write_header(UNKNOWN_MOVE_COUNT)
+
+    @classmethod
+    def create_in(cls, directory, seed, board=None, max_level=None):
+        """Create a replay file with a timestamped name in a directory.
+
+        Args:
+            directory (str): Directory for replay files, created if missing
+            seed (int): Seed the game was started with
+            board (Board): Board the game is played on
+            max_level (int): Level the game stops advancing at, or None
+
+        Returns:
+            ReplayWriter: Writer for the new file
+        """
+        os.makedirs(directory, exist_ok=True)
+        file_name = f"{time.strftime('%Y%m%d-%H%M%S')}_{seed}.bsr"
+        return cls(os.path.join(directory, file_name), seed, board, max_level)
+
+    def _write_header(self, move_count):
+        """Write the header at the current file position.
+
+        Args:
+            move_count (int): Number of moves, or UNKNOWN_MOVE_COUNT
+        """
+        self._file.write(struct.pack(HEADER_FORMAT, REPLAY_MAGIC, self.seed,
+                                     move_count, self.board.width,
+                                     self.board.height, self.max_level or 0))
+
+    def record(self, direction):
+        """Record the direction of one move.
+
+        Args:
+            direction (tuple): (dx, dy) direction the snake moved in
+        """
+        shift = (self.move_count % 4) * 2
+        self._pending_byte |= DIRECTION_CODES[direction] << shift
+        self.move_count += 1
+        if self.move_count % 4 == 0:
+            self._file.write(bytes((self._pending_byte,)))
+            self._pending_byte = 0
+
+    def close(self):
+        """Write the last partial byte and the final move count."""
+        if self._file.closed:
+            return
+        if self.move_count % 4:
+            self._file.write(bytes((self._pending_byte,)))
+        self._file.seek(0)
+        self._write_header(self.move_count)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_replay(path):
+    """Read a replay file.
+
+    Args:
+        path (str): Replay file to read
+
+    Returns:
+        tuple: (seed, directions, board, max_level) where directions is a
+            list of (dx, dy), board is the Board the game was played on and
+            max_level is its level limit or None
+
+    Raises:
+        ValueError: If the file is not a replay
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    if data[:4] != REPLAY_MAGIC or len(data) < HEADER_SIZE:
+        raise ValueError(f"{path} is not a ByteSnake replay")
+    _, seed, move_count, width, height, max_level = struct.unpack_from(
+        HEADER_FORMAT, data)
+    moves = data[HEADER_SIZE:]
+
+    if move_count == UNKNOWN_MOVE_COUNT:
+        move_count = len(moves) * 4
+
+    directions = [CODE_DIRECTIONS[(moves[i // 4] >> ((i % 4) * 2)) & 3]
+                  for i in range(move_count)]
+    return seed, directions, Board(width, height), max_level or None
+
+
+def play_replay(path):
+    """Replay a recorded game headlessly at full speed.
+
+    Args:
+        path (str): Replay file to play
+
+    Returns:
+        dict: Final 'score', 'level', 'length', 'ticks' and 'is_game_over'
+    """
+    seed, directions, board, max_level = read_replay(path)
+    engine = GameEngine(seed, board, max_level=max_level)
+    for direction in directions:
+        engine.step(direction)
+
+    return {
+        'score': engine.score,
+        'level': engine.level,
+        'length': len(engine.game_state.snake.body),
+        'ticks': engine.ticks,
+        'is_game_over': engine.is_game_over,
+    }
+
+
+def main():
+    """Play the replay files given on the command line and print results."""
+    if len(sys.argv) < 2:
+        print("Usage: python replay.py REPLAY_FILE...")
+        sys.exit(1)
+
+    for path in sys.argv[1:]:
+        result = play_replay(path)
+        print(f"{path}: score {result['score']}, level {result['level']}, "
+              f"length {result['length']}, {result['ticks']} moves"
+              f"{', game over' if result['is_game_over'] else ''}")
+
+
+if __name__ == "__main__":
+    main()
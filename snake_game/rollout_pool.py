@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Snake Rollout Pool - Play many headless ByteSnake games on every CPU core
+
+Shards games across worker processes, each running its own GameEngine with
+the policy in-process. Only the per-game results (score, level, length and
+ticks survived) travel back to the caller, as each game finishes.
+
+Example:
+    for result in run_rollouts(random_policy, num_games=10000):
+        print(result['seed'], result['score'])
+"""
+
+import os
+import random
+import signal
+import sys
+import time
+from multiprocessing import Pool
+
+from engine import GameEngine, DIRECTIONS
+
+# Per-worker state, set up once by _init_worker
+_worker_engine = None
+_worker_policy = None
+_worker_max_ticks = None
+
+_game_rng = random.Random()  # Random source of the game play_game is playing
+
+
+def random_policy(game_state):
+    """Example policy that picks a random direction every move.
+
+    Draws from the current game's own random.Random, seeded by play_game()
+    with the game's seed, so a game repeats exactly in any worker.
+
+    Args:
+        game_state (GameState): Current game state
+
+    Returns:
+        tuple: (dx, dy) direction
+    """
+    return _game_rng.choice(DIRECTIONS)
+
+
+def play_game(engine, policy, seed, max_ticks=None):
+    """Play one seeded game, as a worker does.
+
+    Args:
+        engine (GameEngine): Engine to play on, reset with the seed
+        policy (callable): Policy passed to GameEngine.play()
+        seed (int): Seed for the game and for random_policy's draws
+        max_ticks (int): Optional cap on moves
+
+    Returns:
+        dict: Final results from GameEngine.play()
+    """
+    global _game_rng
+    _game_rng = random.Random(seed)
+    engine.reset(seed)
+    return engine.play(policy, max_ticks)
+
+
+def _init_worker(policy, max_ticks):
+    """Create the engine and store the policy once per worker process.
+
+    Args:
+        policy (callable): Policy passed to GameEngine.play()
+        max_ticks (int): Optional cap on moves per game
+    """
+    global _worker_engine, _worker_policy, _worker_max_ticks
+    # A forked worker inherits the parent's signal handlers, and SDL's (once
+    # pygame has started) ignore the SIGTERM that Pool.terminate() sends
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    _worker_engine = GameEngine()
+    _worker_policy = policy
+    _worker_max_ticks = max_ticks
+
+
+def _play_game(task):
+    """Play one seeded game in a worker process.
+
+    Args:
+        task (tuple): (game_index, seed) for the game
+
+    Returns:
+        dict: Game index, seed and the final results from GameEngine.play()
+    """
+    game_index, seed = task
+    result = play_game(_worker_engine, _worker_policy, seed, _worker_max_ticks)
+    result['game'] = game_index
+    result['seed'] = seed
+    return result
+
+
+def run_rollouts(policy, num_games, seeds=None, processes=None, max_ticks=None):
+    """Play games across worker processes, yielding results as they finish.
+
+    Args:
+        policy (callable): Module-level function taking the game state and
+            returning a direction (it must be picklable)
+        num_games (int): Number of games to play
+        seeds (list): Optional seed per game, defaults to 0..num_games-1
+        processes (int): Number of worker processes, defaults to CPU count
+        max_ticks (int): Optional cap on moves per game
+
+    Yields:
+        dict: 'game', 'seed', 'score', 'level', 'length' and 'ticks' for
+            each game, in completion order
+
+    Raises:
+        ValueError: If seeds doesn't have one seed per game
+    """
+    if seeds is None:
+        seeds = range(num_games)
+    elif len(seeds) != num_games:
+        raise ValueError(f"got {len(seeds)} seeds for {num_games} games")
+    tasks = list(zip(range(num_games), seeds))
+    processes = processes or os.cpu_count() or 1
+
+    # Hand out several games per message so IPC stays off the hot path
+    chunk_size = max(1, len(tasks) // (processes * 8))
+
+    with Pool(processes, initializer=_init_worker,
+              initargs=(policy, max_ticks)) as pool:
+        yield from pool.imap_unordered(_play_game, tasks, chunk_size)
+
+
+def main():
+    """Play random-policy games on all cores and report throughput."""
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    start_time = time.perf_counter()
+    total_ticks = 0
+    best_score = 0
+    for result in run_rollouts(random_policy, num_games):
+        total_ticks += result['ticks']
+        best_score = max(best_score, result['score'])
+    elapsed = time.perf_counter() - start_time
+
+    print(f"{num_games} games in {elapsed:.2f}s "
+          f"({num_games / elapsed:.0f} games/s, {total_ticks / elapsed:.0f} ticks/s), "
+          f"best score {best_score}")
+
+
+if __name__ == "__main__":
+    main()
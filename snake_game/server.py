@@ -0,0 +1,644 @@
+#!/usr/bin/env python3
+"""
+Snake Server - Multiplayer ByteSnake rooms over TCP on one asyncio loop
+
+Every room is an Arena (see arena.py) with one snake per connected player,
+and all rooms advance together on one authoritative server tick:
+- Clients connect over TCP and speak newline-delimited JSON: 'join' a room,
+  'turn' their snake and 'spawn' a new one after dying
+- A joining client gets the whole room once; after that each tick sends
+  only what changed (new heads, whether tails moved, deaths, spawns and
+  food that moved)
+- Each room's tick message is serialized once and the same bytes are
+  written to every client in it; clients that fall too far behind are
+  disconnected instead of buffering without bound
+
+Messages from the client:
+    {"type": "join", "room": "lan-1", "player": "alice"}
+    {"type": "turn", "direction": [0, -1]}
+    {"type": "spawn"}
+
+Messages from the server:
+    {"type": "state", "you": 3, "tick": 120, "width": 40, "height": 30,
+     "obstacles": [[x, y], ...], "food": [[x, y] or null, ...],
+     "snakes": [[id, player, [[x, y], ...]], ...]}
+    {"type": "tick", "tick": 121, "spawns": [[id, player, x, y]],
+     "moves": [[id, x, y, grew]], "deaths": [id],
+     "food": [[index, x, y] or [index, null]]}
+    {"type": "error", "message": "..."}
+
+Usage:
+    python server.py --port 8765             # serve until interrupted
+    python server.py --load 100 4 200        # 100 rooms x 4 loopback bots
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter, deque
+
+from arena import Arena
+from engine import DIRECTIONS
+from game_logic import Board, is_reverse_direction
+
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8765
+TICK_RATE = 20  # Server ticks (moves) per second
+MAX_PLAYERS_PER_ROOM = 8
+MAX_ROOMS = 1000  # Rooms joins may create; each one is ticked every tick
+ROOM_FOODS = 3  # Food items on each room's board
+MAX_SEND_BACKLOG = 256 * 1024  # Unsent bytes before a slow client is dropped
+TICK_HISTORY = 1000  # Ticks kept for the tick-time statistics
+
+
+def encode_message(message):
+    """Serialize a message as one compact JSON line.
+
+    Args:
+        message (dict): Message to send
+
+    Returns:
+        bytes: UTF-8 JSON followed by a newline
+    """
+    return (json.dumps(message, separators=(',', ':')) + '\n').encode()
+
+
+# =============================================================================
+# ROOMS
+# =============================================================================
+
+class Room:
+    """Players' snakes in an Arena, plus what the clients haven't heard yet."""
+
+    def __init__(self, name, seed=None, board=None):
+        """Initialize an empty room with its obstacles and food.
+
+        Args:
+            name (str): Room name clients join by
+            seed (int): Seed for food and spawn positions
+            board (Board): Board to play on, defaults to the window size
+        """
+        self.name = name
+        self.arena = Arena(board, seed, num_foods=ROOM_FOODS)
+        self.connections = set()
+        self.tick = 0
+        self._spawns = []  # Snakes spawned since the last tick
+        self._departed = []  # Ids of snakes removed since the last tick
+
+    def spawn_snake(self, player):
+        """Put a new snake for a player on a random free cell.
+
+        Args:
+            player (str): Name of the player
+
+        Returns:
+            ArenaSnake: The new snake, or None if the board is full
+        """
+        arena_snake = self.arena.spawn_snake(player)
+        if arena_snake is not None:
+            self._spawns.append(arena_snake)
+        return arena_snake
+
+    def turn(self, snake_id, direction):
+        """Steer a snake on the next tick.
+
+        Args:
+            snake_id (int): Id of the snake
+            direction (tuple): New (dx, dy) direction
+        """
+        self.arena.turn(snake_id, direction)
+
+    def remove_snake(self, snake_id):
+        """Take a player's snake out of the room, e.g. when they leave.
+
+        The other clients hear about it with the next tick's deaths.
+
+        Args:
+            snake_id (int): Id of the snake
+        """
+        if snake_id in self.arena.snakes:
+            self.arena.remove_snake(snake_id)
+            self._departed.append(snake_id)
+
+    def step(self):
+        """Advance the arena by one tick.
+
+        Returns:
+            dict: Tick message with what changed, for the clients
+        """
+        arena = self.arena
+        self.tick += 1
+        message = {'type': 'tick', 'tick': self.tick}
+        if self._spawns:
+            message['spawns'] = [
+                [arena_snake.id, arena_snake.player, *arena_snake.head]
+                for arena_snake in self._spawns
+                if arena_snake.id in arena.snakes]
+            self._spawns = []
+
+        moves, deaths, food_moves = arena.step()
+        deaths += self._departed
+        self._departed = []
+        if moves:
+            message['moves'] = moves
+        if deaths:
+            message['deaths'] = deaths
+        if food_moves:
+            message['food'] = food_moves
+        return message
+
+    def full_state(self, snake_id=None):
+        """Describe the whole room, for a client that has just joined.
+
+        Args:
+            snake_id (int): Id of the joining player's snake
+
+        Returns:
+            dict: State message
+        """
+        arena = self.arena
+        return {
+            'type': 'state', 'you': snake_id, 'tick': self.tick,
+            'width': arena.board.width, 'height': arena.board.height,
+            'obstacles': [obstacle.position for obstacle in arena.obstacles],
+            'food': arena.foods,
+            'snakes': [[arena_snake.id, arena_snake.player, arena.body(arena_snake.id)]
+                       for arena_snake in arena.snakes.values()],
+        }
+
+
+# =============================================================================
+# SERVER
+# =============================================================================
+
+class Connection:
+    """A connected client and the room and snake it plays with."""
+
+    __slots__ = ('writer', 'player', 'room', 'snake_id')
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.player = None
+        self.room = None
+        self.snake_id = None
+
+    def send(self, data):
+        """Queue bytes for the client without waiting for them to be sent.
+
+        Args:
+            data (bytes): Encoded message(s)
+
+        Returns:
+            bool: False if the client is too far behind and should be dropped
+        """
+        transport = self.writer.transport
+        if transport.is_closing():
+            return False
+        if transport.get_write_buffer_size() > MAX_SEND_BACKLOG:
+            return False
+        self.writer.write(data)
+        return True
+
+
+class GameServer:
+    """Runs every room on one shared tick and relays the players' input."""
+
+    def __init__(self, tick_rate=TICK_RATE, board=None):
+        """Initialize a server with no rooms.
+
+        Args:
+            tick_rate (int): Ticks per second
+            board (Board): Board every room plays on, defaults to the
+                window size
+        """
+        self.tick_rate = tick_rate
+        self.board = board if board is not None else Board()
+        self.rooms = {}
+        self.tick = 0
+        self.tick_times = deque(maxlen=TICK_HISTORY)  # Nanoseconds per tick
+        self.bytes_sent = 0
+
+    # -------------------------------------------------------------------------
+    # Tick loop
+    # -------------------------------------------------------------------------
+
+    def step(self):
+        """Advance every room by one tick and send each room its changes."""
+        start = time.perf_counter_ns()
+        self.tick += 1
+        dropped = []
+        for room in self.rooms.values():
+            data = encode_message(room.step())
+            for connection in room.connections:
+                if connection.send(data):
+                    self.bytes_sent += len(data)
+                else:
+                    dropped.append(connection)
+        for connection in dropped:
+            self._leave(connection)
+            connection.writer.close()
+        self.tick_times.append(time.perf_counter_ns() - start)
+
+    async def run_ticks(self, ticks=None):
+        """Tick at the tick rate, without drifting.
+
+        A tick that runs late starts the schedule again from now instead of
+        bursting through the missed ticks.
+
+        Args:
+            ticks (int): Number of ticks to run, or None to run forever
+        """
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        next_time = loop.time()
+        while ticks is None or ticks > 0:
+            self.step()
+            if ticks is not None:
+                ticks -= 1
+            next_time += interval
+            delay = next_time - loop.time()
+            if delay < 0:
+                next_time = loop.time()
+            await asyncio.sleep(max(delay, 0))
+
+    # -------------------------------------------------------------------------
+    # Clients
+    # -------------------------------------------------------------------------
+
+    async def serve_client(self, reader, writer):
+        """Handle one client connection until it closes.
+
+        Args:
+            reader (asyncio.StreamReader): Client input
+            writer (asyncio.StreamWriter): Client output
+        """
+        connection = Connection(writer)
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                    handler = self._handlers[message['type']]
+                except (ValueError, KeyError, TypeError):
+                    self._send_error(connection, "unknown message")
+                    continue
+                handler(self, connection, message)
+        except (ConnectionError, ValueError):
+            # readline() raises ValueError for a line over the reader's
+            # 64 KiB limit; such a client is dropped like a closed one
+            pass
+        finally:
+            self._leave(connection)
+            writer.close()
+
+    def _send_error(self, connection, text):
+        """Tell a client its message was rejected.
+
+        Args:
+            connection (Connection): Client to tell
+            text (str): What was wrong
+        """
+        connection.send(encode_message({'type': 'error', 'message': text}))
+
+    def _join(self, connection, message):
+        """Put a client in a room (created if new) with a new snake."""
+        player = message.get('player')
+        if not isinstance(player, str) or not player:
+            self._send_error(connection, "missing player name")
+            return
+        room_name = str(message.get('room', 'lobby'))
+        if connection.room is not None and connection.room.name == room_name:
+            self._send_error(connection, "already in this room")
+            return
+        room = self.rooms.get(room_name)
+        if room is not None and len(room.connections) >= MAX_PLAYERS_PER_ROOM:
+            self._send_error(connection, "room is full")
+            return
+        if room is None and len(self.rooms) >= MAX_ROOMS:
+            self._send_error(connection, "too many rooms")
+            return
+
+        # Leave first: that may close the old room, never the one joined
+        self._leave(connection)
+        if room is None:
+            room = self.rooms[room_name] = Room(room_name, board=self.board)
+        connection.player = player
+        connection.room = room
+        room.connections.add(connection)
+        self._spawn(connection, message)
+
+    def _spawn(self, connection, message):
+        """Give a client in a room a new snake and send it the room state."""
+        room = connection.room
+        if room is None:
+            self._send_error(connection, "not in a room")
+            return
+        if connection.snake_id in room.arena.snakes:
+            self._send_error(connection, "already playing")
+            return
+        arena_snake = room.spawn_snake(connection.player)
+        connection.snake_id = arena_snake.id if arena_snake is not None else None
+        connection.send(encode_message(room.full_state(connection.snake_id)))
+
+    def _turn(self, connection, message):
+        """Queue a client's turn for the next tick."""
+        try:
+            direction = tuple(message['direction'])
+        except (KeyError, TypeError):
+            direction = None
+        if direction not in DIRECTIONS:
+            self._send_error(connection, "invalid direction")
+        elif connection.room is not None:
+            connection.room.turn(connection.snake_id, direction)
+
+    _handlers = {'join': _join, 'spawn': _spawn, 'turn': _turn}
+
+    def _leave(self, connection):
+        """Take a client's snake off its room, closing the room if empty.
+
+        Args:
+            connection (Connection): Client that is leaving its room
+        """
+        room = connection.room
+        if room is None:
+            return
+        room.remove_snake(connection.snake_id)
+        room.connections.discard(connection)
+        if not room.connections:
+            del self.rooms[room.name]
+        connection.room = None
+        connection.snake_id = None
+
+    async def serve(self, host=SERVER_HOST, port=SERVER_PORT):
+        """Accept clients and run the tick loop until cancelled.
+
+        Args:
+            host (str): Address to listen on
+            port (int): Port to listen on
+        """
+        server = await asyncio.start_server(self.serve_client, host, port)
+        async with server:
+            await self.run_ticks()
+
+
+# =============================================================================
+# LOOPBACK CLIENT
+# =============================================================================
+
+class SnakeClient:
+    """Client that keeps a copy of its room from the server's messages.
+
+    Used by the load test and handy for bots: each snake's body is rebuilt
+    from the tick messages alone, which also checks that they are complete.
+    """
+
+    def __init__(self, reader, writer):
+        """Wrap an open connection.
+
+        Args:
+            reader (asyncio.StreamReader): Server output
+            writer (asyncio.StreamWriter): Server input
+        """
+        self.reader = reader
+        self.writer = writer
+        self.snake_id = None
+        self.tick = 0
+        self.board = None
+        self.obstacles = set()
+        self.foods = []
+        self.snakes = {}  # Snake id -> deque of positions, head first
+        self.occupied = Counter()  # Position -> number of segments on it
+
+    @classmethod
+    async def connect(cls, room, player, host=SERVER_HOST, port=SERVER_PORT):
+        """Connect to a server and join a room.
+
+        Args:
+            room (str): Room to join
+            player (str): Player name
+            host (str): Server address
+            port (int): Server port
+
+        Returns:
+            SnakeClient: Connected client
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        client = cls(reader, writer)
+        client.send({'type': 'join', 'room': room, 'player': player})
+        return client
+
+    def send(self, message):
+        """Send a message to the server.
+
+        Args:
+            message (dict): Message to send
+        """
+        self.writer.write(encode_message(message))
+
+    def _add_snake(self, snake_id, body):
+        """Start tracking a snake."""
+        self._remove_snake(snake_id)
+        self.snakes[snake_id] = deque(body)
+        self.occupied.update(body)
+
+    def _remove_snake(self, snake_id):
+        """Stop tracking a snake."""
+        body = self.snakes.pop(snake_id, None)
+        if body is not None:
+            self.occupied.subtract(body)
+
+    def apply(self, message):
+        """Update the copy of the room from a server message.
+
+        Args:
+            message (dict): Decoded 'state' or 'tick' message
+        """
+        kind = message['type']
+        if kind == 'state':
+            self.snake_id = message['you']
+            self.tick = message['tick']
+            self.board = Board(message['width'], message['height'])
+            self.obstacles = set(map(tuple, message['obstacles']))
+            self.foods = [tuple(position) if position is not None else None
+                          for position in message['food']]
+            self.snakes = {}
+            self.occupied = Counter()
+            for snake_id, player, body in message['snakes']:
+                self._add_snake(snake_id, map(tuple, body))
+        elif kind == 'tick':
+            self.tick = message['tick']
+            for snake_id, player, x, y in message.get('spawns', ()):
+                self._add_snake(snake_id, [(x, y)])
+            for snake_id, x, y, grew in message.get('moves', ()):
+                body = self.snakes[snake_id]
+                body.appendleft((x, y))
+                self.occupied[(x, y)] += 1
+                if not grew:
+                    self.occupied[body.pop()] -= 1
+            for snake_id in message.get('deaths', ()):
+                self._remove_snake(snake_id)
+                if snake_id == self.snake_id:
+                    self.snake_id = None
+            for index, *position in message.get('food', ()):
+                # Food eaten on a full board comes as [index, null]
+                self.foods[index] = tuple(position) if position[0] is not None else None
+
+    @property
+    def direction(self):
+        """tuple: Direction of the client's snake, from its last move."""
+        body = self.snakes.get(self.snake_id)
+        if body is None or len(body) < 2:
+            return None
+        return (body[0][0] - body[1][0], body[0][1] - body[1][1])
+
+    async def run(self, policy=None):
+        """Apply server messages until the connection closes.
+
+        Args:
+            policy (callable): Called with the client after each tick; a
+                returned (dx, dy) direction is sent as a turn. A dead
+                snake is respawned.
+        """
+        while line := await self.reader.readline():
+            message = json.loads(line)
+            self.apply(message)
+            if policy is None or message['type'] != 'tick':
+                continue
+            if self.snake_id is None:
+                self.send({'type': 'spawn'})
+                self.snake_id = -1  # Until the server's state message arrives
+            elif self.snake_id in self.snakes:
+                direction = policy(self)
+                if direction is not None:
+                    self.send({'type': 'turn', 'direction': direction})
+
+    def close(self):
+        """Close the connection."""
+        self.writer.close()
+
+
+def wander_policy(client):
+    """Example bot: mostly straight on, turning away from anything in the way.
+
+    Args:
+        client (SnakeClient): Client whose snake to steer
+
+    Returns:
+        tuple: (dx, dy) direction, or None to keep going
+    """
+    head_x, head_y = client.snakes[client.snake_id][0]
+    current = client.direction
+    safe = []
+    for direction in DIRECTIONS:
+        if current is not None and is_reverse_direction(current, direction):
+            continue
+        position = (head_x + direction[0], head_y + direction[1])
+        if (client.board.contains(position) and
+                position not in client.obstacles and
+                not client.occupied[position]):
+            safe.append(direction)
+    if current in safe and random.random() < 0.8:
+        return None
+    return random.choice(safe) if safe else None
+
+
+# =============================================================================
+# LOAD TEST
+# =============================================================================
+
+async def run_load_test(num_rooms, players_per_room, ticks,
+                        tick_rate=TICK_RATE):
+    """Run rooms of loopback bots and check every client's copy of its room.
+
+    Args:
+        num_rooms (int): Number of rooms
+        players_per_room (int): Bots in each room
+        ticks (int): Server ticks to run
+        tick_rate (int): Ticks per second
+
+    Returns:
+        dict: 'tick_ms' (mean), 'tick_p99_ms', 'bytes_per_tick',
+            'clients' and 'mismatches' (clients whose copy was wrong)
+    """
+    game_server = GameServer(tick_rate)
+    server = await asyncio.start_server(game_server.serve_client,
+                                        SERVER_HOST, 0)
+    port = server.sockets[0].getsockname()[1]
+
+    clients = []
+    for room_index in range(num_rooms):
+        for player_index in range(players_per_room):
+            clients.append(await SnakeClient.connect(
+                f"room-{room_index}", f"bot-{player_index}", port=port))
+    tasks = [asyncio.create_task(client.run(wander_policy))
+             for client in clients]
+    await asyncio.sleep(0.1)  # Let every join arrive
+
+    await game_server.run_ticks(ticks)
+    await asyncio.sleep(0.5)  # Let the clients read the last ticks
+
+    clients_by_address = {client.writer.get_extra_info('sockname'): client
+                          for client in clients}
+    mismatches = 0
+    for room in game_server.rooms.values():
+        # Snakes spawned after the last tick haven't been announced yet
+        unannounced = {arena_snake.id for arena_snake in room._spawns}
+        expected = {snake_id: room.arena.body(snake_id)
+                    for snake_id in room.arena.snakes
+                    if snake_id not in unannounced}
+        for connection in room.connections:
+            client = clients_by_address[
+                connection.writer.get_extra_info('peername')]
+            copy = {snake_id: list(body)
+                    for snake_id, body in client.snakes.items()
+                    if snake_id not in unannounced}
+            if (copy != expected or client.tick != room.tick or
+                    client.foods != room.arena.foods):
+                mismatches += 1
+
+    for client in clients:
+        client.close()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.sleep(0.1)  # Let the server see every client leave
+    server.close()
+    await server.wait_closed()
+
+    tick_times = sorted(game_server.tick_times)
+    return {
+        'tick_ms': sum(tick_times) / len(tick_times) / 1e6,
+        'tick_p99_ms': tick_times[int(0.99 * (len(tick_times) - 1))] / 1e6,
+        'bytes_per_tick': game_server.bytes_sent / game_server.tick,
+        'clients': len(clients),
+        'mismatches': mismatches,
+    }
+
+
+def main():
+    """Serve rooms, or run a loopback load test."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default=SERVER_HOST, help="address to listen on")
+    parser.add_argument('--port', type=int, default=SERVER_PORT, help="port to listen on")
+    parser.add_argument('--load', type=int, nargs=3,
+                        metavar=('ROOMS', 'PLAYERS', 'TICKS'),
+                        help="run loopback bots instead of serving")
+    args = parser.parse_args()
+
+    if args.load:
+        num_rooms, players_per_room, ticks = args.load
+        result = asyncio.run(run_load_test(num_rooms, players_per_room, ticks))
+        print(f"{num_rooms} rooms, {result['clients']} clients: "
+              f"tick {result['tick_ms']:.2f} ms (p99 {result['tick_p99_ms']:.2f} ms), "
+              f"{result['bytes_per_tick'] / 1024:.1f} KiB sent per tick, "
+              f"{result['mismatches']} client mismatches")
+        sys.exit(1 if result['mismatches'] else 0)
+
+    try:
+        asyncio.run(GameServer().serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Tests for the multi-snake arena's owner grid, free cells and food."""
+
+from arena import NO_OWNER, OBSTACLE, Arena, ArenaSnake
+from engine import UP, DOWN, LEFT, RIGHT
+from game_logic import Board, ObstacleLayout
+
+
+def make_arena(food_position=None):
+    """Create an empty 10x10 arena, with one food item if a position is given."""
+    board = Board(10, 10)
+    arena = Arena(board, seed=1, num_foods=int(food_position is not None),
+                  obstacles=ObstacleLayout(board=board))
+    if food_position is not None:
+        old_position = arena.foods[0]
+        del arena._food_at[board.cell_index(old_position)]
+        arena.free_cells.add(old_position)
+        arena.foods[0] = food_position
+        arena._food_at[board.cell_index(food_position)] = 0
+        arena.free_cells.remove(food_position)
+    return arena
+
+
+def place_snake(arena, positions, direction):
+    """Put a snake on given cells, head first, as spawn_snake() would."""
+    board = arena.board
+    cells = [board.cell_index(position) for position in positions]
+    arena_snake = ArenaSnake(arena._next_snake_id, 'bot', cells[0],
+                             positions[0], direction)
+    arena._next_snake_id += 1
+    arena_snake.cells.extend(cells[1:])
+    for cell, position in zip(cells, positions):
+        arena._owner[cell] = arena_snake.id
+        arena.free_cells.remove(position)
+    arena.snakes[arena_snake.id] = arena_snake
+    return arena_snake
+
+
+def check_invariants(arena):
+    """Check the owner grid, free cells and food against the snakes."""
+    board = arena.board
+    owner = [NO_OWNER] * board.num_cells
+    for obstacle in arena.obstacles:
+        if board.contains(obstacle.position):
+            owner[board.cell_index(obstacle.position)] = OBSTACLE
+    for snake_id, arena_snake in arena.snakes.items():
+        assert arena_snake.head == board.position_of(arena_snake.cells[0])
+        for cell in arena_snake.cells:
+            assert owner[cell] == NO_OWNER  # Nothing else on the cell
+            owner[cell] = snake_id
+    assert list(arena._owner) == owner
+
+    food_cells = {}
+    for index, position in enumerate(arena.foods):
+        if position is not None:
+            cell = board.cell_index(position)
+            # Food is only ever under the head that has just reached it
+            assert (owner[cell] == NO_OWNER or
+                    arena.snakes[owner[cell]].cells[0] == cell)
+            food_cells[cell] = index
+    assert arena._food_at == food_cells
+
+    free = [board.position_of(cell) for cell in range(board.num_cells)
+            if owner[cell] == NO_OWNER and cell not in food_cells]
+    assert len(arena.free_cells) == len(free)
+    assert all(position in arena.free_cells for position in free)
+
+
+def test_head_to_head_longer_snake_survives():
+    """Of two heads on one cell the longer snake lives; equal lengths both die."""
+    arena = make_arena()
+    short = place_snake(arena, [(3, 2), (2, 2)], RIGHT)
+    long = place_snake(arena, [(5, 2), (6, 2), (7, 2)], LEFT)
+    left = place_snake(arena, [(3, 6), (2, 6)], RIGHT)
+    right = place_snake(arena, [(5, 6), (6, 6)], LEFT)
+    _, deaths, _ = arena.step()
+    assert sorted(deaths) == sorted([short.id, left.id, right.id])
+    assert list(arena.snakes) == [long.id]
+    assert long.head == (4, 2)
+    check_invariants(arena)
+
+
+def test_head_into_body_dies_and_heads_follow_tails():
+    """A head on a body cell dies, but one moving onto a vacated tail lives."""
+    arena = make_arena()
+    body = place_snake(arena, [(5, 5), (4, 5), (3, 5)], RIGHT)
+    rammer = place_snake(arena, [(4, 4)], DOWN)
+    follower = place_snake(arena, [(3, 6), (4, 6)], UP)
+    _, deaths, _ = arena.step()
+    assert deaths == [rammer.id]
+    assert arena.body(body.id) == [(6, 5), (5, 5), (4, 5)]
+    assert arena.body(follower.id) == [(3, 5), (3, 6)]
+    check_invariants(arena)
+
+
+def test_food_under_a_removed_snakes_head_stays():
+    """Food a removed snake's head had reached stays for another snake to eat."""
+    arena = make_arena(food_position=(5, 5))
+    leaver = place_snake(arena, [(4, 5), (3, 5)], RIGHT)
+    eater = place_snake(arena, [(5, 3)], DOWN)
+    arena.step()
+    assert leaver.head == (5, 5)
+    check_invariants(arena)
+
+    arena.remove_snake(leaver.id)
+    assert arena.foods == [(5, 5)]
+    assert (5, 5) not in arena.free_cells
+    check_invariants(arena)
+
+    arena.step()  # The eater reaches the food...
+    check_invariants(arena)
+    _, _, food_moves = arena.step()  # ...and eats it on the next move
+    assert len(eater) == 2
+    assert [index for index, *_ in food_moves] == [0]
+    check_invariants(arena)
+
+
+def test_heads_colliding_on_food_leave_it_in_place():
+    """Food on a cell where equal heads collide is still there afterwards."""
+    arena = make_arena(food_position=(5, 5))
+    place_snake(arena, [(4, 5)], RIGHT)
+    place_snake(arena, [(6, 5)], LEFT)
+    _, deaths, _ = arena.step()
+    assert len(deaths) == 2
+    assert arena.foods == [(5, 5)]
+    check_invariants(arena)
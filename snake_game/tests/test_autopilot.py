@@ -0,0 +1,32 @@
+"""Tests for the pathfinding autopilot."""
+
+import pytest
+
+from autopilot import Autopilot
+from engine import GameEngine
+from game_logic import Board
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_patched_field_matches_full_bfs(seed):
+    """The incrementally patched distance field equals a fresh rebuild."""
+    board = Board(20, 15) if seed % 2 else Board()
+    engine = GameEngine(seed, board)
+    autopilot = Autopilot()
+    reference = Autopilot()
+    while not engine.is_game_over and engine.ticks < 1500:
+        direction = autopilot(engine.game_state)
+        reference._rebuild(engine.game_state)
+        assert autopilot._distance == reference._distance, engine.ticks
+        assert autopilot._blocked == reference._blocked, engine.ticks
+        engine.step(direction)
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3, 5, 6, 7, 11])
+def test_games_end_instead_of_circling(seed):
+    """Games on a small board end instead of circling around out-of-reach food."""
+    engine = GameEngine(seed, Board(12, 10))
+    result = engine.play(Autopilot(), max_ticks=20000)
+    assert engine.is_game_over
+    assert result['ticks'] < 20000
+
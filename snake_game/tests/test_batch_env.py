@@ -0,0 +1,70 @@
+"""Tests for the vectorized batch environment."""
+
+import random
+
+import numpy as np
+import pytest
+
+from batch_env import BatchGameEngine
+from engine import GameEngine, DIRECTIONS
+from game_logic import Board, Obstacle, ObstacleLayout
+
+
+def _sync_from_batch(batch, game, engine):
+    """Copy the batch game's random choices (food, level 3+ layout) to an engine."""
+    game_state = engine.game_state
+    width = batch.grid_width
+    food = int(batch.food[game])
+    game_state.food.position = (food % width, food // width) if food >= 0 else (-1, -1)
+    if game_state.level >= 3:
+        game_state.obstacles = ObstacleLayout(
+            [Obstacle((int(cell) % width, int(cell) // width))
+             for cell in np.flatnonzero(batch.obstacles[game])], game_state.board)
+
+
+@pytest.mark.parametrize('board_size, start_score', [
+    ((40, 30), 0), ((40, 30), 28), ((6, 5), 0), ((10, 4), 0)])
+def test_batch_matches_engine(board_size, start_score):
+    """Every batch game plays out exactly like a GameEngine given its food."""
+    board = Board(*board_size)
+    num_games = 16
+    batch = BatchGameEngine(num_games, seed=0, board=board)
+    batch.scores[:] = start_score  # Near a level change, to cover new layouts
+    engines = [GameEngine(board=board) for _ in range(num_games)]
+    for game, engine in enumerate(engines):
+        engine.game_state.score = start_score
+        _sync_from_batch(batch, game, engine)
+    rng = random.Random(0)
+    deaths = 0
+
+    for _ in range(1500):
+        actions = []
+        for engine in engines:
+            head_x, head_y = engine.game_state.snake.get_head_position()
+            food_x, food_y = engine.game_state.food.position
+            if rng.random() < 0.8:
+                action = (0 if food_y < head_y else 1 if food_y > head_y else
+                          2 if food_x < head_x else 3)
+            else:
+                action = rng.randrange(4)
+            actions.append(action)
+        ate_food, is_game_over = batch.step(np.array(actions))
+
+        for game, engine in enumerate(engines):
+            assert engine.step(DIRECTIONS[actions[game]]) == (
+                ate_food[game], is_game_over[game])
+            if engine.is_game_over:
+                deaths += 1
+                finished = list(batch.finished['games']).index(game)
+                assert batch.finished['score'][finished] == engine.score
+                assert batch.finished['level'][finished] == engine.level
+                assert batch.finished['ticks'][finished] == engine.ticks
+                assert (batch.finished['length'][finished] ==
+                        len(engine.game_state.snake.body))
+                engine = engines[game] = GameEngine(board=board)
+            else:
+                assert engine.game_state.snake.get_head_position() == (
+                    batch.head_x[game], batch.head_y[game])
+                assert engine.score == batch.scores[game]
+            _sync_from_batch(batch, game, engine)
+    assert deaths
@@ -0,0 +1,57 @@
+"""Tests for the benchmark suite's setup and regression check."""
+
+import pytest
+
+import benchmark
+import main
+from game_logic import Board
+
+
+@pytest.fixture(autouse=True)
+def quick_benchmarks(monkeypatch):
+    """Shorten the runs, and restore the settings run_benchmarks() turns off."""
+    monkeypatch.setattr(benchmark, 'MIN_BENCHMARK_TIME', 0.001)
+    monkeypatch.setattr(benchmark, 'ALLOCATION_SAMPLES', 5)
+    for name in ('ENABLE_SOUND', 'RECORD_REPLAYS', 'SAVE_SCORES'):
+        monkeypatch.setattr(main, name, getattr(main, name))
+    monkeypatch.setattr(main, 'SAVE_SCORES', False)
+
+
+@pytest.mark.parametrize('width, height', [(4, 2), (7, 6), (40, 30)])
+def test_hamiltonian_cycle_visits_every_cell_once(width, height):
+    """The benchmark cycle is a closed loop of adjacent cells over the grid."""
+    cycle = benchmark.hamiltonian_cycle(width, height)
+    assert sorted(cycle) == [(x, y) for x in range(width) for y in range(height)]
+    for (x, y), (next_x, next_y) in zip(cycle, cycle[1:] + cycle[:1]):
+        assert abs(next_x - x) + abs(next_y - y) == 1
+
+
+def test_benchmark_snakes_keep_their_length():
+    """Snakes laid on the cycle move on it without growing or dying."""
+    game_state, next_direction = benchmark.build_game_state(30, Board(10, 8))
+    assert len(game_state.snake.body) == 30
+    for _ in range(200):
+        game_state.snake_direction = next_direction[
+            game_state.snake.get_head_position()]
+        main.step_game_logic(game_state)
+    assert not game_state.is_game_over
+    assert len(game_state.snake.body) == 30
+
+
+def test_run_benchmarks_reports_each_case():
+    """Each benchmark, board and length gets a keyed result."""
+    results = benchmark.run_benchmarks(((10, 8),), (1, 20),
+                                       names=['food_respawn', 'update_game_logic'])
+    assert sorted(results) == [
+        'food_respawn[10x8,len=1]', 'food_respawn[10x8,len=20]',
+        'update_game_logic[10x8,len=1]', 'update_game_logic[10x8,len=20]']
+    assert all(result['ops_per_sec'] > 0 for result in results.values())
+
+
+def test_compare_with_baseline_flags_only_slowdowns_past_tolerance():
+    """Only results slower than the baseline by more than the tolerance count."""
+    baseline = {'a': {'ops_per_sec': 100}, 'b': {'ops_per_sec': 100},
+                'c': {'ops_per_sec': 100}}
+    results = {'a': {'ops_per_sec': 95}, 'b': {'ops_per_sec': 80},
+               'c': {'ops_per_sec': 150}, 'new': {'ops_per_sec': 1}}
+    assert benchmark.compare_with_baseline(results, baseline, 0.1) == [('b', 100, 80)]
@@ -0,0 +1,88 @@
+"""Tests for the shared game rules."""
+
+import random
+
+import pytest
+
+from engine import DIRECTIONS, GameEngine
+from game_logic import (
+    NO_FOOD_POSITION, Board, FreeCells, Snake, create_level_obstacles,
+    set_level_obstacles,
+)
+
+
+def test_occupancy_matches_the_segments():
+    """The occupancy grid and free cells agree with the body after every move."""
+    board = Board(8, 6)
+    rng = random.Random(2)
+    all_positions = [(x, y) for x in range(board.width) for y in range(board.height)]
+    collisions = 0
+    snake = None
+    for move in range(3000):
+        if snake is None or snake.is_head_on_body():
+            # A game ends once the head hits the body, so start a new snake
+            free_cells = FreeCells(board, rng)
+            snake = Snake((4, 3), free_cells)
+        head_x, head_y = snake.get_head_position()
+        direction = rng.choice([(dx, dy) for dx, dy in DIRECTIONS
+                                if board.contains((head_x + dx, head_y + dy))])
+        snake.move(direction, should_grow=len(snake.body) < 30 and rng.random() < 0.3)
+
+        segments = list(snake.body)
+        covered = set(segments)
+        for position in all_positions:
+            assert snake.contains_position(position) == (position in covered), move
+            assert (position in free_cells) != (position in covered), move
+        assert snake.is_head_on_body() == (segments[0] in segments[1:]), move
+        collisions += snake.is_head_on_body()
+    assert collisions > 10
+
+
+def test_new_layout_moves_buried_food():
+    """Food under a new level's obstacle is moved to a free cell."""
+    engine = GameEngine(1, Board(12, 10))
+    game_state = engine.game_state
+    buried = next(iter(create_level_obstacles(2, board=game_state.board))).position
+    game_state.food.position = buried
+    set_level_obstacles(game_state, 2)
+    assert game_state.food.position != buried
+    assert not game_state.obstacles.contains_position(game_state.food.position)
+    assert not game_state.snake.contains_position(game_state.food.position)
+
+
+def test_full_board_parks_food_off_the_board():
+    """Once the snake fills every cell, food is parked and the game ends."""
+    engine = GameEngine(1, Board(2, 2))
+    game_state = engine.game_state
+    # Clockwise around the 2x2 board, starting from the snake's cell (1, 1)
+    cycle = {(1, 1): (0, -1), (1, 0): (-1, 0), (0, 0): (0, 1), (0, 1): (1, 0)}
+    is_game_over = False
+    for _ in range(20):
+        action = cycle[game_state.snake.get_head_position()]
+        _, is_game_over = engine.step(action)
+        if is_game_over:
+            break
+    assert is_game_over
+    assert game_state.food.position == NO_FOOD_POSITION
+
+
+def test_obstacle_grid_matches_a_scan_of_the_layout():
+    """The layout's bitset finds exactly the cells its obstacles cover."""
+    board = Board(30, 20)
+    rng = random.Random(4)
+    outside = [(-1, 0), (0, -1), (board.width, 0), (0, board.height)]
+    for level in range(1, 8):
+        layout = create_level_obstacles(level, rng, board)
+        covered = [obstacle.position for obstacle in layout]
+        for x in range(board.width):
+            for y in range(board.height):
+                assert layout.contains_position((x, y)) == ((x, y) in covered)
+        assert not any(layout.contains_position(position) for position in outside)
+
+
+def test_game_state_has_no_instance_dict():
+    """States keep their fields in slots, so unknown attributes are refused."""
+    game_state = GameEngine(seed=1, board=Board(10, 8)).game_state
+    assert not hasattr(game_state, '__dict__')
+    with pytest.raises(AttributeError):
+        game_state.speed = 3
@@ -0,0 +1,34 @@
+"""Tests for the Hamiltonian perfect-play solver."""
+
+import pytest
+
+from engine import GameEngine
+from game_logic import NO_FOOD_POSITION, Board
+from hamiltonian import HamiltonianSolver, cycle_for_layout
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_perfect_play_fills_the_board(seed):
+    """From a fresh game, a snake kept on level 1 covers every free cell."""
+    board = Board(12, 10)
+    engine = GameEngine(seed, board, max_level=1)
+    solver = HamiltonianSolver()
+    engine.play(solver, max_ticks=20000)
+    game_state = engine.game_state
+    free_cells = board.num_cells - len(game_state.obstacles)
+    assert len(cycle_for_layout(board, game_state.obstacles)) == free_cells
+    assert engine.level == 1
+    covered = {position for position in game_state.snake.body
+               if board.contains(position)}
+    assert len(covered) == free_cells
+    assert game_state.food.position == NO_FOOD_POSITION
+
+
+def test_max_level_keeps_the_layout():
+    """Scores past a level's threshold don't change a capped game's layout."""
+    engine = GameEngine(0, Board(12, 10), max_level=1)
+    obstacles = engine.game_state.obstacles
+    engine.game_state.score = 25
+    engine.step()
+    assert engine.level == 1
+    assert engine.game_state.obstacles is obstacles
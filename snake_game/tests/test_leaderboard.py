@@ -0,0 +1,110 @@
+"""Tests for the SQLite leaderboard and its in-memory caches."""
+
+import random
+import sqlite3
+
+import leaderboard
+from leaderboard import Leaderboard
+
+
+class RecordingConnection:
+    """Wraps a database connection, recording the size of each batch."""
+
+    def __init__(self, connection, batch_sizes):
+        self.connection = connection
+        self.batch_sizes = batch_sizes
+
+    def executemany(self, sql, rows):
+        rows = list(rows)
+        self.batch_sizes.append(len(rows))
+        return self.connection.executemany(sql, rows)
+
+    def __enter__(self):
+        return self.connection.__enter__()
+
+    def __exit__(self, *exc_info):
+        return self.connection.__exit__(*exc_info)
+
+    def close(self):
+        self.connection.close()
+
+
+def record_random_games(board, count, seed=0):
+    """Record games with random players, scores and levels."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        score = rng.randrange(60)
+        board.record_game(rng.choice(['ann', 'bob', 'cy']), score,
+                          score // 10 + 1, score + 3, ticks=score * 20)
+
+
+def test_games_are_written_in_batches(tmp_path, monkeypatch):
+    """Queued games go to the database at most WRITE_BATCH_SIZE at a time."""
+    batch_sizes = []
+    connect = leaderboard.connect
+    monkeypatch.setattr(leaderboard, 'WRITE_BATCH_SIZE', 3)
+    monkeypatch.setattr(leaderboard, 'WRITE_BATCH_DELAY', 5)
+    path = str(tmp_path / 'scores.db')
+    board = Leaderboard(path, legacy_file=None)
+    # The writer thread opens its own connection with the first batch
+    monkeypatch.setattr(leaderboard, 'connect', lambda path: RecordingConnection(
+        connect(path), batch_sizes))
+    record_random_games(board, 7)
+    board.close()  # Ends the last batch without waiting for the delay
+
+    assert batch_sizes == [3, 3, 1]
+    with sqlite3.connect(path) as connection:
+        assert connection.execute('SELECT COUNT(*) FROM games').fetchone() == (7,)
+
+
+def test_caches_match_the_database(tmp_path, monkeypatch):
+    """The top-N table and level stats kept in memory match a fresh load."""
+    monkeypatch.setattr(leaderboard, 'TOP_SCORES_CACHED', 5)
+    path = str(tmp_path / 'scores.db')
+    board = Leaderboard(path, legacy_file=None)
+    record_random_games(board, 200)
+    board.flush()
+    reloaded = Leaderboard(path, legacy_file=None)
+
+    assert len(board.top_scores(10)) == 5
+    assert board.top_scores(10) == reloaded.top_scores(10)
+    assert board.high_score == reloaded.high_score
+    assert board.level_stats() == reloaded.level_stats()
+    assert sum(stats['games'] for stats in board.level_stats().values()) == 200
+    board.close()
+    reloaded.close()
+
+
+def test_legacy_high_score_is_imported_once(tmp_path):
+    """A new database takes highscore.txt's score as a level 0 game."""
+    legacy_file = tmp_path / 'highscore.txt'
+    legacy_file.write_text('42\n')
+    path = str(tmp_path / 'scores.db')
+    board = Leaderboard(path, legacy_file=str(legacy_file))
+    assert board.top_scores() == [(42, leaderboard.LEGACY_PLAYER)]
+    assert board.level_stats() == {0: {'games': 1, 'best': 42, 'average': 42}}
+    history = board.player_history(leaderboard.LEGACY_PLAYER)
+    assert [(game['score'], game['level']) for game in history] == [(42, 0)]
+    board.close()
+
+    legacy_file.write_text('99\n')
+    board = Leaderboard(path, legacy_file=str(legacy_file))
+    assert board.high_score == 42
+    board.close()
+
+
+def test_write_failures_do_not_block(tmp_path, monkeypatch, capsys):
+    """A database the writer cannot open loses games but never hangs."""
+    def fail(path):
+        raise sqlite3.OperationalError("unable to open database file")
+
+    board = Leaderboard(str(tmp_path / 'scores.db'), legacy_file=None)
+    monkeypatch.setattr(leaderboard, 'connect', fail)
+    record_random_games(board, 3)
+    board.flush()
+    record_random_games(board, 3)
+    board.close()
+
+    assert board.write_errors == 2
+    assert capsys.readouterr().err.count("could not save") == 1
+    assert board.top_scores()  # The caches still have the games
@@ -0,0 +1,210 @@
+"""Tests for the front end's game loop logic, run without a window."""
+
+import os
+import subprocess
+import sys
+from collections import deque
+
+import pygame
+import pytest
+
+import main
+from game_logic import Board
+
+GAME_DIRECTORY = os.path.dirname(os.path.abspath(main.__file__))
+
+
+@pytest.fixture(autouse=True)
+def no_leaderboard(monkeypatch):
+    """Keep the tests from creating a leaderboard database."""
+    monkeypatch.setattr(main, 'SAVE_SCORES', False)
+
+
+def new_session(seed=1):
+    """Start a game on a board wide enough for a few dozen straight moves."""
+    return main.initialize_game_state(seed=seed, board=Board(80, 20))
+
+
+def test_accumulator_moves_once_per_interval():
+    """Moves happen per whole interval banked, whatever the frame lengths."""
+    game_state = new_session()
+    interval = main.get_move_interval(game_state.score)
+    main.update_game_logic(game_state, interval - 1)
+    assert game_state.ticks == 0
+    main.update_game_logic(game_state, 1)
+    assert (game_state.ticks, game_state.move_time_accumulator) == (1, 0)
+
+    main.update_game_logic(game_state, 2 * interval + 30)
+    assert (game_state.ticks, game_state.move_time_accumulator) == (3, 30)
+    for _ in range(20):
+        main.update_game_logic(game_state, interval // 4)
+    assert game_state.ticks == 3 + (30 + 20 * (interval // 4)) // interval
+
+
+def test_long_stall_catches_up_at_most_max_moves():
+    """After a long stall only MAX_CATCH_UP_MOVES run and the rest is dropped."""
+    game_state = new_session()
+    interval = main.get_move_interval(game_state.score)
+    main.update_game_logic(game_state, 50 * interval)
+    assert game_state.ticks == main.MAX_CATCH_UP_MOVES
+    assert game_state.move_time_accumulator == 0
+
+
+def test_paused_game_banks_no_time():
+    """Time spent paused is not spent on moves after unpausing."""
+    game_state = new_session()
+    interval = main.get_move_interval(game_state.score)
+    game_state.is_paused = True
+    main.update_game_logic(game_state, 3 * interval)
+    game_state.is_paused = False
+    main.update_game_logic(game_state, 0)
+    assert (game_state.ticks, game_state.move_time_accumulator) == (0, 0)
+
+
+def test_text_cache_reuses_recent_surfaces():
+    """Repeated HUD text is rendered once; old text is evicted past the cap."""
+    main.render_text.cache_clear()
+    color = main.COLORS['text']
+    score = main.render_text("Score: 1", 24, color)
+    assert main.render_text("Score: 1", 24, color) is score
+    fresh = main.get_font(24).render("Score: 1", True, color)
+    assert (pygame.image.tobytes(score, 'RGBA') ==
+            pygame.image.tobytes(fresh, 'RGBA'))
+
+    for value in range(main.TEXT_CACHE_SIZE):
+        main.render_text(f"Score: {value + 2}", 24, color)
+    assert main.render_text.cache_info().currsize == main.TEXT_CACHE_SIZE
+    assert main.render_text("Score: 1", 24, color) is not score
+    assert main.get_font(24) is main.get_font(24)
+
+
+def test_synthesized_sound_matches_the_sample_formula():
+    """The vectorized sawtooth equals the per-sample formula on every channel."""
+    params = main.EAT_SOUND
+    expected = bytearray()
+    for index in range(params['length']):
+        sample = int(params['amplitude'] * (1 + params['ramp'] *
+                     (index % params['period']) / params['period']))
+        expected += sample.to_bytes(2, 'little', signed=True) * main.SOUND_CHANNELS
+    assert main.synthesize_sound(**params) == bytes(expected)
+
+
+def test_sound_samples_are_cached_on_disk(tmp_path, monkeypatch):
+    """A sound is synthesized once; later loads read the cache file."""
+    monkeypatch.setattr(main, 'SOUND_CACHE_DIRECTORY', str(tmp_path))
+    pcm = main.load_sound_pcm('eat', main.EAT_SOUND)
+    assert [path.read_bytes() for path in tmp_path.iterdir()] == [pcm]
+
+    def fail(**params):
+        raise AssertionError("synthesized despite a cached copy")
+
+    monkeypatch.setattr(main, 'synthesize_sound', fail)
+    assert main.load_sound_pcm('eat', main.EAT_SOUND) == pcm
+
+
+def test_failed_mixer_start_is_not_retried(monkeypatch):
+    """Sounds start the mixer on first play, and a failed start is remembered."""
+    attempts = []
+
+    def fail(**settings):
+        attempts.append(settings)
+        raise pygame.error("no audio device")
+
+    monkeypatch.setattr(main, '_mixer_failed', False)
+    monkeypatch.setattr(pygame.mixer, 'get_init', lambda: None)
+    monkeypatch.setattr(pygame.mixer, 'init', fail)
+    eat_sound, game_over_sound = main.create_sound_effects()
+    assert not attempts
+    eat_sound.play()
+    eat_sound.play()
+    game_over_sound.play()
+    assert len(attempts) == 1
+    assert main._mixer_failed
+
+
+def test_importing_main_leaves_optional_modules_unloaded():
+    """pygame and the optional features load when used, not on import."""
+    optional = ['pygame.base', 'autopilot', 'hamiltonian', 'leaderboard',
+                'profiler', 'replay']
+    script = ("import sys, main; "
+              f"print([name for name in {optional!r} if name in sys.modules]); "
+              "main.pygame.display; "
+              "print('pygame.base' in sys.modules)")
+    result = subprocess.run([sys.executable, '-c', script], cwd=GAME_DIRECTORY,
+                            capture_output=True, text=True, check=True)
+    lines = result.stdout.splitlines()  # pygame's banner prints in between
+    assert (lines[0], lines[-1]) == ('[]', 'True')
+
+
+def test_startup_steps_are_timed():
+    """Each startup step adds its time to the startup report, in order."""
+    steps = len(main.get_startup_report())
+    with main.startup_step('first'):
+        pass
+    with pytest.raises(RuntimeError):
+        with main.startup_step('second'):
+            raise RuntimeError
+    report = main.get_startup_report()
+    assert report[0][0] == 'module import'
+    assert [name for name, _ in report[steps:]] == ['first', 'second']
+    assert all(seconds >= 0 for _, seconds in report)
+
+
+def test_session_snapshot_restores_the_front_end_fields():
+    """Restoring a session snapshot brings back its moves, timing and turns."""
+    game_state = new_session()
+    main.queue_turn(game_state.turn_queue, game_state.snake_direction, (0, 1))
+    game_state.move_time_accumulator = 40
+    snapshot = game_state.snapshot()
+    expected = (list(game_state.snake.body), game_state.food.position,
+                game_state.ticks, game_state.move_time_accumulator,
+                list(game_state.turn_queue))
+
+    interval = main.get_move_interval(game_state.score)
+    main.update_game_logic(game_state, 3 * interval)
+    main.queue_turn(game_state.turn_queue, game_state.snake_direction, (0, -1))
+    assert list(snapshot.turn_queue) == [(0, 1)]
+
+    for _ in range(2):  # A snapshot can be restored more than once
+        game_state.restore(snapshot)
+        assert (list(game_state.snake.body), game_state.food.position,
+                game_state.ticks, game_state.move_time_accumulator,
+                list(game_state.turn_queue)) == expected
+        main.update_game_logic(game_state, 3 * interval)
+    assert isinstance(snapshot, main.SessionState)
+    assert not hasattr(snapshot, '__dict__')
+
+
+def test_turn_queue_checks_each_turn_against_the_last():
+    """Repeats and reversals of the last queued turn are dropped, as is overflow."""
+    right, left, up, down = (1, 0), (-1, 0), (0, -1), (0, 1)
+    turn_queue = deque()
+    assert not main.queue_turn(turn_queue, right, right)
+    assert not main.queue_turn(turn_queue, right, left)
+    assert main.queue_turn(turn_queue, right, up)
+    assert not main.queue_turn(turn_queue, right, up)
+    assert not main.queue_turn(turn_queue, right, down)
+    assert main.queue_turn(turn_queue, right, left)
+    assert main.queue_turn(turn_queue, right, down)
+    assert list(turn_queue) == [up, left, down]
+    assert len(turn_queue) == main.TURN_QUEUE_SIZE
+    assert not main.queue_turn(turn_queue, right, right)
+
+
+def test_quick_turns_play_out_one_per_move():
+    """Two key presses in one frame turn the snake on two successive moves."""
+    main.initialize_pygame()
+    game_state = new_session()
+    game_state.snake_direction = (1, 0)
+    pygame.event.clear()
+    for key in (pygame.K_UP, pygame.K_LEFT):
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+    assert main.handle_events(game_state.snake_direction, game_state.turn_queue,
+                              False, False) == (True, False, False)
+
+    head_x, head_y = game_state.snake.get_head_position()
+    main.step_game_logic(game_state)
+    assert game_state.snake.get_head_position() == (head_x, head_y - 1)
+    main.step_game_logic(game_state)
+    assert game_state.snake.get_head_position() == (head_x - 1, head_y - 1)
+    assert not game_state.turn_queue
@@ -0,0 +1,84 @@
+"""Tests for the incrementally updated observation planes."""
+
+import random
+
+import numpy as np
+import pytest
+
+from autopilot import Autopilot
+from engine import DIRECTIONS, GameEngine
+from game_logic import Board
+from observation import BODY, FOOD, HEAD, NUM_CHANNELS, OBSTACLE, ObservationBuffer
+
+
+def encode(game_state, radius):
+    """Encode a game from scratch, with segment ages in the BODY plane.
+
+    Returns:
+        numpy.ndarray: Padded planes, with -1 on cells without a segment
+    """
+    board = game_state.board
+    width = board.width
+    height = board.height
+    planes = np.zeros((NUM_CHANNELS, height + 2 * radius, width + 2 * radius))
+    planes[OBSTACLE] = 1
+    planes[BODY] = -1
+    inner = planes[:, radius:radius + height, radius:radius + width]
+    inner[OBSTACLE] = 0
+    for obstacle in game_state.obstacles:
+        if board.contains(obstacle.position):
+            inner[OBSTACLE, obstacle.position[1], obstacle.position[0]] = 1
+    body = list(game_state.snake.body)
+    # Tail first, so the head's age wins where segments overlap
+    for age in reversed(range(len(body))):
+        if board.contains(body[age]):
+            inner[BODY, body[age][1], body[age][0]] = age
+    if board.contains(body[0]):
+        inner[HEAD, body[0][1], body[0][0]] = 1
+    food_position = game_state.food.position
+    if board.contains(food_position):
+        inner[FOOD, food_position[1], food_position[0]] = 1
+    return planes
+
+
+def ages(buffer, planes):
+    """Turn a buffer's BODY stamps into segment ages, -1 where empty."""
+    stamps = planes[BODY].astype(np.int64)
+    return np.where(stamps > 0, buffer.head_stamp - stamps, -1)
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.uint8])
+def test_updates_match_encoding_from_scratch(dtype):
+    """Updated planes and crops match a fresh encoding after every move."""
+    radius = 3
+    board = Board(10, 8)
+    engine = GameEngine(5, board)
+    buffer = ObservationBuffer(board, crop_radius=radius, dtype=dtype)
+    autopilot = Autopilot()
+    rng = random.Random(5)
+    buffer.update(engine.game_state)
+    for move in range(3000):
+        if engine.is_game_over:
+            engine.reset(rng.getrandbits(32))
+            if rng.random() < 0.5:
+                engine.game_state.score = 9  # Next food brings a new layout
+        game_state = engine.game_state
+        if rng.random() < 0.1:
+            engine.step(rng.choice(DIRECTIONS))
+        else:
+            engine.step(autopilot(game_state))
+        buffer.update(game_state)
+
+        expected = encode(game_state, radius)
+        planes = buffer._planes
+        for channel in (HEAD, FOOD, OBSTACLE):
+            assert np.array_equal(planes[channel], expected[channel]), move
+        assert np.array_equal(ages(buffer, planes), expected[BODY]), move
+
+        head_x, head_y = game_state.snake.get_head_position()
+        if board.contains((head_x, head_y)):
+            size = 2 * radius + 1
+            expected_crop = expected[:, head_y:head_y + size, head_x:head_x + size]
+            crop = buffer.crop
+            assert np.array_equal(crop[HEAD], expected_crop[HEAD]), move
+            assert np.array_equal(ages(buffer, crop), expected_crop[BODY]), move
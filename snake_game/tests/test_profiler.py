@@ -0,0 +1,39 @@
+"""Tests for the frame profiler's ring buffers and trace."""
+
+from profiler import FRAME_EVENT, FrameProfiler
+
+
+def record_frame(profiler, *names):
+    """Record one frame with a section per name, the first enclosing the rest."""
+    profiler.start_frame()
+    with profiler.section(names[0]):
+        for name in names[1:]:
+            with profiler.section(name):
+                pass
+    profiler.end_frame()
+
+
+def test_trace_keeps_the_latest_events():
+    """The trace ring holds the newest events, oldest first."""
+    profiler = FrameProfiler(history=4, trace_events=5)
+    for index in range(4):
+        record_frame(profiler, f"outer-{index}", 'inner')
+    names = [event['name'] for event in profiler.trace_events()]
+    assert names == ['outer-2', FRAME_EVENT, 'inner', 'outer-3', FRAME_EVENT]
+    events = profiler.trace_events()
+    assert events[2]['ts'] >= events[3]['ts']  # Inner starts inside outer
+    assert events[2]['dur'] <= events[3]['dur']
+
+
+def test_unended_frame_is_dropped():
+    """A frame restarted before end_frame() leaves no events or statistics."""
+    profiler = FrameProfiler()
+    record_frame(profiler, 'kept')
+    profiler.start_frame()
+    with profiler.section('dropped'):
+        pass
+    record_frame(profiler, 'kept')
+    assert profiler.frame_count == 2
+    assert 'dropped' not in profiler.section_averages()
+    assert 'dropped' not in [event['name'] for event in profiler.trace_events()]
+    assert set(profiler.percentiles()) == {50, 95, 99}
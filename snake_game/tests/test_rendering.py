@@ -0,0 +1,123 @@
+"""Tests for the incremental renderers, drawn offscreen with SDL's dummy driver."""
+
+import random
+
+import pygame
+import pytest
+
+import main
+from engine import DIRECTIONS
+from game_logic import Board, create_level_obstacles
+from profiler import FrameProfiler
+
+
+@pytest.fixture
+def screen(tmp_path, monkeypatch):
+    """A dummy display, with the leaderboard kept out of the working tree."""
+    monkeypatch.setattr(main, 'LEADERBOARD_FILE', str(tmp_path / 'leaderboard.db'))
+    screen, _ = main.initialize_pygame()
+    yield screen
+    main.close_leaderboard()
+    main._tile_atlas = None
+
+
+def test_level_layer_matches_drawing_each_obstacle(screen):
+    """The cached level surface equals the grid with every obstacle drawn on it."""
+    reference = pygame.Surface(screen.get_size())
+    rng = random.Random(5)
+    for level in range(1, 5):
+        obstacles = create_level_obstacles(level, rng)
+        main.draw_level(screen, obstacles)
+        main.draw_background(reference)
+        for obstacle in obstacles:
+            obstacle.draw(reference)
+        assert (pygame.image.tobytes(screen, 'RGB') ==
+                pygame.image.tobytes(reference, 'RGB')), level
+        assert main._get_level_surface(obstacles) is main._get_level_surface(obstacles)
+
+
+def test_classic_atlas_draws_like_filled_cells(screen):
+    """Blitting classic tiles gives the same pixels as filling each cell."""
+    main._tile_atlas = main.build_tile_atlas('classic')
+    reference = pygame.Surface(screen.get_size())
+    rng = random.Random(6)
+    for _ in range(20):
+        snake_body = [(rng.randrange(10), rng.randrange(10))
+                      for _ in range(rng.randint(1, 30))]
+        food_position = (rng.randrange(10), rng.randrange(10))
+        main.draw_background(screen)
+        main.draw_game_objects(screen, snake_body, food_position)
+        main.draw_background(reference)
+        for index, (x, y) in enumerate(snake_body):
+            color = main.COLORS['snake_head' if index == 0 else 'snake_body']
+            reference.fill(color, (x * main.CELL_SIZE, y * main.CELL_SIZE,
+                                   main.CELL_SIZE, main.CELL_SIZE))
+        x, y = food_position
+        reference.fill(main.COLORS['food'], (x * main.CELL_SIZE, y * main.CELL_SIZE,
+                                             main.CELL_SIZE, main.CELL_SIZE))
+        assert (pygame.image.tobytes(screen, 'RGB') ==
+                pygame.image.tobytes(reference, 'RGB'))
+
+
+def test_segment_tiles_follow_the_neighbours(screen):
+    """Directional skins pick head, turn and tail tiles from the adjacent cells."""
+    atlas = main.build_tile_atlas('segmented')
+    snake_body = [(5, 5), (4, 5), (4, 6), (3, 6), (2, 6)]
+    names = {tuple(area): name for name, area in atlas.areas.items()}
+    blits = atlas.snake_blits(snake_body, origin=(main.CELL_SIZE, 0))
+    assert [names[tuple(area)] for _, _, area in blits] == [
+        'head_right', 'turn_down_right', 'turn_up_left', 'body_horizontal',
+        'tail_left']
+    assert [destination for _, destination, _ in blits] == [
+        ((x - 1) * main.CELL_SIZE, y * main.CELL_SIZE) for x, y in snake_body]
+
+
+@pytest.mark.parametrize('skin', ['classic', 'segmented'])
+def test_dirty_rects_match_full_frames(screen, monkeypatch, skin):
+    """Repainting only the changed cells gives the same frames as render_game."""
+    monkeypatch.setattr(main, 'SNAKE_SKIN', skin)
+    main._tile_atlas = None
+    reference = pygame.Surface(screen.get_size())
+    renderer = main.DirtyRectRenderer(screen)
+    rng = random.Random(3)
+    for game in range(6):
+        game_state = main.initialize_game_state(seed=game)
+        if game % 3 == 0:
+            game_state.score = 28  # Cover level changes and new layouts
+        frames = 0
+        while not game_state.is_game_over and frames < 400:
+            if rng.random() < 0.3:
+                direction = rng.choice(DIRECTIONS)
+                if not main.is_reverse_direction(game_state.snake_direction, direction):
+                    game_state.snake_direction = direction
+            if rng.random() < 0.02:
+                game_state.is_paused = not game_state.is_paused
+            main.update_game_logic(game_state, rng.choice([10, 50, 120, 250]))
+            renderer.render(game_state)
+            main.render_game(reference, game_state)
+            assert (pygame.image.tobytes(screen, 'RGB') ==
+                    pygame.image.tobytes(reference, 'RGB')), (game, frames)
+            frames += 1
+
+
+def test_viewport_overlay_updates_on_skipped_frames(screen, monkeypatch):
+    """Frames the viewport skips still redraw the debug overlay over the board."""
+    profiler = FrameProfiler()
+    monkeypatch.setattr(main, '_frame_profiler', profiler)
+    monkeypatch.setattr(main, '_debug_overlay', main.DebugOverlay(profiler))
+    board = Board(main.WINDOW_WIDTH // main.CELL_SIZE * 2,
+                  main.WINDOW_HEIGHT // main.CELL_SIZE * 2)
+    game_state = main.initialize_game_state(seed=1, board=board)
+    renderer = main.ViewportRenderer(screen, board)
+    renderer.render(game_state)
+    before = pygame.image.tobytes(screen, 'RGB')
+
+    for _ in range(main.OVERLAY_REFRESH_FRAMES):
+        profiler.start_frame()
+        profiler.end_frame()
+    renderer.render(game_state)  # Unchanged, so only the overlay is drawn
+    after = pygame.image.tobytes(screen, 'RGB')
+    assert after != before
+
+    main.ViewportRenderer(screen, board).render(game_state)
+    assert pygame.image.tobytes(screen, 'RGB') == after
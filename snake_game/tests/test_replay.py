@@ -0,0 +1,58 @@
+"""Tests for replay recording and playback."""
+
+import pytest
+
+from autopilot import Autopilot
+from engine import GameEngine, UP, DOWN, LEFT, RIGHT
+from game_logic import Board
+from replay import ReplayWriter, play_replay, read_replay
+
+
+def test_replay_reproduces_a_capped_game(tmp_path):
+    """A replay keeps the board and level limit, so playback ends the same."""
+    board = Board(12, 10)
+    engine = GameEngine(3, board, max_level=2)
+    autopilot = Autopilot()
+    path = str(tmp_path / 'game.bsr')
+    with ReplayWriter(path, 3, board, max_level=2) as writer:
+        while not engine.is_game_over:
+            engine.step(autopilot(engine.game_state))
+            writer.record(engine.game_state.snake_direction)
+
+    seed, directions, replay_board, max_level = read_replay(path)
+    assert (seed, max_level) == (3, 2)
+    assert (replay_board.width, replay_board.height) == (12, 10)
+    assert len(directions) == engine.ticks
+    result = play_replay(path)
+    assert result['score'] == engine.score
+    assert result['level'] == engine.level == 2
+    assert result['is_game_over']
+
+
+def test_read_replay_rejects_other_files(tmp_path):
+    """Files without the replay header are refused."""
+    path = tmp_path / 'old.bsr'
+    path.write_bytes(b'BSR3' + bytes(14))
+    with pytest.raises(ValueError):
+        read_replay(str(path))
+
+
+def test_moves_reach_the_file_before_close(tmp_path):
+    """An unclosed replay already holds every complete byte of moves."""
+    path = str(tmp_path / 'crash.bsr')
+    writer = ReplayWriter(path, 7, Board(12, 10))
+    for direction in [UP, LEFT, DOWN, RIGHT] * 2 + [DOWN] * 2:
+        writer.record(direction)
+
+    seed, directions, _, _ = read_replay(path)
+    assert seed == 7
+    assert directions == [UP, LEFT, DOWN, RIGHT] * 2
+    writer.close()
+    assert len(read_replay(path)[1]) == 10
+
+
+@pytest.mark.parametrize('seed', [-1, 2**32])
+def test_writer_rejects_seeds_the_header_cannot_hold(tmp_path, seed):
+    """Seeds outside uint32 fail up front instead of in struct.pack."""
+    with pytest.raises(ValueError):
+        ReplayWriter(str(tmp_path / 'bad.bsr'), seed)
@@ -0,0 +1,24 @@
+"""Tests for the multi-process rollout pool."""
+
+import pytest
+
+from engine import GameEngine
+from rollout_pool import play_game, random_policy, run_rollouts
+
+
+def test_pooled_games_match_serial_games():
+    """Games played in workers give the same results as played in-process."""
+    seeds = [3, 1, 4, 1, 5, 9, 2, 6]
+    pooled = sorted(run_rollouts(random_policy, len(seeds), seeds, processes=2),
+                    key=lambda result: result['game'])
+    engine = GameEngine()
+    for index, (seed, result) in enumerate(zip(seeds, pooled)):
+        assert result.pop('game') == index
+        assert result.pop('seed') == seed
+        assert result == play_game(engine, random_policy, seed)
+
+
+def test_seed_count_must_match_game_count():
+    """A seed list of the wrong length is refused before any game starts."""
+    with pytest.raises(ValueError):
+        next(run_rollouts(random_policy, 3, seeds=[1, 2], processes=1))
@@ -0,0 +1,116 @@
+"""Tests for the multiplayer server over loopback TCP."""
+
+import asyncio
+import json
+
+import server
+from game_logic import Board
+from server import GameServer, encode_message, run_load_test
+
+
+def run_with_server(check, **server_options):
+    """Run a coroutine against a server listening on an ephemeral port.
+
+    Args:
+        check (callable): Coroutine function called with the GameServer and
+            its port
+        **server_options: Arguments for GameServer
+    """
+    async def main():
+        game_server = GameServer(board=Board(20, 15), **server_options)
+        tcp_server = await asyncio.start_server(game_server.serve_client,
+                                                server.SERVER_HOST, 0)
+        port = tcp_server.sockets[0].getsockname()[1]
+        try:
+            await check(game_server, port)
+        finally:
+            tcp_server.close()
+            await tcp_server.wait_closed()
+
+    asyncio.run(main())
+
+
+async def request(reader, writer, message):
+    """Send a message and read the server's reply.
+
+    Returns:
+        dict: Decoded reply
+    """
+    writer.write(encode_message(message))
+    return json.loads(await asyncio.wait_for(reader.readline(), 1))
+
+
+def test_load_test_clients_track_their_rooms():
+    """Every loopback client rebuilds its room exactly from the deltas."""
+    result = asyncio.run(run_load_test(3, 3, 60, tick_rate=200))
+    assert result['clients'] == 9
+    assert result['mismatches'] == 0
+
+
+def test_join_errors():
+    """Joins without a name or into the same room again are refused."""
+    async def check(game_server, port):
+        reader, writer = await asyncio.open_connection(server.SERVER_HOST, port)
+        reply = await request(reader, writer, {'type': 'join', 'room': 'a'})
+        assert reply == {'type': 'error', 'message': "missing player name"}
+        assert not game_server.rooms
+
+        reply = await request(reader, writer,
+                              {'type': 'join', 'room': 'a', 'player': 'ann'})
+        assert reply['type'] == 'state'
+        assert [snake[1] for snake in reply['snakes']] == ['ann']
+
+        reply = await request(reader, writer,
+                              {'type': 'join', 'room': 'a', 'player': 'ann'})
+        assert reply == {'type': 'error', 'message': "already in this room"}
+        assert len(game_server.rooms['a'].arena.snakes) == 1
+
+        # Moving on to another room closes the one left empty
+        reply = await request(reader, writer,
+                              {'type': 'join', 'room': 'b', 'player': 'ann'})
+        assert reply['type'] == 'state'
+        assert set(game_server.rooms) == {'b'}
+        writer.close()
+
+    run_with_server(check)
+
+
+def test_joins_cannot_create_rooms_past_the_cap(monkeypatch):
+    """Once MAX_ROOMS exist, only joins into existing rooms succeed."""
+    monkeypatch.setattr(server, 'MAX_ROOMS', 2)
+
+    async def check(game_server, port):
+        connections = [await asyncio.open_connection(server.SERVER_HOST, port)
+                       for _ in range(3)]
+        for index, (reader, writer) in enumerate(connections[:2]):
+            reply = await request(reader, writer, {
+                'type': 'join', 'room': f"room-{index}", 'player': 'bot'})
+            assert reply['type'] == 'state'
+        reader, writer = connections[2]
+        reply = await request(reader, writer,
+                              {'type': 'join', 'room': 'room-2', 'player': 'bot'})
+        assert reply == {'type': 'error', 'message': "too many rooms"}
+        reply = await request(reader, writer,
+                              {'type': 'join', 'room': 'room-0', 'player': 'bot'})
+        assert reply['type'] == 'state'
+        for _, writer in connections:
+            writer.close()
+
+    run_with_server(check)
+
+
+def test_overlong_line_drops_the_client(caplog):
+    """A line over the reader's limit closes the connection without an error."""
+    async def check(game_server, port):
+        reader, writer = await asyncio.open_connection(server.SERVER_HOST, port)
+        reply = await request(reader, writer,
+                              {'type': 'join', 'room': 'a', 'player': 'ann'})
+        assert reply['type'] == 'state'
+        writer.write(b'x' * (128 * 1024) + b'\n')
+        assert await asyncio.wait_for(reader.read(), 1) == b''
+        await asyncio.sleep(0.05)
+        assert not game_server.rooms
+        writer.close()
+
+    run_with_server(check)
+    assert not [record for record in caplog.records if record.name == 'asyncio']